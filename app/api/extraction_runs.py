@@ -0,0 +1,69 @@
+from typing import Optional
+from uuid import UUID
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.db.papers_dal import PaperDAL
+from app.dependencies import get_client, get_current_user_id
+from app.models.extraction_run_api_models import (
+    CreateExtractionRunRequest,
+    CreateExtractionRunResponse,
+    ExtractionRunOptions,
+    ExtractionRunStatusResponse,
+    GetExtractionRunRequest,
+)
+from app.services.errors import InvalidRequestError, NotFoundError
+from app.services.extraction_run_service import ExtractionRunService
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from returns.result import Success
+
+router = APIRouter(prefix="/projects", tags=["Extraction Runs"])
+
+
+def get_extraction_run_service(
+    request: Request, client=Depends(get_client), user_id: str = Depends(get_current_user_id)
+) -> ExtractionRunService:
+    return ExtractionRunService(
+        engine=request.app.state.extraction_engine,
+        results_dal=ExtractionResultsDAL(client),
+        paper_dal=PaperDAL(client),
+        project_dal=AsyncProjectDAL(client),
+        user_id=user_id,
+    )
+
+
+def _raise_for(error) -> None:
+    if isinstance(error, NotFoundError):
+        raise HTTPException(status_code=404, detail=error.message())
+    if isinstance(error, InvalidRequestError):
+        raise HTTPException(status_code=400, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
+
+
+# Queues the run and returns at once; poll the run's status to follow progress.
+@router.post("/{project_id}/extraction-runs", response_model=CreateExtractionRunResponse)
+async def create_extraction_run(
+    project_id: str,
+    options: Optional[ExtractionRunOptions] = Body(None),
+    service: ExtractionRunService = Depends(get_extraction_run_service),
+):
+    result = await service.create_run(CreateExtractionRunRequest(project_id=UUID(project_id), options=options or ExtractionRunOptions()))
+    if isinstance(result, Success):
+        return result.unwrap()
+    _raise_for(result.failure())
+
+
+@router.get("/{project_id}/extraction-runs/{run_id}", response_model=ExtractionRunStatusResponse)
+async def get_extraction_run(project_id: str, run_id: str, service: ExtractionRunService = Depends(get_extraction_run_service)):
+    result = await service.get_run(GetExtractionRunRequest(project_id=UUID(project_id), run_id=UUID(run_id)))
+    if isinstance(result, Success):
+        return result.unwrap()
+    _raise_for(result.failure())
+
+
+@router.post("/{project_id}/extraction-runs/{run_id}/resume", response_model=ExtractionRunStatusResponse)
+async def resume_extraction_run(project_id: str, run_id: str, service: ExtractionRunService = Depends(get_extraction_run_service)):
+    result = await service.resume_run(GetExtractionRunRequest(project_id=UUID(project_id), run_id=UUID(run_id)))
+    if isinstance(result, Success):
+        return result.unwrap()
+    _raise_for(result.failure())
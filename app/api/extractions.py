@@ -0,0 +1,116 @@
+from typing import Optional
+from uuid import UUID
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.dependencies import get_client, get_current_user_id
+from app.models.extraction_api_models import (
+    ExportExtractionsRequest,
+    ExportFormat,
+    ExtractionSummaryRequest,
+    ExtractionSummaryResponse,
+    FieldStatsRequest,
+    FieldStatsResponse,
+    ListExtractionsRequest,
+    ListExtractionsResponse,
+    NormalizeFieldRequest,
+    NormalizeFieldResponse,
+)
+from app.services.errors import InvalidRequestError, NotFoundError
+from app.services.extraction_results_service import ExtractionResultsService
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from returns.result import Success
+
+router = APIRouter(prefix="/projects", tags=["Extractions"])
+
+
+def get_extraction_results_service(
+    request: Request, client=Depends(get_client), user_id: str = Depends(get_current_user_id)
+) -> ExtractionResultsService:
+    return ExtractionResultsService(
+        dal=ExtractionResultsDAL(client),
+        project_dal=AsyncProjectDAL(client),
+        user_id=user_id,
+        stats_cache=request.app.state.field_stats,
+    )
+
+
+@router.get("/{project_id}/extractions", response_model=ListExtractionsResponse)
+async def list_extractions(
+    project_id: str,
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: ExtractionResultsService = Depends(get_extraction_results_service),
+):
+    result = await service.list_extractions(ListExtractionsRequest(project_id=UUID(project_id), page_size=page_size, cursor=cursor))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, InvalidRequestError):
+        raise HTTPException(status_code=400, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
+
+
+@router.get("/{project_id}/extractions/summary", response_model=ExtractionSummaryResponse)
+async def summarize_extractions(project_id: str, service: ExtractionResultsService = Depends(get_extraction_results_service)):
+    result = await service.summarize(ExtractionSummaryRequest(project_id=UUID(project_id)))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, NotFoundError):
+        raise HTTPException(status_code=404, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
+
+
+# Streams the project's results as a papers x extraction_fields table. With gzip=true the file is sent gzip-compressed.
+# Rows are fetched while the response is being sent; a database error mid-stream aborts the download.
+@router.get("/{project_id}/extractions/export")
+async def export_extractions(
+    project_id: str,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    gzip: bool = False,
+    service: ExtractionResultsService = Depends(get_extraction_results_service),
+):
+    result = await service.prepare_export(ExportExtractionsRequest(project_id=UUID(project_id), export_format=export_format, gzip=gzip))
+    if isinstance(result, Success):
+        export = result.unwrap()
+        headers = {"Content-Disposition": f'attachment; filename="{export.filename}"'}
+        return StreamingResponse(export.chunks(), media_type=export.media_type, headers=headers)
+    error = result.failure()
+    if isinstance(error, NotFoundError):
+        raise HTTPException(status_code=404, detail=error.message())
+    if isinstance(error, InvalidRequestError):
+        raise HTTPException(status_code=400, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
+
+
+# Parses the field's values into numbers with canonical units (see app/services/metric_normalization.py).
+# Safe to repeat: every run recomputes all values of the field.
+@router.post("/{project_id}/extractions/fields/{field_id}/normalize", response_model=NormalizeFieldResponse)
+async def normalize_field(project_id: str, field_id: str, service: ExtractionResultsService = Depends(get_extraction_results_service)):
+    result = await service.normalize_field(NormalizeFieldRequest(project_id=UUID(project_id), field_id=UUID(field_id)))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, NotFoundError):
+        raise HTTPException(status_code=404, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
+
+
+# Distribution of a field's normalized numbers: summary, quantiles, histogram and breakdown by filter outcome.
+@router.get("/{project_id}/fields/{field_id}/stats", response_model=FieldStatsResponse)
+async def get_field_stats(
+    project_id: str,
+    field_id: str,
+    bins: int = Query(20, ge=1, le=200),
+    service: ExtractionResultsService = Depends(get_extraction_results_service),
+):
+    result = await service.field_stats(FieldStatsRequest(project_id=UUID(project_id), field_id=UUID(field_id), bins=bins))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, NotFoundError):
+        raise HTTPException(status_code=404, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
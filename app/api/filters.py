@@ -0,0 +1,40 @@
+from typing import Optional
+from uuid import UUID
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.filters_dal import FilterDAL
+from app.db.papers_dal import PaperDAL
+from app.dependencies import get_client
+from app.models.filter_api_models import EvaluateFiltersOptions, EvaluateFiltersRequest, EvaluateFiltersResponse
+from app.services.errors import InvalidRequestError, NotFoundError
+from app.services.filter_service import FilterService
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from returns.result import Success
+
+router = APIRouter(prefix="/projects", tags=["Filters"])
+
+
+def get_filter_service(request: Request, client=Depends(get_client)) -> FilterService:
+    return FilterService(
+        engine=request.app.state.filter_engine,
+        filter_dal=FilterDAL(client),
+        paper_dal=PaperDAL(client),
+        project_dal=AsyncProjectDAL(client),
+    )
+
+
+@router.post("/{project_id}/filters/evaluate", response_model=EvaluateFiltersResponse)
+async def evaluate_filters(
+    project_id: str,
+    options: Optional[EvaluateFiltersOptions] = Body(None),
+    service: FilterService = Depends(get_filter_service),
+):
+    result = await service.evaluate_filters(EvaluateFiltersRequest(project_id=UUID(project_id), options=options or EvaluateFiltersOptions()))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, NotFoundError):
+        raise HTTPException(status_code=404, detail=error.message())
+    if isinstance(error, InvalidRequestError):
+        raise HTTPException(status_code=400, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
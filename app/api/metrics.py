@@ -0,0 +1,26 @@
+from app.models.metrics_api_models import CacheMetrics, MetricsResponse, ReadCoalescingMetrics
+from fastapi import APIRouter, Request
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/", response_model=MetricsResponse)
+async def get_metrics(request: Request):
+    reads = request.app.state.project_reads.stats
+    response = MetricsResponse(
+        project_reads=ReadCoalescingMetrics(
+            calls=reads.calls, executions=reads.executions, coalesced=reads.coalesced, coalescing_ratio=reads.coalescing_ratio
+        )
+    )
+    cache = request.app.state.project_cache
+    if cache is not None:
+        response.project_cache = CacheMetrics(hits=cache.stats.hits, misses=cache.stats.misses, hit_ratio=cache.stats.hit_ratio)
+    extraction_cache = request.app.state.extraction_engine.result_cache
+    if extraction_cache is not None:
+        stats = extraction_cache.stats
+        response.extraction_cache = CacheMetrics(hits=stats.hits, misses=stats.misses, hit_ratio=stats.hit_ratio)
+    source_cache = request.app.state.sources.cache
+    if source_cache is not None:
+        stats = source_cache.stats
+        response.source_cache = CacheMetrics(hits=stats.hits, misses=stats.misses, hit_ratio=stats.hit_ratio)
+    return response
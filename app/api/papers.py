@@ -0,0 +1,97 @@
+from typing import Optional
+from uuid import UUID
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.db.papers_dal import PaperDAL
+from app.dependencies import get_client
+from app.models.paper_api_models import (
+    FetchSourcesOptions,
+    FetchSourcesRequest,
+    FetchSourcesResponse,
+    IngestPapersResponse,
+    ListPapersRequest,
+    ListPapersResponse,
+    NearDuplicatesRequest,
+    NearDuplicatesResponse,
+)
+from app.services.errors import InvalidRequestError, NotFoundError
+from app.services.paper_ingestion import format_for_content_type
+from app.services.paper_service import PaperService
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from returns.result import Success
+
+router = APIRouter(prefix="/projects", tags=["Papers"])
+
+
+def get_paper_service(request: Request, client=Depends(get_client)) -> PaperService:
+    return PaperService(
+        dal=PaperDAL(client),
+        project_dal=AsyncProjectDAL(client),
+        dedup_indexes=request.app.state.paper_dedup,
+        near_duplicates=request.app.state.near_duplicates,
+        sources=request.app.state.sources,
+    )
+
+
+@router.get("/{project_id}/papers", response_model=ListPapersResponse)
+async def list_papers(
+    project_id: str,
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: PaperService = Depends(get_paper_service),
+):
+    result = await service.list_papers(ListPapersRequest(project_id=UUID(project_id), page_size=page_size, cursor=cursor))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, InvalidRequestError):
+        raise HTTPException(status_code=400, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
+
+
+# Lists clusters of near-duplicate papers (similar title + abstract) at the given estimated Jaccard threshold.
+@router.get("/{project_id}/papers/near-duplicates", response_model=NearDuplicatesResponse)
+async def find_near_duplicates(
+    project_id: str,
+    threshold: float = Query(0.8, gt=0, le=1),
+    max_clusters: int = Query(100, ge=1, le=1000),
+    service: PaperService = Depends(get_paper_service),
+):
+    result = await service.find_near_duplicates(
+        NearDuplicatesRequest(project_id=UUID(project_id), threshold=threshold, max_clusters=max_clusters)
+    )
+    if isinstance(result, Success):
+        return result.unwrap()
+    raise HTTPException(status_code=500, detail=result.failure().message())
+
+
+# Bulk-loads papers from a streamed NDJSON (application/x-ndjson) or CSV (text/csv) body.
+# The body is consumed incrementally, so large search exports never have to fit in memory.
+@router.post("/{project_id}/papers:bulk", response_model=IngestPapersResponse)
+async def ingest_papers(project_id: str, http_request: Request, service: PaperService = Depends(get_paper_service)):
+    ingest_format = format_for_content_type(http_request.headers.get("content-type", ""))
+    if ingest_format is None:
+        raise HTTPException(status_code=415, detail="Expected an application/x-ndjson or text/csv body")
+    result = await service.ingest_papers(UUID(project_id), http_request.stream(), ingest_format)
+    if isinstance(result, Success):
+        return result.unwrap()
+    raise HTTPException(status_code=500, detail=result.failure().message())
+
+
+# Runs the project's source queries against arXiv / PubMed and ingests the results; see FetchSourcesResponse.
+@router.post("/{project_id}/sources/fetch", response_model=FetchSourcesResponse)
+async def fetch_sources(
+    project_id: str,
+    options: Optional[FetchSourcesOptions] = Body(None),
+    service: PaperService = Depends(get_paper_service),
+):
+    result = await service.fetch_sources(FetchSourcesRequest(project_id=UUID(project_id), options=options or FetchSourcesOptions()))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, NotFoundError):
+        raise HTTPException(status_code=404, detail=error.message())
+    if isinstance(error, InvalidRequestError):
+        raise HTTPException(status_code=400, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
@@ -1,7 +1,9 @@
+from typing import Optional
 from uuid import UUID
 
-from app.db.projects_dal import ProjectDAL
-from app.dependencies import get_client
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.dependencies import get_client, get_current_user_id
 from app.models.project_api_models import (
     AddExtractionFieldsRequest,
     AddExtractionFieldsResponse,
@@ -19,18 +21,27 @@ from app.models.project_api_models import (
     DeleteProjectResponse,
     GetProjectRequest,
     GetProjectResponse,
+    GetProjectTreeResponse,
+    ListProjectsRequest,
+    ListProjectsResponse,
     ProjectSourceRequest,
 )
-from app.services.errors import NotFoundError
+from app.services.errors import InvalidRequestError, NotFoundError
 from app.services.project_service import ProjectService
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from returns.result import Success
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
 
-def get_project_service(client=Depends(get_client)) -> ProjectService:
-    return ProjectService(dal=ProjectDAL(client))
+def get_project_service(request: Request, client=Depends(get_client), user_id: str = Depends(get_current_user_id)) -> ProjectService:
+    return ProjectService(
+        dal=AsyncProjectDAL(client),
+        user_id=user_id,
+        single_flight=request.app.state.project_reads,
+        cache=request.app.state.project_cache,
+    )
 
 
 @router.post("/", response_model=CreateProjectResponse)
@@ -42,6 +53,21 @@ async def create_project(request: CreateProjectRequest, service: ProjectService
     raise HTTPException(status_code=500, detail=error.message())
 
 
+@router.get("/", response_model=ListProjectsResponse)
+async def list_projects(
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: ProjectService = Depends(get_project_service),
+):
+    result = await service.list_projects(ListProjectsRequest(page_size=page_size, cursor=cursor))
+    if isinstance(result, Success):
+        return result.unwrap()
+    error = result.failure()
+    if isinstance(error, InvalidRequestError):
+        raise HTTPException(status_code=400, detail=error.message())
+    raise HTTPException(status_code=500, detail=error.message())
+
+
 @router.get("/{project_id}", response_model=GetProjectResponse)
 async def get_project(project_id: str, service: ProjectService = Depends(get_project_service)):
     result = await service.get_project(GetProjectRequest(project_id=UUID(project_id)))
@@ -53,6 +79,16 @@ async def get_project(project_id: str, service: ProjectService = Depends(get_pro
     raise HTTPException(status_code=500, detail=error.message())
 
 
+# Returns the project with its sources, extraction config and fields.
+# The service builds the response from trusted rows, so it is serialized directly instead of being validated again.
+@router.get("/{project_id}/full", response_model=GetProjectTreeResponse)
+async def get_project_tree(project_id: str, service: ProjectService = Depends(get_project_service)):
+    result = await service.get_project_tree(GetProjectRequest(project_id=UUID(project_id)))
+    if isinstance(result, Success):
+        return JSONResponse(content=result.unwrap().model_dump(mode="json", warnings=False))
+    raise HTTPException(status_code=500, detail=result.failure().message())
+
+
 @router.delete("/{project_id}", response_model=DeleteProjectResponse)
 async def delete_project(project_id: str, service: ProjectService = Depends(get_project_service)):
     result = await service.delete_project(DeleteProjectRequest(project_id=UUID(project_id)))
@@ -122,7 +158,7 @@ async def delete_extraction_fields(
     request: DeleteExtractionFieldsRequest,
     service: ProjectService = Depends(get_project_service),
 ):
-    result = await service.delete_extraction_fields(request)
+    result = await service.delete_extraction_fields(request, config_id=UUID(config_id))
     if isinstance(result, Success):
         return result.unwrap()
     raise HTTPException(status_code=500, detail=result.failure().message())
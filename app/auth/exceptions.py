@@ -0,0 +1,3 @@
+# app/auth/exceptions.py
+class InvalidTokenError(Exception):
+    """Exception raised when a bearer token fails local verification."""
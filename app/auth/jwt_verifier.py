@@ -0,0 +1,127 @@
+# app/auth/jwt_verifier.py
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import jwt
+from app.auth.exceptions import InvalidTokenError
+
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+
+
+@dataclass(frozen=True)
+class VerifiedClaims:
+    user_id: str
+    role: Optional[str]
+    exp: int
+
+
+class TokenCache:
+    # Bounded LRU of verified claims, keyed by a hash of the token so raw tokens are never kept.
+    # Entries are dropped as soon as the token expires.
+    def __init__(self, max_entries: int = 10_000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, VerifiedClaims] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[VerifiedClaims]:
+        key = self.key(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims.exp <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: VerifiedClaims) -> None:
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class JWTVerifier:
+    # Verifies Supabase access tokens locally: signature, expiry and audience.
+    # HS256 tokens are checked against the project's JWT secret; asymmetric tokens against
+    # the project's JWKS, which PyJWKClient fetches once and keeps cached.
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        jwks_client: Optional[jwt.PyJWKClient] = None,
+        audience: str = "authenticated",
+        leeway: float = 0,
+        cache: Optional[TokenCache] = None,
+    ):
+        if not secret and not jwks_client:
+            raise ValueError("Either a JWT secret or a JWKS client is required")
+        self.secret = secret
+        self.jwks_client = jwks_client
+        self.audience = audience
+        self.leeway = leeway
+        self.cache = cache or TokenCache()
+
+    @classmethod
+    def from_env(cls) -> "JWTVerifier":
+        jwks_url = os.getenv("SUPABASE_JWKS_URL") or f"{os.environ['SUPABASE_PROJECT_URL'].rstrip('/')}/auth/v1/.well-known/jwks.json"
+        return cls(
+            secret=os.getenv("SUPABASE_JWT_SECRET"),
+            jwks_client=jwt.PyJWKClient(jwks_url, cache_keys=True),
+            audience=os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated"),
+            cache=TokenCache(max_entries=int(os.getenv("JWT_CACHE_MAX_ENTRIES", 10_000))),
+        )
+
+    # Returns the verified claims of a token, or raises InvalidTokenError.
+    def verify(self, token: str) -> VerifiedClaims:
+        cached = self.cache.get(token)
+        if cached is not None:
+            return cached
+
+        try:
+            payload = jwt.decode(
+                token,
+                self._signing_key(token),
+                algorithms=["HS256"] if self._is_symmetric(token) else ASYMMETRIC_ALGORITHMS,
+                audience=self.audience,
+                leeway=self.leeway,
+                options={"require": ["exp", "sub"]},
+            )
+        except InvalidTokenError:
+            raise
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Invalid token: {e}")
+
+        claims = VerifiedClaims(user_id=payload["sub"], role=payload.get("role"), exp=int(payload["exp"]))
+        self.cache.put(token, claims)
+        return claims
+
+    def _is_symmetric(self, token: str) -> bool:
+        try:
+            return jwt.get_unverified_header(token).get("alg") == "HS256"
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Invalid token: {e}")
+
+    def _signing_key(self, token: str):
+        if self._is_symmetric(token):
+            if not self.secret:
+                raise InvalidTokenError("Invalid token: HS256 tokens are not accepted")
+            return self.secret
+        if not self.jwks_client:
+            raise InvalidTokenError("Invalid token: asymmetric tokens are not accepted")
+        return self.jwks_client.get_signing_key_from_jwt(token).key
@@ -0,0 +1,154 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+from app.db.bulk_writer import DEFAULT_BULK_SETTINGS, BulkWriteResult, BulkWriteSettings, bulk_insert
+from app.db.exceptions import BulkWriteError, DatabaseError
+from app.db.pagination import Keyset, apply_keyset, split_page
+from app.db.projections import Projection
+from app.db.projects_dal import EXTRACTION_CONFIG_COLUMNS, PROJECT_COLUMNS, PROJECT_LIST_COLUMNS, PROJECT_SOURCE_COLUMNS, PROJECT_TREE_SELECT
+
+
+class AsyncProjectDAL:
+    # Async counterpart of ProjectDAL, used by the API so DB round trips never block the event loop.
+    # Data Access Control: Owner id for projects is set by supabase as the auth id.
+    # It also validates permissions via auth id and RLS policies.
+    def __init__(self, client, bulk_settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS):
+        self.client = client
+        self.bulk_settings = bulk_settings
+
+    # Retrieves a project by project id, if the user has access. columns selects what is fetched.
+    async def get_project_by_id(self, project_id: UUID, columns: Projection = PROJECT_COLUMNS) -> Optional[dict]:
+        try:
+            response = await self.client.table("projects").select(str(columns)).eq("id", str(project_id)).limit(1).execute()
+            if not response.data:
+                return None
+            return response.data[0]
+        except Exception as e:
+            raise DatabaseError(f"Error fetching project: {e}")
+
+    # Retrieves a project with its sources, extraction config and fields in one round trip,
+    # using PostgREST resource embedding. Returns None if not found or no access.
+    async def get_project_tree(self, project_id: UUID) -> Optional[dict]:
+        try:
+            response = await (
+                self.client.table("projects")
+                .select(str(PROJECT_TREE_SELECT))
+                .eq("id", str(project_id))
+                .order("created_at", foreign_table="extraction_configs.extraction_fields")
+                .limit(1)
+                .execute()
+            )
+            if not response.data:
+                return None
+            return response.data[0]
+        except Exception as e:
+            raise DatabaseError(f"Error fetching project tree: {e}")
+
+    # Lists the user's projects ordered by (created_at, id), starting after the given keyset.
+    # Returns the page rows and the keyset of the last row if more rows follow.
+    async def list_projects(
+        self, page_size: int, after: Optional[Keyset] = None, columns: Projection = PROJECT_LIST_COLUMNS
+    ) -> tuple[list[dict], Optional[Keyset]]:
+        try:
+            query = self.client.table("projects").select(str(columns))
+            response = await apply_keyset(query, after, page_size).execute()
+            return split_page(response.data or [], page_size)
+        except Exception as e:
+            raise DatabaseError(f"Error listing projects: {e}")
+
+    # Creates a new project with the given description, owned by the creating user.
+    async def create_project(self, description: str) -> Optional[dict]:
+        new_project = {"id": str(uuid4()), "description": description, "created_at": datetime.now(timezone.utc).isoformat()}
+
+        try:
+            response = await self.client.table("projects").insert(new_project).execute()
+            if not response.data:
+                raise DatabaseError("Insert returned empty data")
+            return response.data[0]
+        except Exception as e:
+            raise DatabaseError(f"Error inserting project: {e}")
+
+    # Deletes a project by its id, if the user has access.
+    async def delete_project(self, project_id: UUID) -> bool:
+        try:
+            response = await self.client.table("projects").delete().eq("id", str(project_id)).execute()
+            return bool(response.data)
+        except Exception as e:
+            raise DatabaseError(f"Error deleting project: {e}")
+
+    # Lists the sources of a project, in no particular order.
+    async def get_project_sources(self, project_id: UUID, columns: Projection = PROJECT_SOURCE_COLUMNS) -> list[dict]:
+        try:
+            response = await self.client.table("project_sources").select(str(columns)).eq("project_id", str(project_id)).execute()
+            return response.data or []
+        except Exception as e:
+            raise DatabaseError(f"Error fetching project sources: {e}")
+
+    # Deletes all project_sources entries for a given project
+    async def delete_project_sources(self, project_id: UUID) -> None:
+        try:
+            await self.client.table("project_sources").delete().eq("project_id", str(project_id)).execute()
+        except Exception as e:
+            raise DatabaseError(f"Error deleting project sources: {e}")
+
+    # Inserts multiple project_sources entries, in chunks that stay within PostgREST body limits.
+    async def insert_project_sources(self, source_rows: list[dict]) -> BulkWriteResult:
+        result = await bulk_insert(self.client, "project_sources", source_rows, self.bulk_settings)
+        if not result.ok:
+            raise BulkWriteError(f"Error inserting project sources: {result.error_summary()}", result)
+        return result
+
+    # Replaces all sources of a project in one round trip and one transaction (see app/db/sql/replace_project_sources.sql).
+    # Returns the number of inserted sources, or None if the project does not exist or the user has no access.
+    async def replace_project_sources(self, project_id: UUID, source_rows: list[dict]) -> Optional[int]:
+        try:
+            response = await self.client.rpc("replace_project_sources", {"p_project_id": str(project_id), "p_sources": source_rows}).execute()
+            return response.data
+        except Exception as e:
+            raise DatabaseError(f"Error replacing project sources: {e}")
+
+    # Retrieves the extraction config of a project, if one exists and the user has access.
+    # Existence checks pass ID_ONLY so no other column is fetched.
+    async def get_extraction_config_by_project(self, project_id: UUID, columns: Projection = EXTRACTION_CONFIG_COLUMNS) -> Optional[dict]:
+        try:
+            response = await self.client.table("extraction_configs").select(str(columns)).eq("project_id", str(project_id)).limit(1).execute()
+            if not response.data:
+                return None
+            return response.data[0]
+        except Exception as e:
+            raise DatabaseError(f"Error fetching extraction config: {e}")
+
+    # Creates a new extraction config for a project
+    async def create_extraction_config(self, project_id: UUID) -> dict:
+        new_config = {"id": str(uuid4()), "project_id": str(project_id), "created_at": datetime.now(timezone.utc).isoformat()}
+        try:
+            response = await self.client.table("extraction_configs").insert(new_config).execute()
+            return response.data[0]
+        except Exception as e:
+            raise DatabaseError(f"Error creating extraction config: {e}")
+
+    # Inserts extraction fields for a config, in chunks. The caller's dicts are left untouched.
+    async def insert_extraction_fields(self, config_id: UUID, fields: list[dict]) -> BulkWriteResult:
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [{**field, "id": str(uuid4()), "config_id": str(config_id), "created_at": now} for field in fields]
+        result = await bulk_insert(self.client, "extraction_fields", rows, self.bulk_settings)
+        if not result.ok:
+            raise BulkWriteError(f"Error inserting extraction fields: {result.error_summary()}", result)
+        return result
+
+    # Deletes an extraction config.
+    async def delete_extraction_config(self, config_id: UUID) -> None:
+        try:
+            await self.client.table("extraction_fields").delete().eq("config_id", str(config_id)).execute()
+            await self.client.table("extraction_configs").delete().eq("id", str(config_id)).execute()
+        except Exception as e:
+            raise DatabaseError(f"Error deleting extraction config: {e}")
+
+    # Deletes a field.
+    async def delete_extraction_fields(self, field_ids: list[UUID]) -> None:
+        try:
+            str_ids = [str(fid) for fid in field_ids]
+            await self.client.table("extraction_fields").delete().in_("id", str_ids).execute()
+        except Exception as e:
+            raise DatabaseError(f"Error deleting extraction fields: {e}")
@@ -0,0 +1,140 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class BulkWriteSettings:
+    # PostgREST rejects large bodies and long statements, so writes are split by row count and by serialized size.
+    max_rows: int = 500
+    max_bytes: int = 512 * 1024
+    max_concurrency: int = 4
+
+
+DEFAULT_BULK_SETTINGS = BulkWriteSettings()
+
+
+@dataclass
+class ChunkResult:
+    index: int
+    row_count: int
+    rows: list[dict] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkWriteResult:
+    chunks: list[ChunkResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(chunk.ok for chunk in self.chunks)
+
+    @property
+    def failed_chunks(self) -> list[ChunkResult]:
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def written_count(self) -> int:
+        return sum(chunk.row_count for chunk in self.chunks if chunk.ok)
+
+    # Rows returned by the database for the chunks that succeeded, in input order.
+    @property
+    def rows(self) -> list[dict]:
+        return [row for chunk in self.chunks if chunk.ok for row in chunk.rows]
+
+    def error_summary(self) -> str:
+        failed = self.failed_chunks
+        if len(failed) == 1 and len(self.chunks) == 1:
+            return failed[0].error
+        return f"{len(failed)} of {len(self.chunks)} chunks failed: " + "; ".join(f"chunk {c.index}: {c.error}" for c in failed)
+
+
+# Splits rows into chunks of at most max_rows rows and (approximately) max_bytes of JSON.
+# A single row larger than max_bytes is sent on its own.
+def chunk_rows(rows: Iterable[dict], max_rows: int, max_bytes: int) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    chunk_bytes = 2  # Enclosing brackets of the JSON array.
+    for row in rows:
+        row_bytes = len(json.dumps(row, default=str).encode()) + 1
+        if chunk and (len(chunk) >= max_rows or chunk_bytes + row_bytes > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 2
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
+
+def _insert_query(client, table: str, rows: list[dict], on_conflict: Optional[str], ignore_duplicates: bool):
+    if on_conflict is not None:
+        return client.table(table).upsert(rows, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates)
+    return client.table(table).insert(rows)
+
+
+# Inserts rows in chunks, sending up to max_concurrency chunks at once.
+# Every chunk is attempted; failures are reported per chunk instead of aborting the whole write.
+# With on_conflict set, rows are upserted (or skipped if ignore_duplicates) on that conflict target.
+async def bulk_insert(
+    client,
+    table: str,
+    rows: Iterable[dict],
+    settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS,
+    on_conflict: Optional[str] = None,
+    ignore_duplicates: bool = False,
+) -> BulkWriteResult:
+    semaphore = asyncio.Semaphore(settings.max_concurrency)
+
+    async def send(index: int, chunk: list[dict]) -> ChunkResult:
+        async with semaphore:
+            try:
+                response = await _insert_query(client, table, chunk, on_conflict, ignore_duplicates).execute()
+                return ChunkResult(index=index, row_count=len(chunk), rows=response.data or [])
+            except Exception as e:
+                return ChunkResult(index=index, row_count=len(chunk), error=str(e))
+
+    chunks = chunk_rows(rows, settings.max_rows, settings.max_bytes)
+    return BulkWriteResult(chunks=list(await asyncio.gather(*(send(i, chunk) for i, chunk in enumerate(chunks)))))
+
+
+# Calls a database function once per chunk of rows, passing the chunk as its rows_param, up to max_concurrency at once.
+# Each chunk's ChunkResult.rows holds the function's result. Failures are reported per chunk, like bulk_insert.
+async def bulk_rpc(
+    client, function: str, rows_param: str, rows: Iterable[dict], settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS
+) -> BulkWriteResult:
+    semaphore = asyncio.Semaphore(settings.max_concurrency)
+
+    async def send(index: int, chunk: list[dict]) -> ChunkResult:
+        async with semaphore:
+            try:
+                response = await client.rpc(function, {rows_param: chunk}).execute()
+                return ChunkResult(index=index, row_count=len(chunk), rows=[response.data])
+            except Exception as e:
+                return ChunkResult(index=index, row_count=len(chunk), error=str(e))
+
+    chunks = chunk_rows(rows, settings.max_rows, settings.max_bytes)
+    return BulkWriteResult(chunks=list(await asyncio.gather(*(send(i, chunk) for i, chunk in enumerate(chunks)))))
+
+
+# Blocking variant of bulk_insert for ProjectDAL. Chunks are sent one after another.
+def bulk_insert_sync(
+    client,
+    table: str,
+    rows: Iterable[dict],
+    settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS,
+    on_conflict: Optional[str] = None,
+    ignore_duplicates: bool = False,
+) -> BulkWriteResult:
+    result = BulkWriteResult()
+    for index, chunk in enumerate(chunk_rows(rows, settings.max_rows, settings.max_bytes)):
+        try:
+            response = _insert_query(client, table, chunk, on_conflict, ignore_duplicates).execute()
+            result.chunks.append(ChunkResult(index=index, row_count=len(chunk), rows=response.data or []))
+        except Exception as e:
+            result.chunks.append(ChunkResult(index=index, row_count=len(chunk), error=str(e)))
+    return result
@@ -1,3 +1,11 @@
 # app/db/exceptions.py
 class DatabaseError(Exception):
     """Exception raised when a database operation fails."""
+
+
+class BulkWriteError(DatabaseError):
+    """Exception raised when one or more chunks of a bulk write fail. Carries the per-chunk results."""
+
+    def __init__(self, message: str, result):
+        super().__init__(message)
+        self.result = result
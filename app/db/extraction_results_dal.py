@@ -0,0 +1,150 @@
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from app.db.bulk_writer import DEFAULT_BULK_SETTINGS, BulkWriteResult, BulkWriteSettings, bulk_insert, bulk_rpc
+from app.db.exceptions import DatabaseError
+from app.db.pagination import Keyset, apply_keyset, split_page
+from app.db.projections import Projection
+from app.models.extraction_api_models import ExtractedFieldListItem
+
+# Columns returned by extracted field listings. The inner join on papers scopes rows to one project.
+EXTRACTED_FIELD_LIST_COLUMNS = (
+    Projection(
+        "id",
+        "paper_id",
+        "extraction_field_id",
+        "field_value",
+        "numeric_value",
+        "numeric_unit",
+        "ci_lower",
+        "ci_upper",
+        "sample_size",
+        "created_at",
+    )
+    .checked_against(ExtractedFieldListItem)
+    .with_columns("papers!inner(project_id)")
+)
+
+# Extraction fields of a project, through the inner join on its extraction config.
+EXTRACTION_FIELD_COLUMNS = Projection("id", "field_name", "created_at", "extraction_configs!inner(project_id)")
+
+# Extraction fields with what an extraction prompt needs.
+EXTRACTION_FIELD_PROMPT_COLUMNS = EXTRACTION_FIELD_COLUMNS.with_columns("description")
+
+# One row per paper with all of its extracted values embedded, so a page of papers is already grouped for pivoting.
+PAPER_VALUES_COLUMNS = Projection("id", "title", "created_at", "extracted_fields(extraction_field_id, field_value)")
+
+# Raw values of one extraction field, for normalization.
+FIELD_VALUE_COLUMNS = Projection("id", "field_value", "created_at")
+
+# Normalized numbers of one extraction field, for its stats.
+FIELD_NUMBER_COLUMNS = Projection("id", "paper_id", "extraction_field_id", "numeric_value", "numeric_unit", "created_at")
+
+# Everything the result matrix needs from a paper, without the title.
+PAPER_RESULTS_COLUMNS = Projection(
+    "id",
+    "created_at",
+    "extracted_fields(extraction_field_id, field_value, numeric_value, numeric_unit)",
+    "paper_filter_results(filter_id, passed)",
+)
+
+# A paper's filter outcomes alone, for stats of one field.
+PAPER_FILTER_RESULTS_COLUMNS = Projection("id", "created_at", "paper_filter_results(filter_id, passed)")
+
+# The (paper, field) cells a paper already has, with the field definition each was extracted with,
+# and the paper's filter outcomes.
+PAPER_CELL_COLUMNS = Projection("id", "created_at", "extracted_fields(extraction_field_id, field_hash)", "paper_filter_results(passed)")
+
+
+class ExtractionResultsDAL:
+    # Async DAL for extracted_fields, the values extracted from a project's papers.
+    # Data Access Control: RLS only exposes results for papers of projects the user owns.
+    def __init__(self, client, bulk_settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS):
+        self.client = client
+        self.bulk_settings = bulk_settings
+
+    # Lists extracted fields of a project ordered by (created_at, id), starting after the given keyset.
+    # Returns the page rows and the keyset of the last row if more rows follow.
+    async def list_extracted_fields(
+        self, project_id: UUID, page_size: int, after: Optional[Keyset] = None, columns: Projection = EXTRACTED_FIELD_LIST_COLUMNS
+    ) -> tuple[list[dict], Optional[Keyset]]:
+        try:
+            query = self.client.table("extracted_fields").select(str(columns)).eq("papers.project_id", str(project_id))
+            response = await apply_keyset(query, after, page_size).execute()
+            return split_page(response.data or [], page_size)
+        except Exception as e:
+            raise DatabaseError(f"Error listing extracted fields: {e}")
+
+    # Lists the extraction fields configured for a project, oldest first. Empty if there is no config or no access.
+    async def get_extraction_fields(self, project_id: UUID, columns: Projection = EXTRACTION_FIELD_COLUMNS) -> list[dict]:
+        try:
+            response = await (
+                self.client.table("extraction_fields")
+                .select(str(columns))
+                .eq("extraction_configs.project_id", str(project_id))
+                .order("created_at")
+                .order("id")
+                .execute()
+            )
+            return response.data or []
+        except Exception as e:
+            raise DatabaseError(f"Error fetching extraction fields: {e}")
+
+    # Yields pages of a project's papers, each with its extracted values embedded, in (created_at, id) order.
+    async def iter_paper_values(self, project_id: UUID, page_size: int = 500) -> AsyncIterator[list[dict]]:
+        async for rows in self._iter_papers(project_id, PAPER_VALUES_COLUMNS, page_size):
+            yield rows
+
+    # Yields pages of a project's papers with their extracted values and filter results embedded, ids only.
+    async def iter_paper_results(self, project_id: UUID, page_size: int = 1000) -> AsyncIterator[list[dict]]:
+        async for rows in self._iter_papers(project_id, PAPER_RESULTS_COLUMNS, page_size):
+            yield rows
+
+    # Yields pages of a project's papers with their filter results embedded, without any extracted values.
+    async def iter_paper_filter_results(self, project_id: UUID, page_size: int = 1000) -> AsyncIterator[list[dict]]:
+        async for rows in self._iter_papers(project_id, PAPER_FILTER_RESULTS_COLUMNS, page_size):
+            yield rows
+
+    # Yields pages of a project's papers with the cells they already have, for planning incremental runs.
+    async def iter_paper_cells(self, project_id: UUID, page_size: int = 1000) -> AsyncIterator[list[dict]]:
+        async for rows in self._iter_papers(project_id, PAPER_CELL_COLUMNS, page_size):
+            yield rows
+
+    # Yields pages of the values extracted for one field, in (created_at, id) order.
+    async def iter_field_values(
+        self, field_id: UUID, page_size: int = 1000, columns: Projection = FIELD_VALUE_COLUMNS
+    ) -> AsyncIterator[list[dict]]:
+        after = None
+        while True:
+            try:
+                query = self.client.table("extracted_fields").select(str(columns)).eq("extraction_field_id", str(field_id))
+                response = await apply_keyset(query, after, page_size).execute()
+                rows, after = split_page(response.data or [], page_size)
+            except Exception as e:
+                raise DatabaseError(f"Error fetching field values: {e}")
+            yield rows
+            if after is None:
+                return
+
+    # Writes extraction results, replacing rows with the same id. Failed chunks are reported in the result rather than raised.
+    async def upsert_extracted_fields(self, rows: list[dict]) -> BulkWriteResult:
+        return await bulk_insert(self.client, "extracted_fields", rows, self.bulk_settings, on_conflict="id")
+
+    # Writes only the normalized columns of existing rows, through app/db/sql/update_normalized_values.sql. Rows carry
+    # the id and the field_value that was normalized; rows whose value changed or that were deleted since are left alone.
+    # Each chunk's result rows hold its updated row count. Failed chunks are reported in the result rather than raised.
+    async def update_normalized_values(self, rows: list[dict]) -> BulkWriteResult:
+        return await bulk_rpc(self.client, "update_normalized_values", "p_rows", rows, self.bulk_settings)
+
+    async def _iter_papers(self, project_id: UUID, columns: Projection, page_size: int) -> AsyncIterator[list[dict]]:
+        after = None
+        while True:
+            try:
+                query = self.client.table("papers").select(str(columns)).eq("project_id", str(project_id))
+                response = await apply_keyset(query, after, page_size).execute()
+                rows, after = split_page(response.data or [], page_size)
+            except Exception as e:
+                raise DatabaseError(f"Error fetching extracted values: {e}")
+            yield rows
+            if after is None:
+                return
@@ -0,0 +1,48 @@
+from uuid import UUID
+
+from app.db.bulk_writer import DEFAULT_BULK_SETTINGS, BulkWriteResult, BulkWriteSettings, bulk_insert
+from app.db.exceptions import DatabaseError
+from app.db.projections import Projection
+
+# Columns needed to evaluate a filter (see app/extraction/filter_engine.py).
+FILTER_COLUMNS = Projection("id", "filter_scope", "user_specified_text_filter", "timestamp")
+
+# Columns identifying a stored filter result.
+FILTER_RESULT_KEY_COLUMNS = Projection("id", "paper_id", "filter_id")
+
+
+class FilterDAL:
+    # Async DAL for a project's filters and their results on papers.
+    # Data Access Control: RLS only exposes filters of projects the user owns.
+    def __init__(self, client, bulk_settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS):
+        self.client = client
+        self.bulk_settings = bulk_settings
+
+    # Filters of a project in creation order.
+    async def get_filters(self, project_id: UUID, columns: Projection = FILTER_COLUMNS) -> list[dict]:
+        try:
+            response = await (
+                self.client.table("filters").select(str(columns)).eq("project_id", str(project_id)).order("timestamp").order("id").execute()
+            )
+            return response.data or []
+        except Exception as e:
+            raise DatabaseError(f"Error fetching filters: {e}")
+
+    # Stored results of the given filters on the given papers.
+    async def get_filter_results(
+        self, paper_ids: list[str], filter_ids: list[str], columns: Projection = FILTER_RESULT_KEY_COLUMNS
+    ) -> list[dict]:
+        if not paper_ids or not filter_ids:
+            return []
+        try:
+            response = await (
+                self.client.table("paper_filter_results").select(str(columns)).in_("filter_id", filter_ids).in_("paper_id", paper_ids).execute()
+            )
+            return response.data or []
+        except Exception as e:
+            raise DatabaseError(f"Error fetching filter results: {e}")
+
+    # Upserts results on id, so re-evaluating a filter overwrites its previous outcome for a paper.
+    # Failed chunks are reported in the result rather than raised.
+    async def upsert_filter_results(self, rows: list[dict]) -> BulkWriteResult:
+        return await bulk_insert(self.client, "paper_filter_results", rows, self.bulk_settings, on_conflict="id")
@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+# Keyset pagination over (created_at, id). Each page asks for rows strictly after the last key of the
+# previous page, so the database seeks through an index instead of scanning and discarding OFFSET rows.
+
+Keyset = tuple[str, str]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+# Cursors are opaque to clients: base64url-encoded JSON of the last (created_at, id) on a page.
+def encode_cursor(keyset: Keyset) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(keyset)).encode()).decode().rstrip("=")
+
+
+# Cursors come from clients and their values end up in a PostgREST filter string (see apply_keyset), so they must
+# parse as a timestamp and a UUID; anything else, e.g. quotes or parentheses that would add filter conditions,
+# raises ValueError.
+def decode_cursor(cursor: str) -> Keyset:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(created_at, str) or not isinstance(row_id, str):
+            raise ValueError("cursor values must be strings")
+        datetime.fromisoformat(created_at)
+        return created_at, str(UUID(row_id))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+# Adds the keyset filter, ordering and limit to a select query. One extra row is requested to detect a next page.
+def apply_keyset(query, after: Optional[Keyset], page_size: int):
+    if after is not None:
+        created_at, row_id = after
+        query = query.or_(f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt."{row_id}")')
+    return query.order("created_at").order("id").limit(page_size + 1)
+
+
+# Trims the extra row and returns the page rows with the keyset to continue from, if there are more rows.
+def split_page(rows: list[dict], page_size: int) -> tuple[list[dict], Optional[Keyset]]:
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, (rows[-1]["created_at"], rows[-1]["id"])
@@ -0,0 +1,62 @@
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from app.db.bulk_writer import DEFAULT_BULK_SETTINGS, BulkWriteResult, BulkWriteSettings, bulk_insert
+from app.db.exceptions import DatabaseError
+from app.db.pagination import Keyset, apply_keyset, split_page
+from app.db.projections import Projection
+from app.models.paper_api_models import PaperListItem
+
+# Columns returned by paper listings. Abstracts and full text are left out to keep pages small.
+PAPER_LIST_COLUMNS = Projection("id", "title", "created_at").checked_against(PaperListItem, renames={"paper_id": "id"})
+
+# Columns needed to build a project's dedup index (see app/services/paper_dedup.py).
+PAPER_DEDUP_COLUMNS = Projection("id", "title", "doi", "pmid", "arxiv_id", "created_at")
+
+# Columns needed for near-duplicate detection (see app/services/near_duplicates.py) and extraction prompts.
+PAPER_TEXT_COLUMNS = Projection("id", "title", "abstract", "created_at")
+
+
+class PaperDAL:
+    # Async DAL for papers of a project.
+    # Data Access Control: RLS only exposes papers of projects the user owns.
+    def __init__(self, client, bulk_settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS):
+        self.client = client
+        self.bulk_settings = bulk_settings
+
+    # Lists papers of a project ordered by (created_at, id), starting after the given keyset.
+    # Returns the page rows and the keyset of the last row if more rows follow.
+    async def list_papers(
+        self, project_id: UUID, page_size: int, after: Optional[Keyset] = None, columns: Projection = PAPER_LIST_COLUMNS
+    ) -> tuple[list[dict], Optional[Keyset]]:
+        try:
+            query = self.client.table("papers").select(str(columns)).eq("project_id", str(project_id))
+            response = await apply_keyset(query, after, page_size).execute()
+            return split_page(response.data or [], page_size)
+        except Exception as e:
+            raise DatabaseError(f"Error listing papers: {e}")
+
+    # Yields all papers of a project page by page, so a large project is never fetched in one response.
+    async def iter_papers(self, project_id: UUID, columns: Projection = PAPER_LIST_COLUMNS, page_size: int = 1000) -> AsyncIterator[list[dict]]:
+        after = None
+        while True:
+            rows, after = await self.list_papers(project_id, page_size, after, columns=columns)
+            yield rows
+            if after is None:
+                return
+
+    # Fetches papers by id. Ids that do not exist or are not visible are simply missing from the result.
+    async def get_papers_by_ids(self, paper_ids: list[str], columns: Projection = PAPER_LIST_COLUMNS) -> list[dict]:
+        if not paper_ids:
+            return []
+        try:
+            response = await self.client.table("papers").select(str(columns)).in_("id", [str(paper_id) for paper_id in paper_ids]).execute()
+            return response.data or []
+        except Exception as e:
+            raise DatabaseError(f"Error fetching papers: {e}")
+
+    # Inserts papers in chunks, skipping rows whose id already exists.
+    # The result holds only the rows that were actually inserted, so duplicates are the difference.
+    # Failed chunks are reported in the result rather than raised, so a long ingestion can carry on.
+    async def insert_papers(self, rows: list[dict]) -> BulkWriteResult:
+        return await bulk_insert(self.client, "papers", rows, self.bulk_settings, on_conflict="id", ignore_duplicates=True)
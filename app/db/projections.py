@@ -0,0 +1,46 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class Projection:
+    # An explicit select clause for a DAL read. Declared once per call site instead of select("*"),
+    # so only the columns a response needs travel over the wire and get parsed.
+    def __init__(self, *columns: str):
+        if not columns:
+            raise ValueError("A projection needs at least one column")
+        self.columns = tuple(columns)
+
+    def __str__(self) -> str:
+        return ", ".join(self.columns)
+
+    def __repr__(self) -> str:
+        return f"Projection({str(self)!r})"
+
+    # Names of the selected columns and embedded resources, without aliases, hints or embedded columns.
+    @property
+    def names(self) -> list[str]:
+        return [column.split("(")[0].split("!")[0].split(":")[-1].strip() for column in self.columns]
+
+    # Adds columns that are needed by the query but not by the model, e.g. an !inner join used only for filtering.
+    def with_columns(self, *columns: str) -> "Projection":
+        return Projection(*self.columns, *columns)
+
+    # Checks the projection against the response model it feeds. renames maps model field -> column name.
+    # Raises ValueError at import time if a column is never read by the model, or a model field has no column,
+    # so projections cannot silently drift from the API models.
+    def checked_against(
+        self, model: type[BaseModel], renames: Optional[dict[str, str]] = None, exclude: tuple[str, ...] = ("status",)
+    ) -> "Projection":
+        renames = renames or {}
+        expected = {renames.get(name, name) for name in model.model_fields if name not in exclude}
+        selected = set(self.names)
+        unused = selected - expected
+        missing = expected - selected
+        if unused or missing:
+            raise ValueError(f"Projection {self} does not match {model.__name__}: unused {sorted(unused)}, missing {sorted(missing)}")
+        return self
+
+
+# For existence checks and lookups that only need the primary key.
+ID_ONLY = Projection("id")
@@ -2,25 +2,83 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-from app.db.exceptions import DatabaseError
+from app.db.bulk_writer import DEFAULT_BULK_SETTINGS, BulkWriteResult, BulkWriteSettings, bulk_insert_sync
+from app.db.exceptions import BulkWriteError, DatabaseError
+from app.db.pagination import Keyset, apply_keyset, split_page
+from app.db.projections import Projection
+from app.models.project_api_models import (
+    ExtractionConfigItem,
+    ExtractionFieldItem,
+    GetProjectResponse,
+    GetProjectTreeResponse,
+    ProjectListItem,
+    ProjectSourceItem,
+)
+
+# Declared projections, checked against the response models they feed (see app/db/projections.py).
+PROJECT_COLUMNS = Projection("id", "description", "created_at").checked_against(GetProjectResponse, renames={"project_id": "id"})
+PROJECT_LIST_COLUMNS = Projection("id", "description", "created_at").checked_against(ProjectListItem, renames={"project_id": "id"})
+EXTRACTION_CONFIG_COLUMNS = Projection("id", "project_id", "created_at")
+
+# Embedded select for a project and everything configured under it.
+PROJECT_SOURCE_COLUMNS = Projection("id", "backend_name", "backend_query").checked_against(ProjectSourceItem)
+EXTRACTION_FIELD_COLUMNS = Projection("id", "field_name", "description", "created_at").checked_against(ExtractionFieldItem)
+EXTRACTION_CONFIG_TREE_COLUMNS = Projection("id", "created_at", f"extraction_fields({EXTRACTION_FIELD_COLUMNS})").checked_against(
+    ExtractionConfigItem, renames={"fields": "extraction_fields"}
+)
+PROJECT_TREE_SELECT = Projection(
+    "id", "description", "created_at", f"project_sources({PROJECT_SOURCE_COLUMNS})", f"extraction_configs({EXTRACTION_CONFIG_TREE_COLUMNS})"
+).checked_against(GetProjectTreeResponse, renames={"project_id": "id", "sources": "project_sources", "extraction_config": "extraction_configs"})
 
 
 class ProjectDAL:
+    # Blocking DAL for scripts and tools. The API uses AsyncProjectDAL.
     # Data Access Control: Owner id for projects is set by supabase as the auth id.
     # It also validates permissions via auth id and RLS policies.
-    def __init__(self, client):
+    def __init__(self, client, bulk_settings: BulkWriteSettings = DEFAULT_BULK_SETTINGS):
         self.client = client
+        self.bulk_settings = bulk_settings
 
-    # Retrieves a project by project id, if the user has access.
-    def get_project_by_id(self, project_id: UUID) -> Optional[dict]:
+    # Retrieves a project by project id, if the user has access. columns selects what is fetched.
+    def get_project_by_id(self, project_id: UUID, columns: Projection = PROJECT_COLUMNS) -> Optional[dict]:
         try:
-            response = self.client.table("projects").select("*").eq("id", str(project_id)).limit(1).execute()
+            response = self.client.table("projects").select(str(columns)).eq("id", str(project_id)).limit(1).execute()
             if not response.data:
                 return None
             return response.data[0]
         except Exception as e:
             raise DatabaseError(f"Error fetching project: {e}")
 
+    # Retrieves a project with its sources, extraction config and fields in one round trip,
+    # using PostgREST resource embedding. Returns None if not found or no access.
+    def get_project_tree(self, project_id: UUID) -> Optional[dict]:
+        try:
+            response = (
+                self.client.table("projects")
+                .select(str(PROJECT_TREE_SELECT))
+                .eq("id", str(project_id))
+                .order("created_at", foreign_table="extraction_configs.extraction_fields")
+                .limit(1)
+                .execute()
+            )
+            if not response.data:
+                return None
+            return response.data[0]
+        except Exception as e:
+            raise DatabaseError(f"Error fetching project tree: {e}")
+
+    # Lists the user's projects ordered by (created_at, id), starting after the given keyset.
+    # Returns the page rows and the keyset of the last row if more rows follow.
+    def list_projects(
+        self, page_size: int, after: Optional[Keyset] = None, columns: Projection = PROJECT_LIST_COLUMNS
+    ) -> tuple[list[dict], Optional[Keyset]]:
+        try:
+            query = self.client.table("projects").select(str(columns))
+            response = apply_keyset(query, after, page_size).execute()
+            return split_page(response.data or [], page_size)
+        except Exception as e:
+            raise DatabaseError(f"Error listing projects: {e}")
+
     # Creates a new project with the given description, owned by the creating user.
     def create_project(self, description: str) -> Optional[dict]:
         new_project = {"id": str(uuid4()), "description": description, "created_at": datetime.now(timezone.utc).isoformat()}
@@ -48,14 +106,32 @@ class ProjectDAL:
         except Exception as e:
             raise DatabaseError(f"Error deleting project sources: {e}")
 
-    # Inserts multiple project_sources entries
-    def insert_project_sources(self, source_rows: list[dict]) -> None:
+    # Inserts multiple project_sources entries, in chunks that stay within PostgREST body limits.
+    def insert_project_sources(self, source_rows: list[dict]) -> BulkWriteResult:
+        result = bulk_insert_sync(self.client, "project_sources", source_rows, self.bulk_settings)
+        if not result.ok:
+            raise BulkWriteError(f"Error inserting project sources: {result.error_summary()}", result)
+        return result
+
+    # Replaces all sources of a project in one round trip and one transaction (see app/db/sql/replace_project_sources.sql).
+    # Returns the number of inserted sources, or None if the project does not exist or the user has no access.
+    def replace_project_sources(self, project_id: UUID, source_rows: list[dict]) -> Optional[int]:
+        try:
+            response = self.client.rpc("replace_project_sources", {"p_project_id": str(project_id), "p_sources": source_rows}).execute()
+            return response.data
+        except Exception as e:
+            raise DatabaseError(f"Error replacing project sources: {e}")
+
+    # Retrieves the extraction config of a project, if one exists and the user has access.
+    # Existence checks pass ID_ONLY so no other column is fetched.
+    def get_extraction_config_by_project(self, project_id: UUID, columns: Projection = EXTRACTION_CONFIG_COLUMNS) -> Optional[dict]:
         try:
-            if not source_rows:
-                return
-            self.client.table("project_sources").insert(source_rows).execute()
+            response = self.client.table("extraction_configs").select(str(columns)).eq("project_id", str(project_id)).limit(1).execute()
+            if not response.data:
+                return None
+            return response.data[0]
         except Exception as e:
-            raise DatabaseError(f"Error inserting project sources: {e}")
+            raise DatabaseError(f"Error fetching extraction config: {e}")
 
     # Creates a new extraction config for a project
     def create_extraction_config(self, project_id: UUID) -> dict:
@@ -66,16 +142,14 @@ class ProjectDAL:
         except Exception as e:
             raise DatabaseError(f"Error creating extraction config: {e}")
 
-    # Inserts an extraction field.
-    def insert_extraction_fields(self, config_id: UUID, fields: list[dict]) -> None:
-        try:
-            for field in fields:
-                field["id"] = str(uuid4())
-                field["config_id"] = str(config_id)
-                field["created_at"] = datetime.now(timezone.utc).isoformat()
-            self.client.table("extraction_fields").insert(fields).execute()
-        except Exception as e:
-            raise DatabaseError(f"Error inserting extraction fields: {e}")
+    # Inserts extraction fields for a config, in chunks. The caller's dicts are left untouched.
+    def insert_extraction_fields(self, config_id: UUID, fields: list[dict]) -> BulkWriteResult:
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [{**field, "id": str(uuid4()), "config_id": str(config_id), "created_at": now} for field in fields]
+        result = bulk_insert_sync(self.client, "extraction_fields", rows, self.bulk_settings)
+        if not result.ok:
+            raise BulkWriteError(f"Error inserting extraction fields: {result.error_summary()}", result)
+        return result
 
     # Deletes an extraction config.
     def delete_extraction_config(self, config_id: UUID) -> None:
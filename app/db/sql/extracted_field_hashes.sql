@@ -0,0 +1,5 @@
+-- Definition of the extraction field a value was extracted with, so runs can re-extract only the cells whose field
+-- was edited since. field_hash is written by the extraction engine; rows without it (e.g. entered by hand) are
+-- never considered stale.
+alter table public.extracted_fields
+  add column if not exists field_hash text;
@@ -0,0 +1,12 @@
+-- Numbers parsed from extracted_fields.field_value by metric normalization, stored next to the raw text
+-- so dashboards read them directly instead of parsing every value on each refresh.
+-- Units are canonical (s, B, g, m, ratio); ci_lower and ci_upper are in the same unit as numeric_value.
+alter table public.extracted_fields
+  add column if not exists numeric_value double precision,
+  add column if not exists numeric_unit text,
+  add column if not exists ci_lower double precision,
+  add column if not exists ci_upper double precision,
+  add column if not exists sample_size bigint,
+  add column if not exists normalized_at timestamptz;
+
+create index if not exists extracted_fields_field_numeric_value_idx on public.extracted_fields (extraction_field_id, numeric_value);
@@ -0,0 +1,15 @@
+-- Keyset pagination orders lists by (created_at, id).
+-- These columns and indexes let each page seek directly to its first row.
+alter table public.papers add column if not exists created_at timestamptz not null default now();
+alter table public.extracted_fields add column if not exists created_at timestamptz not null default now();
+
+create index if not exists projects_owner_created_at_id_idx on public.projects (owner_id, created_at, id);
+create index if not exists papers_project_created_at_id_idx on public.papers (project_id, created_at, id);
+create index if not exists extracted_fields_paper_created_at_id_idx on public.extracted_fields (paper_id, created_at, id);
+
+-- extracted_fields has no project_id: the project listing filters through its inner join on papers and orders the
+-- whole table by (created_at, id), which the paper_id index above cannot serve. This one lets each page walk rows
+-- in key order from the cursor, probing papers_pkey for the project, and stop after page_size + 1 matches.
+create index if not exists extracted_fields_created_at_id_idx on public.extracted_fields (created_at, id);
+-- Pages of one field's values (normalization and field stats) seek within the field.
+create index if not exists extracted_fields_field_created_at_id_idx on public.extracted_fields (extraction_field_id, created_at, id);
@@ -0,0 +1,5 @@
+-- External identifiers for papers loaded through POST /projects/{id}/papers:bulk.
+-- Bulk ingestion derives paper ids from these, so re-sending a paper is a conflict on the primary key and is skipped.
+alter table public.papers add column if not exists doi text;
+alter table public.papers add column if not exists pmid text;
+alter table public.papers add column if not exists arxiv_id text;
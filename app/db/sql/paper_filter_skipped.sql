@@ -0,0 +1,4 @@
+-- Filters left unevaluated because an earlier filter already failed the paper are stored with passed = null and
+-- decided_by = 'skipped' (see app/extraction/filter_engine.py).
+alter table public.paper_filter_results
+  alter column passed drop not null;
@@ -0,0 +1,3 @@
+-- Which stage of the filter cascade decided a result: 'rule', 'lexical' or 'llm' (see app/extraction/filter_engine.py).
+alter table public.paper_filter_results
+  add column if not exists decided_by text;
@@ -0,0 +1,26 @@
+-- Replaces all sources of a project in one transaction.
+-- Called via PostgREST: POST /rest/v1/rpc/replace_project_sources
+-- Runs as the caller (security invoker), so RLS on projects and project_sources still applies.
+-- Returns the number of inserted sources, or NULL if the project does not exist or is not visible.
+create or replace function public.replace_project_sources(p_project_id uuid, p_sources jsonb)
+returns integer
+language plpgsql
+security invoker
+as $$
+declare
+  inserted integer;
+begin
+  if not exists (select 1 from public.projects where id = p_project_id) then
+    return null;
+  end if;
+
+  delete from public.project_sources where project_id = p_project_id;
+
+  insert into public.project_sources (id, project_id, backend_name, backend_query)
+  select coalesce((s ->> 'id')::uuid, gen_random_uuid()), p_project_id, s ->> 'backend_name', s ->> 'backend_query'
+  from jsonb_array_elements(coalesce(p_sources, '[]'::jsonb)) as s;
+
+  get diagnostics inserted = row_count;
+  return inserted;
+end;
+$$;
@@ -0,0 +1,38 @@
+-- Writes normalized numbers of extracted_fields rows, and nothing else.
+-- Called via PostgREST: POST /rest/v1/rpc/update_normalized_values
+-- Runs as the caller (security invoker), so RLS on extracted_fields still applies.
+-- p_rows holds {id, field_value, numeric_value, numeric_unit, ci_lower, ci_upper, sample_size, normalized_at} objects.
+-- A row is only updated while its field_value is still the text that was normalized, so a value re-extracted
+-- in the meantime keeps the numbers written with it, and rows deleted in the meantime stay deleted.
+-- Returns the number of updated rows.
+create or replace function public.update_normalized_values(p_rows jsonb)
+returns integer
+language plpgsql
+security invoker
+as $$
+declare
+  updated integer;
+begin
+  update public.extracted_fields as e
+  set numeric_value = r.numeric_value,
+      numeric_unit = r.numeric_unit,
+      ci_lower = r.ci_lower,
+      ci_upper = r.ci_upper,
+      sample_size = r.sample_size,
+      normalized_at = r.normalized_at
+  from jsonb_to_recordset(coalesce(p_rows, '[]'::jsonb)) as r(
+    id uuid,
+    field_value text,
+    numeric_value double precision,
+    numeric_unit text,
+    ci_lower double precision,
+    ci_upper double precision,
+    sample_size bigint,
+    normalized_at timestamptz
+  )
+  where e.id = r.id and e.field_value is not distinct from r.field_value;
+
+  get diagnostics updated = row_count;
+  return updated;
+end;
+$$;
@@ -1,9 +1,14 @@
 # app/db/supabase_client.py
 import os
+from dataclasses import dataclass
+from typing import Optional
 
+import httpx
+from postgrest import AsyncPostgrestClient, SyncPostgrestClient
 from supabase import create_client
 
 
+# Standalone client for scripts and tools. The API uses AsyncSupabaseClientPool instead.
 def get_supabase_client_for_user(jwt: str):
     url = os.getenv("SUPABASE_PROJECT_URL")
     anon_key = os.getenv("SUPABASE_ANON_KEY")
@@ -14,3 +19,81 @@ def get_supabase_client_for_user(jwt: str):
     client.postgrest.auth(jwt)
 
     return client
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    url: str
+    anon_key: str
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 10.0
+
+    # Reads pool settings from the environment, falling back to the defaults above.
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            url=os.environ["SUPABASE_PROJECT_URL"],
+            anon_key=os.environ["SUPABASE_ANON_KEY"],
+            max_connections=int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive_connections=int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", cls.max_keepalive_connections)),
+            keepalive_expiry=float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", cls.keepalive_expiry)),
+            timeout=float(os.getenv("SUPABASE_POOL_TIMEOUT", cls.timeout)),
+        )
+
+    @property
+    def rest_url(self) -> str:
+        return f"{self.url.rstrip('/')}/rest/v1"
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class SupabaseClientPool:
+    # Blocking variant of the shared pool, for scripts that use ProjectDAL.
+    # Each caller gets a lightweight PostgREST client that carries its JWT
+    # in its own headers, so RLS still applies per user and no auth state is shared.
+    def __init__(self, settings: PoolSettings, http_client: Optional[httpx.Client] = None):
+        self.settings = settings
+        self.http_client = http_client or httpx.Client(limits=settings.limits, timeout=settings.timeout, http2=True, follow_redirects=True)
+
+    # Returns a PostgREST client bound to the shared pool and authorized as the given user.
+    def client_for_user(self, jwt: str) -> SyncPostgrestClient:
+        client = SyncPostgrestClient(
+            self.settings.rest_url,
+            headers={"apikey": self.settings.anon_key},
+            http_client=self.http_client,
+        )
+        return client.auth(jwt)
+
+    # Closes all pooled connections.
+    def close(self) -> None:
+        self.http_client.close()
+
+
+class AsyncSupabaseClientPool:
+    # One keep-alive HTTP connection pool per process, shared by all API requests.
+    # Requests are awaited on the event loop, so a worker serves other requests while
+    # waiting on PostgREST instead of blocking.
+    def __init__(self, settings: PoolSettings, http_client: Optional[httpx.AsyncClient] = None):
+        self.settings = settings
+        self.http_client = http_client or httpx.AsyncClient(limits=settings.limits, timeout=settings.timeout, http2=True, follow_redirects=True)
+
+    # Returns an async PostgREST client bound to the shared pool and authorized as the given user.
+    def client_for_user(self, jwt: str) -> AsyncPostgrestClient:
+        client = AsyncPostgrestClient(
+            self.settings.rest_url,
+            headers={"apikey": self.settings.anon_key},
+            http_client=self.http_client,
+        )
+        return client.auth(jwt)
+
+    # Closes all pooled connections. Called once on application shutdown.
+    async def close(self) -> None:
+        await self.http_client.aclose()
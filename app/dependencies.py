@@ -1,14 +1,46 @@
 # app/dependencies.py
 
-from app.db.supabase_client import get_supabase_client_for_user
-from fastapi import Depends, HTTPException
+from app.auth.exceptions import InvalidTokenError
+from app.auth.jwt_verifier import JWTVerifier, VerifiedClaims
+from app.db.supabase_client import AsyncSupabaseClientPool
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 security = HTTPBearer()
 
 
-def get_client(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def get_client_pool(request: Request) -> AsyncSupabaseClientPool:
+    return request.app.state.supabase_pool
+
+
+def get_token_verifier(request: Request) -> JWTVerifier:
+    return request.app.state.token_verifier
+
+
+# Verifies the bearer token locally, so bad tokens never reach Supabase.
+# Claims are kept on request.state for layers that are not wired through Depends.
+def get_claims(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    verifier: JWTVerifier = Depends(get_token_verifier),
+) -> VerifiedClaims:
     if not credentials:
         raise HTTPException(status_code=401, detail="Missing token")
-    jwt = credentials.credentials
-    return get_supabase_client_for_user(jwt)
+    try:
+        claims = verifier.verify(credentials.credentials)
+    except InvalidTokenError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+    request.state.claims = claims
+    return claims
+
+
+def get_current_user_id(claims: VerifiedClaims = Depends(get_claims)) -> str:
+    return claims.user_id
+
+
+def get_client(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    claims: VerifiedClaims = Depends(get_claims),
+    pool: AsyncSupabaseClientPool = Depends(get_client_pool),
+):
+    return pool.client_for_user(credentials.credentials)
@@ -0,0 +1,303 @@
+import asyncio
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.db.papers_dal import PAPER_TEXT_COLUMNS, PaperDAL
+from app.extraction.llm import LLMClient, LLMRequest, llm_client_from_env
+from app.extraction.prompts import build_prompt, estimate_tokens, field_definition_hash, group_fields, parse_answer
+from app.extraction.queue import QUEUED, WorkItem, WorkQueue
+from app.extraction.result_cache import ResultCache, cache_key
+from app.services.field_stats import FieldStatsCache
+from app.services.metric_normalization import normalize_values
+from app.services.rate_limiter import RateLimiter
+
+# Runs extraction work items from the WorkQueue: each run gets a pool of worker tasks that lease items, ask the LLM
+# for the item's fields, and hand the answers to a batching writer. LLM calls from all runs share one concurrency
+# limit and one rate limiter, so adding workers raises throughput up to the provider's limits and no further.
+
+# extracted_fields ids are derived from (paper, field), so re-extracting a cell overwrites its previous value.
+RESULT_ID_NAMESPACE = UUID("0b7f8e2c-3d41-4c55-9a0e-6c2b1d9f4e73")
+
+
+def result_id(paper_id: str, field_id: str) -> str:
+    return str(uuid.uuid5(RESULT_ID_NAMESPACE, f"{paper_id}:{field_id}"))
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    workers: int = 4
+    max_concurrency: int = 8
+    lease_batch: int = 8
+    lease_seconds: float = 600.0
+    write_batch: int = 200
+    max_attempts: int = 3
+    # Output budget of an extraction call: output_tokens_per_field for each field asked, at most max_output_tokens,
+    # which also caps how many fields are asked together.
+    max_output_tokens: int = 4096
+    output_tokens_per_field: int = 128
+    max_prompt_tokens: int = 8000
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+    @property
+    def max_group_fields(self) -> int:
+        return max(1, self.max_output_tokens // self.output_tokens_per_field)
+
+    def output_budget(self, field_count: int) -> int:
+        return min(self.max_output_tokens, self.output_tokens_per_field * field_count)
+
+    @classmethod
+    def from_env(cls) -> "EngineSettings":
+        def optional(name: str) -> Optional[float]:
+            value = os.getenv(name)
+            return float(value) if value else None
+
+        return cls(
+            workers=int(os.getenv("EXTRACTION_WORKERS", cls.workers)),
+            max_concurrency=int(os.getenv("EXTRACTION_MAX_CONCURRENCY", cls.max_concurrency)),
+            write_batch=int(os.getenv("EXTRACTION_WRITE_BATCH", cls.write_batch)),
+            max_attempts=int(os.getenv("EXTRACTION_MAX_ATTEMPTS", cls.max_attempts)),
+            max_prompt_tokens=int(os.getenv("EXTRACTION_MAX_PROMPT_TOKENS", cls.max_prompt_tokens)),
+            max_output_tokens=int(os.getenv("EXTRACTION_MAX_OUTPUT_TOKENS", cls.max_output_tokens)),
+            output_tokens_per_field=int(os.getenv("EXTRACTION_OUTPUT_TOKENS_PER_FIELD", cls.output_tokens_per_field)),
+            requests_per_minute=optional("EXTRACTION_REQUESTS_PER_MINUTE"),
+            tokens_per_minute=optional("EXTRACTION_TOKENS_PER_MINUTE"),
+        )
+
+
+@dataclass
+class EngineStats:
+    llm_calls: int = 0
+    fallback_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    rows_written: int = 0
+
+
+# What a run's workers need: DALs authorized as the user who started the run, and the project's fields by id.
+@dataclass
+class RunContext:
+    run_id: str
+    results_dal: ExtractionResultsDAL
+    paper_dal: PaperDAL
+    fields: dict[str, dict] = field(default_factory=dict)
+    # Forced runs ask the LLM again instead of reusing cached answers, and cache the new ones.
+    force: bool = False
+
+
+class ExtractionEngine:
+    def __init__(
+        self,
+        queue: WorkQueue,
+        llm: LLMClient,
+        settings: EngineSettings = EngineSettings(),
+        limiter: Optional[RateLimiter] = None,
+        stats_cache: Optional[FieldStatsCache] = None,
+        result_cache: Optional[ResultCache] = None,
+    ):
+        self.queue = queue
+        self.llm = llm
+        self.settings = settings
+        self.limiter = limiter or RateLimiter.per_minute(settings.requests_per_minute, settings.tokens_per_minute)
+        self.stats_cache = stats_cache
+        self.result_cache = result_cache
+        self.stats = EngineStats()
+        self._llm_slots = asyncio.Semaphore(settings.max_concurrency)
+        self._runs: dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_env(cls, stats_cache: Optional[FieldStatsCache] = None) -> "ExtractionEngine":
+        return cls(
+            queue=WorkQueue(os.getenv("EXTRACTION_QUEUE_PATH", "extraction_queue.db")),
+            llm=llm_client_from_env(),
+            settings=EngineSettings.from_env(),
+            stats_cache=stats_cache,
+            result_cache=ResultCache.from_env(),
+        )
+
+    # Starts processing a run's queued items in the background. Does nothing if the run is already being processed.
+    def start(self, context: RunContext) -> asyncio.Task:
+        task = self._runs.get(context.run_id)
+        if task is None or task.done():
+            task = self._runs[context.run_id] = asyncio.create_task(self._run(context))
+        return task
+
+    def is_running(self, run_id: str) -> bool:
+        task = self._runs.get(run_id)
+        return task is not None and not task.done()
+
+    async def close(self) -> None:
+        for task in self._runs.values():
+            task.cancel()
+        await asyncio.gather(*self._runs.values(), return_exceptions=True)
+        await self.llm.close()
+        self.queue.close()
+        if self.result_cache is not None:
+            self.result_cache.close()
+
+    # Items that fail are put back in the queue, so the workers are restarted until nothing is left to retry.
+    async def _run(self, context: RunContext) -> None:
+        writer = _ResultWriter(self, context)
+        while True:
+            await asyncio.gather(*(self._worker(context, writer) for _ in range(self.settings.workers)))
+            await writer.flush()
+            counts = await asyncio.to_thread(self.queue.counts, context.run_id)
+            if not counts[QUEUED]:
+                return
+
+    async def _worker(self, context: RunContext, writer: "_ResultWriter") -> None:
+        while True:
+            items = await asyncio.to_thread(self.queue.lease, context.run_id, self.settings.lease_batch, self.settings.lease_seconds)
+            if not items:
+                return
+            try:
+                papers = await context.paper_dal.get_papers_by_ids([item.paper_id for item in items], columns=PAPER_TEXT_COLUMNS)
+            except Exception as e:
+                await self._fail(items, f"Error loading papers: {e}")
+                continue
+
+            by_id = {paper["id"]: paper for paper in papers}
+            outcomes = await asyncio.gather(*(self._extract(context, item, by_id.get(item.paper_id)) for item in items), return_exceptions=True)
+            failed = [item for item, outcome in zip(items, outcomes) if isinstance(outcome, Exception)]
+            if failed:
+                await self._fail(failed, "; ".join(sorted({str(outcome) for outcome in outcomes if isinstance(outcome, Exception)})))
+            for item, outcome in zip(items, outcomes):
+                if not isinstance(outcome, Exception):
+                    await writer.add(item, outcome)
+
+    # Rows for one work item. Fields answered before come from the result cache; the rest are asked together, in as few
+    # prompts as max_prompt_tokens and the output budget allow, so the paper text is sent once per group rather than
+    # once per field.
+    # A paper deleted since the run was planned yields no rows.
+    async def _extract(self, context: RunContext, item: WorkItem, paper: Optional[dict]) -> list[dict]:
+        fields = [context.fields[field_id] for field_id in item.field_ids if field_id in context.fields]
+        if paper is None or not fields:
+            return []
+        keys, values = {}, {}
+        if self.result_cache is not None:
+            keys = {field["id"]: cache_key(paper, field, self.llm.model) for field in fields}
+            if not context.force:
+                cached = await asyncio.to_thread(self.result_cache.get_many, list(keys.values()))
+                values = {field["field_name"]: cached[keys[field["id"]]] for field in fields if keys[field["id"]] in cached}
+
+        # A field the LLM left out even when asked alone fails the item rather than being stored as empty. The fields
+        # that were answered are cached first, so the retry only asks for the rest.
+        asked = [field for field in fields if field["field_name"] not in values]
+        if asked:
+            answers = await asyncio.gather(
+                *(
+                    self._ask_group(paper, group)
+                    for group in group_fields(paper, asked, self.settings.max_prompt_tokens, self.settings.max_group_fields)
+                ),
+                return_exceptions=True,
+            )
+            answered = {name: value for answer in answers if isinstance(answer, dict) for name, value in answer.items()}
+            values.update(answered)
+            if self.result_cache is not None:
+                await asyncio.to_thread(
+                    self.result_cache.put_many,
+                    {keys[field["id"]]: answered[field["field_name"]] for field in asked if field["field_name"] in answered},
+                )
+            for answer in answers:
+                if isinstance(answer, BaseException):
+                    raise answer
+            unanswered = [field["field_name"] for field in asked if field["field_name"] not in answered]
+            if unanswered:
+                raise ValueError(f"No answer for fields: {', '.join(unanswered)}")
+        return [
+            {
+                "id": result_id(item.paper_id, field["id"]),
+                "paper_id": item.paper_id,
+                "extraction_field_id": field["id"],
+                "field_value": values.get(field["field_name"]),
+                "field_hash": field_definition_hash(field),
+            }
+            for field in fields
+        ]
+
+    # Fields missing from the group's answer, or all of them if the answer is not valid JSON, are asked one by one.
+    # Errors of those single-field calls fail the item, which is then retried by the queue.
+    async def _ask_group(self, paper: dict, fields: list[dict]) -> dict[str, Optional[str]]:
+        if len(fields) == 1:
+            return await self._ask(paper, fields)
+        try:
+            answer = await self._ask(paper, fields)
+        except ValueError:
+            answer = {}
+        missing = [field for field in fields if field["field_name"] not in answer]
+        self.stats.fallback_calls += len(missing)
+        for retried in await asyncio.gather(*(self._ask(paper, [field]) for field in missing)):
+            answer.update(retried)
+        return answer
+
+    # Sends a prompt to the LLM under the engine's concurrency and rate limits, which other LLM users
+    # (e.g. filter evaluation) share by calling this too.
+    async def complete(self, prompt: str, max_output_tokens: Optional[int] = None) -> str:
+        max_output_tokens = max_output_tokens or self.settings.max_output_tokens
+        async with self._llm_slots:
+            await self.limiter.acquire(estimate_tokens(prompt) + max_output_tokens)
+            response = await self.llm.complete(LLMRequest(prompt=prompt, max_output_tokens=max_output_tokens))
+        self.stats.llm_calls += 1
+        self.stats.input_tokens += response.input_tokens
+        self.stats.output_tokens += response.output_tokens
+        return response.text
+
+    async def _ask(self, paper: dict, fields: list[dict]) -> dict[str, Optional[str]]:
+        return parse_answer(await self.complete(build_prompt(paper, fields), self.settings.output_budget(len(fields))), fields)
+
+    async def _fail(self, items: list[WorkItem], error: str) -> None:
+        await asyncio.to_thread(self.queue.fail, [item.id for item in items], error, self.settings.max_attempts)
+
+
+class _ResultWriter:
+    # Collects the rows of finished items and writes them in batches of about write_batch rows.
+    # Items are marked done only once their rows are stored; items with rows in a failed chunk are retried.
+    # Values are normalized (see metric_normalization.py) on the way, so numeric columns never lag the text.
+    def __init__(self, engine: ExtractionEngine, context: RunContext):
+        self.engine = engine
+        self.context = context
+        self._pending: list[tuple[WorkItem, list[dict]]] = []
+        self._row_count = 0
+        self._lock = asyncio.Lock()
+
+    async def add(self, item: WorkItem, rows: list[dict]) -> None:
+        self._pending.append((item, rows))
+        self._row_count += len(rows)
+        if self._row_count >= self.engine.settings.write_batch:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            pending, self._pending, self._row_count = self._pending, [], 0
+            if not pending:
+                return
+            rows = [row for _, item_rows in pending for row in item_rows]
+            now = datetime.now(timezone.utc).isoformat()
+            normalized = normalize_values([row["field_value"] for row in rows])
+            rows = [{**row, **normalized.columns(i), "normalized_at": now, "created_at": now} for i, row in enumerate(rows)]
+            result = await self.context.results_dal.upsert_extracted_fields(rows)
+
+            # Chunks hold consecutive rows, so failed rows are found from the chunk sizes.
+            failed_rows, offset = set(), 0
+            for chunk in result.chunks:
+                if not chunk.ok:
+                    failed_rows.update(range(offset, offset + chunk.row_count))
+                offset += chunk.row_count
+            done, failed, offset = [], [], 0
+            for item, item_rows in pending:
+                item_failed = any(i in failed_rows for i in range(offset, offset + len(item_rows)))
+                (failed if item_failed else done).append(item.id)
+                offset += len(item_rows)
+
+            self.engine.stats.rows_written += result.written_count
+            await asyncio.to_thread(self.engine.queue.complete, done)
+            if failed:
+                await asyncio.to_thread(self.engine.queue.fail, failed, result.error_summary(), self.engine.settings.max_attempts)
+            if self.engine.stats_cache is not None:
+                for field_id in {row["extraction_field_id"] for row in rows}:
+                    await self.engine.stats_cache.invalidate_field(field_id)
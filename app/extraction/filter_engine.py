@@ -0,0 +1,177 @@
+import asyncio
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from app.extraction.engine import ExtractionEngine
+from app.extraction.filter_rules import CompiledFilter, compile_filter, lexical_scores
+from app.extraction.prompts import build_filter_prompt, parse_filter_answer
+
+# Evaluates a filter on a page of papers as a cascade, cheapest stage first:
+# 1. rules (require/exclude lines, see filter_rules.py) fail papers deterministically;
+# 2. a lexical score of the criterion fails papers that share no topic word with it, and can be configured to fail
+#    weak matches and pass close ones;
+# 3. the LLM decides the papers still undecided.
+# A filter without a criterion is decided by its rules alone. Most papers of a broad search never reach the LLM.
+#
+# A paper must pass all of a project's filters, so evaluate_page stops at a paper's first failure and records the
+# remaining filters as skipped. Filters are ordered by expected cost per paper they remove, cost / (1 - pass rate),
+# from the pass rates and LLM calls observed so far; cheap, selective filters run first and expensive ones see
+# only the papers that survived them.
+
+RULE = "rule"
+LEXICAL = "lexical"
+LLM = "llm"
+SKIPPED = "skipped"
+
+# Cost of deciding a paper without the LLM, in LLM calls.
+LOCAL_COST = 0.01
+
+# paper_filter_results ids are derived from (paper, filter), so re-evaluating a filter overwrites its outcome.
+FILTER_RESULT_ID_NAMESPACE = UUID("5c1d7a90-8e2b-4f36-b0d4-2a9e6f13c8b5")
+
+
+def filter_result_id(paper_id: str, filter_id: str) -> str:
+    return str(uuid.uuid5(FILTER_RESULT_ID_NAMESPACE, f"{paper_id}:{filter_id}"))
+
+
+# Lexical scores are relative to the papers scored together (see lexical_scores), so reject_below and accept_above
+# can decide the same paper differently on another page. With reject_below None only a score of 0, no topic word
+# in common, fails a paper, which does not depend on the page.
+@dataclass(frozen=True)
+class FilterSettings:
+    reject_below: Optional[float] = None
+    accept_above: Optional[float] = None
+    max_output_tokens: int = 16
+
+    @classmethod
+    def from_env(cls) -> "FilterSettings":
+        def optional(name: str) -> Optional[float]:
+            value = os.getenv(name)
+            return float(value) if value else None
+
+        return cls(reject_below=optional("FILTER_LEXICAL_REJECT_BELOW"), accept_above=optional("FILTER_LEXICAL_ACCEPT_ABOVE"))
+
+
+# passed is None for a skipped filter.
+@dataclass(frozen=True)
+class FilterDecision:
+    passed: Optional[bool]
+    decided_by: str
+
+
+_SKIP = FilterDecision(None, SKIPPED)
+
+
+@dataclass
+class FilterStats:
+    evaluated: int = 0
+    passed: int = 0
+    llm_calls: int = 0
+
+    # Smoothed towards 1/2, so a filter seen on few papers is not ranked on noise.
+    @property
+    def pass_rate(self) -> float:
+        return (self.passed + 1) / (self.evaluated + 2)
+
+    # LLM calls per evaluated paper, starting from prior for a filter not seen yet.
+    def cost(self, prior: float) -> float:
+        return (self.llm_calls + LOCAL_COST * self.evaluated + prior) / (self.evaluated + 1)
+
+
+# A filter compiled once and evaluated on every page of papers.
+@dataclass
+class PreparedFilter:
+    id: str
+    scope: Optional[str]
+    compiled: CompiledFilter
+
+    # Raises RuleSyntaxError if the filter's rule lines are invalid.
+    @classmethod
+    def from_row(cls, row: dict) -> "PreparedFilter":
+        return cls(id=row["id"], scope=row.get("filter_scope"), compiled=compile_filter(row.get("user_specified_text_filter")))
+
+    def text(self, paper: dict) -> str:
+        title, abstract = paper.get("title") or "", paper.get("abstract") or ""
+        if self.scope == "title":
+            return title
+        if self.scope == "abstract":
+            return abstract
+        return f"{title}\n{abstract}"
+
+
+class FilterEngine:
+    # LLM calls go through the extraction engine, so both share one concurrency limit and rate limiter.
+    def __init__(self, engine: ExtractionEngine, settings: FilterSettings = FilterSettings()):
+        self.engine = engine
+        self.settings = settings
+        self.stats: dict[str, FilterStats] = {}
+
+    # Filters in evaluation order, cheapest per removed paper first. Until a filter has been observed, one with a
+    # criterion is assumed to need an LLM call per paper.
+    def order(self, filters: list[PreparedFilter]) -> list[PreparedFilter]:
+        def expected_cost(prepared: PreparedFilter) -> float:
+            stats = self.stats.get(prepared.id, FilterStats())
+            prior = 1.0 if prepared.compiled.criterion else LOCAL_COST
+            return stats.cost(prior) / (1.0 - stats.pass_rate)
+
+        return sorted(filters, key=expected_cost)
+
+    # Decisions of every filter for every paper, by filter id. Each paper is evaluated until its first failure;
+    # a failed LLM call does not fail the paper.
+    async def evaluate_page(self, filters: list[PreparedFilter], papers: list[dict]) -> dict[str, list[Optional[FilterDecision]]]:
+        decisions: dict[str, list[Optional[FilterDecision]]] = {prepared.id: [_SKIP] * len(papers) for prepared in filters}
+        remaining = list(range(len(papers)))
+        for prepared in self.order(filters):
+            if not remaining:
+                break
+            outcomes = await self.evaluate(prepared, [papers[i] for i in remaining])
+            for i, decision in zip(remaining, outcomes):
+                decisions[prepared.id][i] = decision
+            remaining = [i for i, decision in zip(remaining, outcomes) if decision is None or decision.passed]
+        return decisions
+
+    # One decision per paper, None where the LLM call failed.
+    async def evaluate(self, prepared: PreparedFilter, papers: list[dict]) -> list[Optional[FilterDecision]]:
+        compiled = prepared.compiled
+        texts = [prepared.text(paper) for paper in papers]
+        decisions: list[Optional[FilterDecision]] = [None] * len(papers)
+
+        undecided = compiled.rule_mask(texts) if compiled.has_rules else np.ones(len(papers), dtype=bool)
+        for i in np.flatnonzero(~undecided):
+            decisions[i] = FilterDecision(False, RULE)
+        if not compiled.criterion:
+            for i in np.flatnonzero(undecided):
+                decisions[i] = FilterDecision(True, RULE)
+            self._record(prepared, decisions, llm_calls=0)
+            return decisions
+
+        scores = lexical_scores(compiled.criterion, texts)
+        rejected = undecided & (scores == 0 if self.settings.reject_below is None else scores < self.settings.reject_below)
+        accepted = undecided & (scores >= self.settings.accept_above) if self.settings.accept_above is not None else np.zeros_like(undecided)
+        for i in np.flatnonzero(rejected):
+            decisions[i] = FilterDecision(False, LEXICAL)
+        for i in np.flatnonzero(accepted & ~rejected):
+            decisions[i] = FilterDecision(True, LEXICAL)
+
+        ambiguous = np.flatnonzero(undecided & ~rejected & ~accepted)
+        answers = await asyncio.gather(*(self._ask(texts[i], compiled.criterion) for i in ambiguous), return_exceptions=True)
+        for i, answer in zip(ambiguous, answers):
+            if not isinstance(answer, Exception):
+                decisions[i] = FilterDecision(answer, LLM)
+        self._record(prepared, decisions, llm_calls=len(ambiguous))
+        return decisions
+
+    def _record(self, prepared: PreparedFilter, decisions: list[Optional[FilterDecision]], llm_calls: int) -> None:
+        stats = self.stats.setdefault(prepared.id, FilterStats())
+        decided = [decision for decision in decisions if decision is not None]
+        stats.evaluated += len(decided)
+        stats.passed += sum(1 for decision in decided if decision.passed)
+        stats.llm_calls += llm_calls
+
+    # text is the paper's text in the filter's scope, the same the rules and the lexical score read.
+    async def _ask(self, text: str, criterion: str) -> bool:
+        return parse_filter_answer(await self.engine.complete(build_filter_prompt(text, criterion), self.settings.max_output_tokens))
@@ -0,0 +1,196 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+# Deterministic parts of a filter, evaluated before any LLM call (see app/extraction/filter_engine.py).
+#
+# A filter's text is a natural-language criterion, optionally with rule lines:
+#
+#     Randomized trials of deep learning models for chest X-ray diagnosis
+#     require: ("deep learning" OR /neural net\w*/) AND radiograph*
+#     exclude: survey OR "systematic review"
+#
+# A paper fails if a require expression does not match or an exclude expression matches. Expressions combine
+# words (whole words, case-insensitive, a trailing * matches any ending), "quoted phrases" and /regexes/ with
+# AND, OR, NOT and parentheses; adjacent terms are ANDed. Each leaf is compiled to one regex per filter and
+# matched once per text; the boolean structure is then evaluated on numpy arrays over all texts at once.
+
+_RULE_LINE = re.compile(r"^\s*(require|exclude)\s*:(.*)$", re.IGNORECASE)
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|/((?:\\.|[^/\\])+)/|([^\s()"]+))')
+_OPERATORS = ("AND", "OR", "NOT")
+
+
+class RuleSyntaxError(ValueError):
+    pass
+
+
+Expression = Callable[[Callable[[re.Pattern], np.ndarray]], np.ndarray]
+
+
+def _leaf(pattern: re.Pattern) -> Expression:
+    return lambda match: match(pattern)
+
+
+def _word_pattern(word: str) -> re.Pattern:
+    if word.endswith("*") and len(word) > 1:
+        return re.compile(rf"\b{re.escape(word[:-1])}\w*", re.IGNORECASE)
+    return re.compile(rf"\b{re.escape(word)}\b", re.IGNORECASE)
+
+
+class _Parser:
+    # Recursive descent over: or := and ("OR" and)*, and := not ("AND"? not)*, not := "NOT" not | atom,
+    # atom := "(" or ")" | phrase | regex | word.
+    def __init__(self, text: str):
+        self.tokens = []
+        position = 0
+        while position < len(text.rstrip()):
+            match = _TOKEN.match(text, position)
+            if match is None:
+                raise RuleSyntaxError(f"unexpected input at {text[position:]!r}")
+            self.tokens.append(match.groups())
+            position = match.end()
+        self.position = 0
+        self.patterns: list[re.Pattern] = []
+
+    def parse(self) -> Expression:
+        if not self.tokens:
+            raise RuleSyntaxError("empty expression")
+        expression = self._or()
+        if self.position < len(self.tokens):
+            raise RuleSyntaxError("unbalanced parentheses")
+        return expression
+
+    def _peek(self) -> Optional[tuple]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _is_operator(self, token: Optional[tuple], name: str) -> bool:
+        return token is not None and token[4] == name
+
+    def _or(self) -> Expression:
+        terms = [self._and()]
+        while self._is_operator(self._peek(), "OR"):
+            self.position += 1
+            terms.append(self._and())
+        return terms[0] if len(terms) == 1 else lambda match: np.logical_or.reduce([term(match) for term in terms])
+
+    def _and(self) -> Expression:
+        terms = [self._not()]
+        while True:
+            token = self._peek()
+            if token is None or token[1] or self._is_operator(token, "OR"):
+                break
+            if self._is_operator(token, "AND"):
+                self.position += 1
+            terms.append(self._not())
+        return terms[0] if len(terms) == 1 else lambda match: np.logical_and.reduce([term(match) for term in terms])
+
+    def _not(self) -> Expression:
+        if self._is_operator(self._peek(), "NOT"):
+            self.position += 1
+            term = self._not()
+            return lambda match: ~term(match)
+        return self._atom()
+
+    def _atom(self) -> Expression:
+        token = self._peek()
+        if token is None:
+            raise RuleSyntaxError("expression ends early")
+        self.position += 1
+        opening, closing, phrase, regex, word = token
+        if opening:
+            expression = self._or()
+            if self._peek() is None or not self._peek()[1]:
+                raise RuleSyntaxError("unbalanced parentheses")
+            self.position += 1
+            return expression
+        if closing or word in _OPERATORS:
+            raise RuleSyntaxError(f"unexpected {closing or word!r}")
+        if phrase is not None:
+            words = phrase.split()
+            if not words:
+                raise RuleSyntaxError("empty phrase")
+            pattern = re.compile(r"\b" + r"\s+".join(re.escape(w) for w in words) + r"\b", re.IGNORECASE)
+        elif regex is not None:
+            try:
+                pattern = re.compile(regex, re.IGNORECASE)
+            except re.error as e:
+                raise RuleSyntaxError(f"invalid regex /{regex}/: {e}")
+        else:
+            pattern = _word_pattern(word)
+        self.patterns.append(pattern)
+        return _leaf(pattern)
+
+
+@dataclass
+class CompiledFilter:
+    criterion: str
+    require: list[Expression]
+    exclude: list[Expression]
+
+    @property
+    def has_rules(self) -> bool:
+        return bool(self.require or self.exclude)
+
+    # Whether each text passes the rules. Every distinct pattern is matched once per text.
+    def rule_mask(self, texts: list[str]) -> np.ndarray:
+        matched: dict[re.Pattern, np.ndarray] = {}
+
+        def match(pattern: re.Pattern) -> np.ndarray:
+            if pattern not in matched:
+                matched[pattern] = np.fromiter((pattern.search(text) is not None for text in texts), dtype=bool, count=len(texts))
+            return matched[pattern]
+
+        mask = np.ones(len(texts), dtype=bool)
+        for expression in self.require:
+            mask &= expression(match)
+        for expression in self.exclude:
+            mask &= ~expression(match)
+        return mask
+
+
+# Splits a filter's text into rule lines and the remaining criterion. Raises RuleSyntaxError for invalid rules.
+def compile_filter(text: Optional[str]) -> CompiledFilter:
+    require, exclude, criterion = [], [], []
+    for line in (text or "").splitlines():
+        rule = _RULE_LINE.match(line)
+        if rule is None:
+            criterion.append(line.strip())
+            continue
+        expression = _Parser(rule.group(2)).parse()
+        (require if rule.group(1).lower() == "require" else exclude).append(expression)
+    return CompiledFilter(criterion=" ".join(part for part in criterion if part), require=require, exclude=exclude)
+
+
+# Words that say nothing about a paper's topic, left out of lexical scoring.
+_STOPWORDS = frozenset(
+    """a about an and any are as at be by for from has have in into is it its of on or that the their these this those to
+    using was were which with without paper papers study studies article articles research work works report reports
+    include includes including only should must""".split()
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def terms(text: str) -> list[str]:
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+# Share of the criterion's terms found in each text, weighted by inverse document frequency over the texts, in [0, 1].
+# 0 means the text shares no topical word with the criterion.
+def lexical_scores(criterion: str, texts: list[str]) -> np.ndarray:
+    query = sorted(set(terms(criterion)))
+    if not query or not texts:
+        return np.ones(len(texts))
+    documents = [set(terms(text)) for text in texts]
+    present = np.array([[term in document for term in query] for document in documents], dtype=bool)
+    document_frequency = present.sum(axis=0)
+    idf = np.log((len(texts) + 1) / (document_frequency + 1)) + 1.0
+    return present @ idf / idf.sum()
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import httpx
+
+
+@dataclass(frozen=True)
+class LLMRequest:
+    prompt: str
+    max_output_tokens: int = 1024
+
+
+@dataclass(frozen=True)
+class LLMResponse:
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class LLMClient(ABC):
+    # A model that turns a prompt into text. model is part of result cache keys, so it must name the exact model.
+    model: str
+
+    @abstractmethod
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """Returns the model's answer, raising on transport or provider errors."""
+
+    async def close(self) -> None:
+        pass
+
+
+class OpenAICompatibleClient(LLMClient):
+    # Chat completions API with JSON output, as served by OpenAI and most self-hosted inference servers.
+    def __init__(self, base_url: str, api_key: str, model: str, timeout: float = 120.0, http_client: Optional[httpx.AsyncClient] = None):
+        self.model = model
+        self.http_client = http_client or httpx.AsyncClient(
+            base_url=base_url.rstrip("/"), headers={"Authorization": f"Bearer {api_key}"}, timeout=timeout
+        )
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        response = await self.http_client.post(
+            "/chat/completions",
+            json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": request.prompt}],
+                "max_tokens": request.max_output_tokens,
+                "response_format": {"type": "json_object"},
+                "temperature": 0,
+            },
+        )
+        response.raise_for_status()
+        body = response.json()
+        usage = body.get("usage") or {}
+        return LLMResponse(
+            text=body["choices"][0]["message"]["content"] or "",
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+        )
+
+    async def close(self) -> None:
+        await self.http_client.aclose()
+
+
+# Field lines of an extraction prompt, "- name: description" (see app/extraction/prompts.py).
+_FIELD_LINE = re.compile(r"^- ([^:\n]+):", re.MULTILINE)
+_CRITERION_LINE = re.compile(r"^Criterion: ", re.MULTILINE)
+
+
+class FakeLLMClient(LLMClient):
+    # Deterministic offline model for tests and local runs. It answers every field listed in the prompt
+    # with a value derived from the prompt, and filter prompts with a pass or fail derived the same way,
+    # so the same prompt always gets the same answer.
+    # answer can replace the default behaviour; calls are recorded for assertions.
+    def __init__(self, model: str = "fake-llm", answer: Optional[Callable[[str], str]] = None):
+        self.model = model
+        self.answer = answer or self._answer
+        self.calls: list[LLMRequest] = []
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        self.calls.append(request)
+        text = self.answer(request.prompt)
+        return LLMResponse(text=text, input_tokens=len(request.prompt) // 4, output_tokens=len(text) // 4)
+
+    @staticmethod
+    def _answer(prompt: str) -> str:
+        digest = hashlib.blake2b(prompt.encode(), digest_size=4).hexdigest()
+        if _CRITERION_LINE.search(prompt):
+            return json.dumps({"passed": int(digest, 16) % 2 == 0})
+        return json.dumps({name.strip(): f"{name.strip()}-{digest}" for name in _FIELD_LINE.findall(prompt)})
+
+
+# EXTRACTION_LLM selects the client: "openai" for any OpenAI-compatible endpoint, or "fake" for local development.
+# It has no default, so a deployment without an LLM fails at startup instead of storing made-up answers.
+def llm_client_from_env() -> LLMClient:
+    client = os.getenv("EXTRACTION_LLM", "").lower()
+    if client == "openai":
+        return OpenAICompatibleClient(
+            base_url=os.getenv("EXTRACTION_LLM_BASE_URL", "https://api.openai.com/v1"),
+            api_key=os.environ["EXTRACTION_LLM_API_KEY"],
+            model=os.getenv("EXTRACTION_LLM_MODEL", "gpt-4o-mini"),
+        )
+    if client == "fake":
+        return FakeLLMClient()
+    raise ValueError(f"EXTRACTION_LLM must be 'openai' or 'fake', got {client!r}")
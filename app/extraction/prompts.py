@@ -0,0 +1,101 @@
+import hashlib
+import json
+import re
+from typing import Optional
+
+# Prompts for field extraction. Bump PROMPT_VERSION whenever the wording or the answer format changes,
+# so results produced by an older prompt can be told apart.
+PROMPT_VERSION = 1
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def paper_text(paper: dict) -> str:
+    parts = [f"Title: {paper.get('title') or ''}"]
+    if paper.get("abstract"):
+        parts.append(f"Abstract: {paper['abstract']}")
+    return "\n".join(parts)
+
+
+# Asks for a JSON object with one key per field. Field names must not contain ":" or newlines,
+# which the field list format relies on.
+def build_prompt(paper: dict, fields: list[dict]) -> str:
+    field_lines = "\n".join(_field_line(field) for field in fields)
+    return (
+        "Extract the following fields from the paper below. Answer with a single JSON object whose keys are the "
+        "field names. Use null for a field the paper does not report, and keep values short.\n\n"
+        f"Fields:\n{field_lines}\n\n"
+        f"Paper:\n{paper_text(paper)}\n"
+    )
+
+
+def _field_line(field: dict) -> str:
+    return f"- {field['field_name']}: {field.get('description') or field['field_name']}"
+
+
+# Splits fields into groups that are asked together, each keeping the paper's prompt within about max_tokens and
+# holding at most max_fields fields, so the answer fits the call's output budget.
+# A field too large to share a prompt gets a group of its own.
+def group_fields(paper: dict, fields: list[dict], max_tokens: int, max_fields: Optional[int] = None) -> list[list[dict]]:
+    base = estimate_tokens(build_prompt(paper, []))
+    groups, group, size = [], [], base
+    for field in fields:
+        cost = estimate_tokens(_field_line(field))
+        if group and (size + cost > max_tokens or len(group) == max_fields):
+            groups.append(group)
+            group, size = [], base
+        group.append(field)
+        size += cost
+    if group:
+        groups.append(group)
+    return groups
+
+
+# Identifies what a field asks for. Values extracted under another hash are stale and re-extracted by incremental runs.
+def field_definition_hash(field: dict) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(field["field_name"].encode())
+    digest.update(b"\0")
+    digest.update((field.get("description") or "").encode())
+    return digest.hexdigest()
+
+
+# Asks whether a paper meets a filter's criterion, as {"passed": true | false}. text is the part of the paper
+# the filter reads (see PreparedFilter.text).
+def build_filter_prompt(text: str, criterion: str) -> str:
+    return (
+        "Decide whether the paper below meets the criterion. Answer with a single JSON object, "
+        '{"passed": true} if it does and {"passed": false} if it does not.\n\n'
+        f"Criterion: {criterion}\n\n"
+        f"Paper:\n{text}\n"
+    )
+
+
+# Raises ValueError unless the answer is a JSON object with a boolean "passed".
+def parse_filter_answer(text: str) -> bool:
+    answer = json.loads(_FENCE.sub("", text.strip()))
+    if not isinstance(answer, dict) or not isinstance(answer.get("passed"), bool):
+        raise ValueError('expected a JSON object with a boolean "passed"')
+    return answer["passed"]
+
+
+# Rough token count for rate limiting, about four characters per token.
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+# Parses the model's JSON answer into {field_name: value}. Fields missing from the answer are absent from the result;
+# null answers map to None, and non-string values are kept as their JSON text.
+# Raises ValueError if the answer is not a JSON object.
+def parse_answer(text: str, fields: list[dict]) -> dict[str, Optional[str]]:
+    answer = json.loads(_FENCE.sub("", text.strip()))
+    if not isinstance(answer, dict):
+        raise ValueError("expected a JSON object")
+    values = {}
+    for field in fields:
+        name = field["field_name"]
+        if name not in answer:
+            continue
+        value = answer[name]
+        values[name] = value if value is None or isinstance(value, str) else json.dumps(value)
+    return values
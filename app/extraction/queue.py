@@ -0,0 +1,151 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+# Durable queue of extraction work items in a local SQLite database.
+# Workers lease items for a limited time; an item whose lease runs out (e.g. the process died) is handed out again,
+# so every item is processed at least once. Writes of results are idempotent, which makes that safe.
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+create table if not exists extraction_runs (
+    run_id text primary key,
+    project_id text not null,
+    user_id text,
+    created_at real not null,
+    force integer not null default 0
+);
+create table if not exists work_items (
+    id integer primary key autoincrement,
+    run_id text not null references extraction_runs (run_id),
+    paper_id text not null,
+    field_ids text not null,
+    status text not null default 'queued',
+    attempts integer not null default 0,
+    leased_until real,
+    error text
+);
+create index if not exists work_items_run_status_idx on work_items (run_id, status, leased_until);
+"""
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    id: int
+    run_id: str
+    paper_id: str
+    field_ids: tuple[str, ...]
+    attempts: int
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    run_id: str
+    project_id: str
+    user_id: Optional[str]
+    created_at: float
+    force: bool = False
+
+
+class WorkQueue:
+    # Blocking; the engine calls it through asyncio.to_thread. One connection is shared under a lock.
+    def __init__(self, path: str = ":memory:", clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.executescript(_SCHEMA)
+        # Queues created before runs recorded force.
+        if "force" not in {row[1] for row in self._db.execute("pragma table_info(extraction_runs)")}:
+            self._db.execute("alter table extraction_runs add column force integer not null default 0")
+
+    # force is kept with the run, so a resumed forced run still does not answer from the result cache.
+    def create_run(
+        self, run_id: str, project_id: str, user_id: Optional[str], items: Iterable[tuple[str, list[str]]], force: bool = False
+    ) -> int:
+        with self._lock, self._transaction():
+            self._db.execute(
+                "insert into extraction_runs (run_id, project_id, user_id, created_at, force) values (?, ?, ?, ?, ?)",
+                (run_id, project_id, user_id, self.clock(), force),
+            )
+            cursor = self._db.executemany(
+                "insert into work_items (run_id, paper_id, field_ids) values (?, ?, ?)",
+                ((run_id, paper_id, json.dumps(field_ids)) for paper_id, field_ids in items),
+            )
+            return cursor.rowcount
+
+    def get_run(self, run_id: str) -> Optional[RunRecord]:
+        with self._lock:
+            row = self._db.execute(
+                "select run_id, project_id, user_id, created_at, force from extraction_runs where run_id = ?", (run_id,)
+            ).fetchone()
+        return RunRecord(*row[:4], force=bool(row[4])) if row else None
+
+    # Hands out up to limit items that are queued or whose lease has expired, leased for lease_seconds.
+    def lease(self, run_id: str, limit: int, lease_seconds: float) -> list[WorkItem]:
+        now = self.clock()
+        with self._lock:
+            rows = self._db.execute(
+                """
+                update work_items set status = ?, leased_until = ?, attempts = attempts + 1
+                where id in (
+                    select id from work_items
+                    where run_id = ? and (status = ? or (status = ? and leased_until < ?))
+                    order by id limit ?
+                )
+                returning id, run_id, paper_id, field_ids, attempts
+                """,
+                (LEASED, now + lease_seconds, run_id, QUEUED, LEASED, now, limit),
+            ).fetchall()
+        return sorted(
+            (WorkItem(id, run, paper, tuple(json.loads(fields)), attempts) for id, run, paper, fields, attempts in rows), key=lambda i: i.id
+        )
+
+    def complete(self, item_ids: list[int]) -> None:
+        self._update(item_ids, "status = ?, leased_until = null, error = null", (DONE,))
+
+    # Puts items back in the queue, or marks them failed once they have been attempted max_attempts times.
+    def fail(self, item_ids: list[int], error: str, max_attempts: int) -> None:
+        self._update(
+            item_ids, "status = case when attempts >= ? then ? else ? end, leased_until = null, error = ?", (max_attempts, FAILED, QUEUED, error)
+        )
+
+    def counts(self, run_id: str) -> dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("select status, count(*) from work_items where run_id = ? group by status", (run_id,)).fetchall()
+        return {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def errors(self, run_id: str, limit: int) -> list[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "select distinct error from work_items where run_id = ? and status = ? and error is not null limit ?", (run_id, FAILED, limit)
+            ).fetchall()
+        return [error for (error,) in rows]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _update(self, item_ids: list[int], assignments: str, params: tuple) -> None:
+        if not item_ids:
+            return
+        marks = ",".join("?" * len(item_ids))
+        with self._lock:
+            self._db.execute(f"update work_items set {assignments} where id in ({marks})", (*params, *item_ids))
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("begin")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("rollback")
+            raise
+        self._db.execute("commit")
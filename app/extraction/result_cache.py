@@ -0,0 +1,110 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from app.extraction.prompts import PROMPT_VERSION, paper_text
+from app.services.project_cache import CacheStats
+
+# Persistent cache of LLM answers for single (paper, field) cells. The key hashes everything an answer depends on:
+# the paper text, the field's name and description, the prompt version and the model. A cell therefore hits the
+# cache again after a crash, in a re-run, or in another project that holds the same paper and field definition,
+# while editing the field or switching models misses it.
+
+# SQLite caps the number of bound parameters per statement.
+_MAX_PARAMS = 500
+
+_SCHEMA = """
+create table if not exists results (
+    key blob primary key,
+    value text,
+    size integer not null,
+    used_at real not null
+);
+create index if not exists results_used_at_idx on results (used_at);
+"""
+
+
+def cache_key(paper: dict, field: dict, model: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (str(PROMPT_VERSION), model, field["field_name"], field.get("description") or "", paper_text(paper)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.digest()
+
+
+class ResultCache:
+    # Blocking; the engine calls it through asyncio.to_thread. Entries are evicted least recently used first once
+    # the stored keys and values exceed max_bytes. A None value is a cached "not reported" answer.
+    def __init__(self, path: str = ":memory:", max_bytes: int = 256 * 1024 * 1024, clock: Callable[[], float] = time.time):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.stats = CacheStats()
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.executescript(_SCHEMA)
+        self._size = self._db.execute("select coalesce(sum(size), 0) from results").fetchone()[0]
+
+    # Returns a cache in EXTRACTION_CACHE_PATH, or None when EXTRACTION_CACHE_MAX_MB is 0.
+    @classmethod
+    def from_env(cls) -> Optional["ResultCache"]:
+        max_mb = float(os.getenv("EXTRACTION_CACHE_MAX_MB", 256))
+        if max_mb <= 0:
+            return None
+        return cls(os.getenv("EXTRACTION_CACHE_PATH", "extraction_cache.db"), max_bytes=int(max_mb * 1024 * 1024))
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    # Cached values for the keys that are present; keys missing from the result are misses.
+    def get_many(self, keys: list[bytes]) -> dict[bytes, Optional[str]]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _MAX_PARAMS):
+                chunk = keys[start : start + _MAX_PARAMS]
+                marks = ",".join("?" * len(chunk))
+                found.update(self._db.execute(f"select key, value from results where key in ({marks})", chunk).fetchall())
+                hits = [key for key in chunk if key in found]
+                if hits:
+                    self._db.execute(f"update results set used_at = ? where key in ({','.join('?' * len(hits))})", (self.clock(), *hits))
+        self.stats.hits += len(found)
+        self.stats.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, values: dict[bytes, Optional[str]]) -> None:
+        if not values:
+            return
+        now = self.clock()
+        rows = [(key, value, len(key) + len((value or "").encode()), now) for key, value in values.items()]
+        with self._lock:
+            keys = list(values)
+            for start in range(0, len(keys), _MAX_PARAMS):
+                chunk = keys[start : start + _MAX_PARAMS]
+                marks = ",".join("?" * len(chunk))
+                self._size -= self._db.execute(f"select coalesce(sum(size), 0) from results where key in ({marks})", chunk).fetchone()[0]
+            self._db.executemany("insert or replace into results (key, value, size, used_at) values (?, ?, ?, ?)", rows)
+            self._size += sum(size for _, _, size, _ in rows)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def close(self) -> None:
+        self._db.close()
+
+    # Frees down to 90% of max_bytes, so eviction does not run again on every write once the cache is full.
+    def _evict(self) -> None:
+        target = self.max_bytes * 0.9
+        evicted = []
+        for key, size in self._db.execute("select key, size from results order by used_at"):
+            if self._size <= target:
+                break
+            evicted.append(key)
+            self._size -= size
+        for start in range(0, len(evicted), _MAX_PARAMS):
+            chunk = evicted[start : start + _MAX_PARAMS]
+            self._db.execute(f"delete from results where key in ({','.join('?' * len(chunk))})", chunk)
+        self.evictions += len(evicted)
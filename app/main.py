@@ -6,10 +6,49 @@ from dotenv import load_dotenv  # noqa: E402
 
 load_dotenv()
 
-from app.api import projects  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+
+from app.api import extraction_runs, extractions, filters, metrics, papers, projects  # noqa: E402
+from app.auth.jwt_verifier import JWTVerifier  # noqa: E402
+from app.db.supabase_client import AsyncSupabaseClientPool, PoolSettings  # noqa: E402
+from app.extraction.engine import ExtractionEngine  # noqa: E402
+from app.extraction.filter_engine import FilterEngine, FilterSettings  # noqa: E402
+from app.services.field_stats import FieldStatsCache  # noqa: E402
+from app.services.near_duplicates import NearDuplicateIndexRegistry  # noqa: E402
+from app.services.paper_dedup import DedupIndexRegistry  # noqa: E402
+from app.services.project_cache import ProjectCache  # noqa: E402
+from app.services.single_flight import SingleFlight  # noqa: E402
+from app.sources.registry import SourceRegistry  # noqa: E402
 from fastapi import FastAPI  # noqa: E402
 
-app = FastAPI(title="Project Service API")
+
+# Shared resources live for the lifetime of the process and are closed on shutdown.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.supabase_pool = AsyncSupabaseClientPool(PoolSettings.from_env())
+    app.state.token_verifier = JWTVerifier.from_env()
+    app.state.project_reads = SingleFlight()
+    app.state.project_cache = ProjectCache.from_env()
+    app.state.paper_dedup = DedupIndexRegistry.from_env()
+    app.state.near_duplicates = NearDuplicateIndexRegistry.from_env()
+    app.state.sources = SourceRegistry.from_env()
+    app.state.field_stats = FieldStatsCache.from_env()
+    app.state.extraction_engine = ExtractionEngine.from_env(stats_cache=app.state.field_stats)
+    app.state.filter_engine = FilterEngine(app.state.extraction_engine, FilterSettings.from_env())
+    try:
+        yield
+    finally:
+        await app.state.extraction_engine.close()
+        await app.state.sources.close()
+        await app.state.supabase_pool.close()
+
+
+app = FastAPI(title="Project Service API", lifespan=lifespan)
 
 # Register routers
 app.include_router(projects.router)
+app.include_router(papers.router)
+app.include_router(extractions.router)
+app.include_router(extraction_runs.router)
+app.include_router(filters.router)
+app.include_router(metrics.router)
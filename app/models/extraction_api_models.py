@@ -0,0 +1,145 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.models.shared import ResponseStatus
+from pydantic import BaseModel, Field
+
+
+# List Extractions endpoint
+# Returns one page of values extracted from a project's papers, oldest first.
+# next_cursor is passed back as cursor to get the following page, and is None on the last page.
+class ListExtractionsRequest(BaseModel):
+    project_id: UUID
+    page_size: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+
+class ExtractedFieldListItem(BaseModel):
+    id: UUID
+    paper_id: UUID
+    extraction_field_id: UUID
+    field_value: Optional[str] = None
+    numeric_value: Optional[float] = None
+    numeric_unit: Optional[str] = None
+    ci_lower: Optional[float] = None
+    ci_upper: Optional[float] = None
+    sample_size: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class ListExtractionsResponse(BaseModel):
+    project_id: UUID
+    items: list[ExtractedFieldListItem] = []
+    next_cursor: Optional[str] = None
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
+# Export Extractions endpoint
+# Streams a papers x extraction_fields table: one row per paper, one column per field, empty where nothing was extracted.
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class ExportExtractionsRequest(BaseModel):
+    project_id: UUID
+    export_format: ExportFormat = ExportFormat.CSV
+    gzip: bool = False
+
+
+# Extraction Summary endpoint
+# Project-wide counts: how complete each extraction field is and how often each filter passes.
+class ExtractionSummaryRequest(BaseModel):
+    project_id: UUID
+
+
+class FieldSummary(BaseModel):
+    field_id: UUID
+    field_name: str
+    values: int = 0
+    papers_with_value: int = 0
+    completeness: float = 0.0
+
+
+class FilterSummary(BaseModel):
+    filter_id: UUID
+    evaluated: int = 0
+    passed: int = 0
+    pass_rate: Optional[float] = None
+
+
+class ExtractionSummaryResponse(BaseModel):
+    project_id: UUID
+    paper_count: int = 0
+    value_count: int = 0
+    fields: list[FieldSummary] = []
+    filters: list[FilterSummary] = []
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
+# Normalize Field endpoint
+# Parses every value of one extraction field into numeric_value, numeric_unit, ci_lower, ci_upper and sample_size.
+# parsed counts values in which a number was found; failed counts values whose write back failed.
+class NormalizeFieldRequest(BaseModel):
+    project_id: UUID
+    field_id: UUID
+
+
+class NormalizeFieldResponse(BaseModel):
+    project_id: UUID
+    field_id: UUID
+    values: int = 0
+    parsed: int = 0
+    failed: int = 0
+    write_errors: list[str] = []
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
+# Field Stats endpoint
+# Distribution of a field's normalized numbers (see Normalize Field) over the project's papers, one number per paper.
+# Values in another unit than the field's most common one are left out and counted in other_unit.
+# by_filter splits the numbers by each filter's outcome on the paper.
+class FieldStatsRequest(BaseModel):
+    project_id: UUID
+    field_id: UUID
+    bins: int = Field(20, ge=1, le=200)
+
+
+class NumericSummary(BaseModel):
+    count: int
+    mean: float
+    std: float
+    min: float
+    max: float
+    median: float
+    quantiles: dict[str, float]
+
+
+class HistogramBin(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+
+class FilterBreakdown(BaseModel):
+    filter_id: UUID
+    passed: Optional[NumericSummary] = None
+    failed: Optional[NumericSummary] = None
+    not_evaluated: Optional[NumericSummary] = None
+
+
+class FieldStatsResponse(BaseModel):
+    project_id: UUID
+    field_id: UUID
+    unit: Optional[str] = None
+    paper_count: int = 0
+    missing_rate: float = 1.0
+    other_unit: int = 0
+    summary: Optional[NumericSummary] = None
+    histogram: list[HistogramBin] = []
+    by_filter: list[FilterBreakdown] = []
+    status: ResponseStatus = ResponseStatus.SUCCESS
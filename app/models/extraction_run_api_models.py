@@ -0,0 +1,52 @@
+from typing import Optional
+from uuid import UUID
+
+from app.models.shared import ResponseStatus
+from pydantic import BaseModel
+
+
+# Create Extraction Run endpoint
+# Queues one work item per paper, covering the selected fields the paper has no current value for, and starts
+# processing them in the background. A value is current if it was extracted under the field's present description.
+# field_ids and paper_ids narrow the run down; force re-extracts current values too, but not values entered by hand.
+# Papers that failed a filter are left out (and counted as excluded) unless include_filtered_out is set.
+class ExtractionRunOptions(BaseModel):
+    field_ids: Optional[list[UUID]] = None
+    paper_ids: Optional[list[UUID]] = None
+    force: bool = False
+    include_filtered_out: bool = False
+
+
+class CreateExtractionRunRequest(BaseModel):
+    project_id: UUID
+    options: ExtractionRunOptions = ExtractionRunOptions()
+
+
+class CreateExtractionRunResponse(BaseModel):
+    run_id: UUID
+    project_id: UUID
+    items: int = 0
+    fields: int = 0
+    cells: int = 0
+    excluded: int = 0
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
+# Extraction Run Status endpoint
+# Counts of work items by state. active is True while this server is processing the run;
+# a run that is not active with items left (e.g. after a restart) can be resumed.
+class GetExtractionRunRequest(BaseModel):
+    project_id: UUID
+    run_id: UUID
+
+
+class ExtractionRunStatusResponse(BaseModel):
+    run_id: UUID
+    project_id: UUID
+    queued: int = 0
+    running: int = 0
+    done: int = 0
+    failed: int = 0
+    active: bool = False
+    errors: list[str] = []
+    status: ResponseStatus = ResponseStatus.SUCCESS
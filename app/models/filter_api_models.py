@@ -0,0 +1,45 @@
+from typing import Optional
+from uuid import UUID
+
+from app.models.shared import ResponseStatus
+from pydantic import BaseModel, Field
+
+DEFAULT_EVALUATION_PAGE_SIZE = 100
+MAX_EVALUATION_PAGE_SIZE = 500
+
+
+# Evaluate Filters endpoint
+# Runs the filter cascade (rules, lexical score, LLM) over one page of the project's papers, in (created_at, id)
+# order, and stores the outcomes in paper_filter_results. A request's LLM calls are bounded by page_size; the
+# response's next_cursor continues with the next page. filter_ids narrows it to some of the project's filters.
+class EvaluateFiltersOptions(BaseModel):
+    filter_ids: Optional[list[UUID]] = None
+    page_size: int = Field(DEFAULT_EVALUATION_PAGE_SIZE, ge=1, le=MAX_EVALUATION_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+
+class EvaluateFiltersRequest(BaseModel):
+    project_id: UUID
+    options: EvaluateFiltersOptions = EvaluateFiltersOptions()
+
+
+# Outcomes of one filter, and how many papers each stage decided. skipped counts papers another filter had already
+# failed; undecided counts papers whose LLM call failed.
+class FilterEvaluationSummary(BaseModel):
+    filter_id: UUID
+    evaluated: int = 0
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    by_rule: int = 0
+    by_lexical: int = 0
+    by_llm: int = 0
+    undecided: int = 0
+
+
+class EvaluateFiltersResponse(BaseModel):
+    project_id: UUID
+    filters: list[FilterEvaluationSummary] = []
+    write_errors: list[str] = []
+    next_cursor: Optional[str] = None
+    status: ResponseStatus = ResponseStatus.SUCCESS
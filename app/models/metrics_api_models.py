@@ -0,0 +1,26 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+# Read coalescing counters for a single-flight group.
+# coalescing_ratio is the share of calls answered by another caller's in-flight query.
+class ReadCoalescingMetrics(BaseModel):
+    calls: int
+    executions: int
+    coalesced: int
+    coalescing_ratio: float
+
+
+# Hit/miss counters for a read-through cache. Only reported when the cache is enabled.
+class CacheMetrics(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class MetricsResponse(BaseModel):
+    project_reads: ReadCoalescingMetrics
+    project_cache: Optional[CacheMetrics] = None
+    extraction_cache: Optional[CacheMetrics] = None
+    source_cache: Optional[CacheMetrics] = None
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.models.shared import ResponseStatus
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# List Papers endpoint
+# Returns one page of a project's papers, oldest first.
+# next_cursor is passed back as cursor to get the following page, and is None on the last page.
+class ListPapersRequest(BaseModel):
+    project_id: UUID
+    page_size: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+
+class PaperListItem(BaseModel):
+    paper_id: UUID
+    title: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ListPapersResponse(BaseModel):
+    project_id: UUID
+    items: list[PaperListItem] = []
+    next_cursor: Optional[str] = None
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
+# Bulk Paper Ingestion endpoint
+# Accepts an NDJSON or CSV body with one paper per line/record. Rows are validated one at a time;
+# invalid rows are counted as rejected and the first few are reported with their line number.
+# Papers already stored in the project (same external id or title) are counted as duplicates.
+# Rows in batches the database rejected are counted as failed, with the database errors in write_errors.
+class PaperIngestRow(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    title: str = Field(..., min_length=1)
+    abstract: Optional[str] = None
+    doi: Optional[str] = None
+    pmid: Optional[str] = None
+    arxiv_id: Optional[str] = None
+
+
+class IngestRowError(BaseModel):
+    line: int
+    message: str
+
+
+class IngestPapersResponse(BaseModel):
+    project_id: UUID
+    inserted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    failed: int = 0
+    errors: list[IngestRowError] = []
+    write_errors: list[str] = []
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
+# Fetch Sources endpoint
+# Runs the project's source queries against their backends (arXiv, PubMed) and ingests the results as papers:bulk
+# does, deduplicated against the project and across sources. source_ids narrows it to some of the project's sources.
+# force fetches every record from the backends again instead of reusing and refreshing cached results.
+class FetchSourcesOptions(BaseModel):
+    source_ids: Optional[list[UUID]] = None
+    force: bool = False
+
+
+class FetchSourcesRequest(BaseModel):
+    project_id: UUID
+    options: FetchSourcesOptions = FetchSourcesOptions()
+
+
+# total is the backend's result count, fetched the records received (capped by SOURCE_MAX_RESULTS),
+# cached how many of those came from the source cache rather than the backend.
+class SourceFetchSummary(BaseModel):
+    source_id: UUID
+    backend_name: str
+    backend_query: str
+    total: Optional[int] = None
+    fetched: int = 0
+    cached: int = 0
+    pages: int = 0
+    errors: list[str] = []
+
+
+class FetchSourcesResponse(BaseModel):
+    project_id: UUID
+    sources: list[SourceFetchSummary] = []
+    ingest: IngestPapersResponse
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
+# Near-Duplicate Papers endpoint
+# Returns clusters of papers with similar title + abstract text, largest first.
+# similarity is the estimated Jaccard similarity of each paper to the first paper of its cluster.
+class NearDuplicatesRequest(BaseModel):
+    project_id: UUID
+    threshold: float = Field(0.8, gt=0, le=1)
+    max_clusters: int = Field(100, ge=1, le=1000)
+
+
+class NearDuplicatePaper(BaseModel):
+    paper_id: UUID
+    title: Optional[str] = None
+    similarity: float
+
+
+class NearDuplicateCluster(BaseModel):
+    papers: list[NearDuplicatePaper]
+
+
+class NearDuplicatesResponse(BaseModel):
+    project_id: UUID
+    threshold: float
+    cluster_count: int = 0
+    clusters: list[NearDuplicateCluster] = []
+    status: ResponseStatus = ResponseStatus.SUCCESS
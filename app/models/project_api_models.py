@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.models.shared import ResponseStatus
 from pydantic import BaseModel, Field
 
@@ -33,6 +34,26 @@ class GetProjectResponse(BaseModel):
     status: ResponseStatus = ResponseStatus.SUCCESS
 
 
+# List Projects endpoint
+# Returns one page of the user's projects, oldest first.
+# next_cursor is passed back as cursor to get the following page, and is None on the last page.
+class ListProjectsRequest(BaseModel):
+    page_size: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+
+class ProjectListItem(BaseModel):
+    project_id: UUID
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ListProjectsResponse(BaseModel):
+    items: list[ProjectListItem] = []
+    next_cursor: Optional[str] = None
+    status: ResponseStatus = ResponseStatus.SUCCESS
+
+
 # Delete Project endpoint
 # Returns a response status, SUCCESS if deleted,
 # NOT_FOUND if project does not exist or no permission to delete.
@@ -107,3 +128,34 @@ class DeleteExtractionFieldsRequest(BaseModel):
 
 class DeleteExtractionFieldsResponse(BaseModel):
     status: ResponseStatus
+
+
+# Get Project Tree endpoint
+# Returns a project with its sources, extraction config and fields, fetched in one query.
+# If not found, or no permission returns status NOT_FOUND.
+class ProjectSourceItem(BaseModel):
+    id: UUID
+    backend_name: str
+    backend_query: str
+
+
+class ExtractionFieldItem(BaseModel):
+    id: UUID
+    field_name: str
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ExtractionConfigItem(BaseModel):
+    id: UUID
+    created_at: Optional[datetime] = None
+    fields: list[ExtractionFieldItem] = []
+
+
+class GetProjectTreeResponse(BaseModel):
+    project_id: Optional[UUID] = None
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+    sources: list[ProjectSourceItem] = []
+    extraction_config: Optional[ExtractionConfigItem] = None
+    status: ResponseStatus = ResponseStatus.SUCCESS
@@ -0,0 +1,52 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+class CacheBackend(ABC):
+    # Storage for cached values. Keys are strings and values are JSON-serializable,
+    # so a shared backend (e.g. Redis or memcached) can serve several uvicorn workers.
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Stores a value that expires after ttl seconds."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Removes the given keys, ignoring missing ones."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    # Per-process LRU with a per-entry TTL. Least recently used entries are evicted past max_entries.
+    def __init__(self, max_entries: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -38,3 +38,11 @@ class InternalServiceError(ProjectServiceError):
 
     def message(self) -> str:
         return f"Internal error: {self.detail}"
+
+
+@dataclass
+class InvalidRequestError(ProjectServiceError):
+    detail: str
+
+    def message(self) -> str:
+        return f"Invalid request: {self.detail}"
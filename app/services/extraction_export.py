@@ -0,0 +1,151 @@
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+from uuid import UUID
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional.
+    pa = pq = None
+
+from app.models.extraction_api_models import ExportFormat
+
+# Streaming export of extraction results as a wide papers x extraction_fields table.
+# Papers are read one page at a time with their values embedded, pivoted, encoded and sent before the next page
+# is fetched, so memory stays bounded by the page size whatever the size of the project.
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+PageSource = Callable[[], AsyncIterator[list[dict]]]
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+# Column names for the wide table. Repeated field names get a numeric suffix so every column stays addressable.
+def export_columns(fields: list[dict]) -> list[str]:
+    columns, seen = ["paper_id", "title"], {"paper_id", "title"}
+    for field in fields:
+        name, suffix = field["field_name"], 2
+        while name in seen:
+            name, suffix = f"{field['field_name']}_{suffix}", suffix + 1
+        seen.add(name)
+        columns.append(name)
+    return columns
+
+
+@dataclass
+class ExtractionExport:
+    project_id: UUID
+    fields: list[dict]
+    export_format: ExportFormat
+    gzip: bool
+    pages: PageSource
+
+    @property
+    def columns(self) -> list[str]:
+        return export_columns(self.fields)
+
+    @property
+    def media_type(self) -> str:
+        return "application/gzip" if self.gzip else MEDIA_TYPES[self.export_format]
+
+    @property
+    def filename(self) -> str:
+        return f"extractions-{self.project_id}.{self.export_format.value}" + (".gz" if self.gzip else "")
+
+    # Pivots one page of papers into rows of [paper_id, title, value per field]. Missing values are None.
+    def pivot(self, papers: list[dict]) -> list[list[Optional[str]]]:
+        positions = {field["id"]: i for i, field in enumerate(self.fields, start=2)}
+        rows = []
+        for paper in papers:
+            row = [paper["id"], paper.get("title")] + [None] * len(self.fields)
+            for value in paper.get("extracted_fields") or []:
+                position = positions.get(value["extraction_field_id"])
+                if position is not None:
+                    row[position] = value["field_value"]
+            rows.append(row)
+        return rows
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        encoders = {ExportFormat.CSV: self._csv, ExportFormat.NDJSON: self._ndjson, ExportFormat.PARQUET: self._parquet}
+        chunks = encoders[self.export_format]()
+        if not self.gzip:
+            async for chunk in chunks:
+                yield chunk
+            return
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        async for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    async def _csv(self) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.columns)
+        async for papers in self.pages():
+            writer.writerows(self.pivot(papers))
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    async def _ndjson(self) -> AsyncIterator[bytes]:
+        columns = self.columns
+        async for papers in self.pages():
+            lines = (json.dumps(dict(zip(columns, row))) for row in self.pivot(papers))
+            yield "".join(f"{line}\n" for line in lines).encode()
+
+    # Each page becomes one Parquet row group; the writer's output is drained after every group.
+    async def _parquet(self) -> AsyncIterator[bytes]:
+        columns = self.columns
+        schema = pa.schema([(name, pa.string()) for name in columns])
+        sink = _DrainableSink()
+        writer = pq.ParquetWriter(sink, schema)
+        try:
+            async for papers in self.pages():
+                rows = self.pivot(papers)
+                if rows:
+                    writer.write_table(pa.Table.from_arrays([pa.array(list(values), pa.string()) for values in zip(*rows)], schema=schema))
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        finally:
+            writer.close()
+        yield sink.drain()
+
+
+class _DrainableSink(io.RawIOBase):
+    # Write-only file object that hands out what has been written so far.
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
@@ -0,0 +1,252 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.exceptions import DatabaseError
+from app.db.extraction_results_dal import FIELD_NUMBER_COLUMNS, ExtractionResultsDAL
+from app.db.pagination import decode_cursor, encode_cursor
+from app.db.projections import ID_ONLY
+from app.models.extraction_api_models import (
+    ExportExtractionsRequest,
+    ExportFormat,
+    ExtractedFieldListItem,
+    ExtractionSummaryRequest,
+    ExtractionSummaryResponse,
+    FieldStatsRequest,
+    FieldStatsResponse,
+    FieldSummary,
+    FilterSummary,
+    ListExtractionsRequest,
+    ListExtractionsResponse,
+    NormalizeFieldRequest,
+    NormalizeFieldResponse,
+)
+from app.models.shared import ResponseStatus
+from app.services.errors import InternalServiceError, InvalidRequestError, NotFoundError, ProjectServiceError
+from app.services.extraction_export import ExtractionExport, parquet_available
+from app.services.field_stats import FieldStatsCache, compute_field_stats
+from app.services.metric_normalization import normalize_values
+from app.services.result_matrix import ResultMatrix, ResultMatrixBuilder
+from returns.result import Failure, Result, Success
+
+
+class ExtractionResultsService:
+    # project_dal is used to tell a missing project apart from one without results.
+    # stats_cache is keyed by user_id, and is invalidated here when a field's values are rewritten.
+    def __init__(
+        self,
+        dal: ExtractionResultsDAL,
+        project_dal: Optional[AsyncProjectDAL] = None,
+        user_id: Optional[str] = None,
+        stats_cache: Optional[FieldStatsCache] = None,
+    ):
+        self.dal = dal
+        self.project_dal = project_dal
+        self.user_id = user_id
+        self.stats_cache = stats_cache
+
+    async def _project_visible(self, project_id) -> bool:
+        return self.project_dal is None or await self.project_dal.get_project_by_id(project_id, columns=ID_ONLY) is not None
+
+    # Returns the error to report if the project or the field is missing, or None.
+    async def _find_field(self, project_id, field_id) -> Optional[NotFoundError]:
+        if not await self._project_visible(project_id):
+            return NotFoundError("Project", str(project_id))
+        fields = await self.dal.get_extraction_fields(project_id=project_id)
+        if not any(field["id"] == str(field_id) for field in fields):
+            return NotFoundError("Extraction field", str(field_id))
+        return None
+
+    async def list_extractions(self, request: ListExtractionsRequest) -> Result[ListExtractionsResponse, ProjectServiceError]:
+        try:
+            after = decode_cursor(request.cursor) if request.cursor else None
+        except ValueError as e:
+            return Failure(InvalidRequestError(str(e)))
+
+        try:
+            rows, next_keyset = await self.dal.list_extracted_fields(project_id=request.project_id, page_size=request.page_size, after=after)
+            return Success(
+                ListExtractionsResponse(
+                    project_id=request.project_id,
+                    items=[
+                        ExtractedFieldListItem(
+                            id=row["id"],
+                            paper_id=row["paper_id"],
+                            extraction_field_id=row["extraction_field_id"],
+                            field_value=row["field_value"],
+                            numeric_value=row["numeric_value"],
+                            numeric_unit=row["numeric_unit"],
+                            ci_lower=row["ci_lower"],
+                            ci_upper=row["ci_upper"],
+                            sample_size=row["sample_size"],
+                            created_at=row["created_at"],
+                        )
+                        for row in rows
+                    ],
+                    next_cursor=encode_cursor(next_keyset) if next_keyset else None,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during listing: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during listing: {e}"))
+
+    # Checks the project and loads its fields up front, so errors surface before the response starts streaming.
+    # The returned export reads papers page by page while it is being sent.
+    async def prepare_export(self, request: ExportExtractionsRequest) -> Result[ExtractionExport, ProjectServiceError]:
+        if request.export_format == ExportFormat.PARQUET and not parquet_available():
+            return Failure(InvalidRequestError("Parquet export requires pyarrow"))
+
+        try:
+            if not await self._project_visible(request.project_id):
+                return Failure(NotFoundError("Project", str(request.project_id)))
+
+            fields = await self.dal.get_extraction_fields(project_id=request.project_id)
+            return Success(
+                ExtractionExport(
+                    project_id=request.project_id,
+                    fields=fields,
+                    export_format=request.export_format,
+                    gzip=request.gzip,
+                    pages=lambda: self.dal.iter_paper_values(project_id=request.project_id),
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during export: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during export: {e}"))
+
+    # Loads the project's results into a ResultMatrix, one page of papers at a time.
+    async def load_result_matrix(self, project_id) -> ResultMatrix:
+        builder = ResultMatrixBuilder()
+        async for rows in self.dal.iter_paper_results(project_id=project_id):
+            builder.add_papers(rows)
+        return builder.build()
+
+    # The result matrix of a project restricted to one field: every paper with its filter results, and only that
+    # field's normalized numbers, so stats of one field do not download the values of all the others.
+    async def load_field_matrix(self, project_id, field_id) -> ResultMatrix:
+        builder = ResultMatrixBuilder()
+        async for rows in self.dal.iter_paper_filter_results(project_id=project_id):
+            builder.add_papers(rows)
+        async for rows in self.dal.iter_field_values(field_id, columns=FIELD_NUMBER_COLUMNS):
+            builder.add_values(rows)
+        return builder.build()
+
+    # Fields are listed in configuration order, including fields without any value yet.
+    async def summarize(self, request: ExtractionSummaryRequest) -> Result[ExtractionSummaryResponse, ProjectServiceError]:
+        try:
+            if not await self._project_visible(request.project_id):
+                return Failure(NotFoundError("Project", str(request.project_id)))
+
+            fields = await self.dal.get_extraction_fields(project_id=request.project_id)
+            matrix = await self.load_result_matrix(request.project_id)
+
+            value_counts, papers_with_value, completeness = matrix.value_counts(), matrix.papers_with_value(), matrix.completeness()
+            field_summaries = []
+            for field in fields:
+                code = matrix.field_code(field["id"])
+                summary = FieldSummary(field_id=field["id"], field_name=field["field_name"])
+                if code is not None:
+                    summary.values = int(value_counts[code])
+                    summary.papers_with_value = int(papers_with_value[code])
+                    summary.completeness = float(completeness[code])
+                field_summaries.append(summary)
+
+            evaluated, passed = matrix.filter_counts()
+            filter_summaries = [
+                FilterSummary(
+                    filter_id=filter_id,
+                    evaluated=int(evaluated[code]),
+                    passed=int(passed[code]),
+                    pass_rate=float(passed[code] / evaluated[code]) if evaluated[code] else None,
+                )
+                for code, filter_id in enumerate(matrix.filter_ids)
+            ]
+
+            return Success(
+                ExtractionSummaryResponse(
+                    project_id=request.project_id,
+                    paper_count=matrix.paper_count,
+                    value_count=matrix.value_count,
+                    fields=field_summaries,
+                    filters=filter_summaries,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during summary: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during summary: {e}"))
+
+    # Normalizes the values of a field page by page and writes the numbers next to the raw text.
+    # Parsing runs in a worker thread; the write back updates only the normalized columns, and skips values
+    # re-extracted or deleted since they were read.
+    async def normalize_field(self, request: NormalizeFieldRequest) -> Result[NormalizeFieldResponse, ProjectServiceError]:
+        try:
+            missing = await self._find_field(request.project_id, request.field_id)
+            if missing is not None:
+                return Failure(missing)
+
+            values = parsed = failed = 0
+            write_errors = []
+            now = datetime.now(timezone.utc).isoformat()
+            async for rows in self.dal.iter_field_values(field_id=request.field_id):
+                normalized = await asyncio.to_thread(normalize_values, [row["field_value"] for row in rows])
+                updates = [
+                    {"id": row["id"], "field_value": row["field_value"], **normalized.columns(i), "normalized_at": now}
+                    for i, row in enumerate(rows)
+                ]
+                result = await self.dal.update_normalized_values(updates)
+                values += len(rows)
+                parsed += int(normalized.parsed.sum())
+                failed += sum(chunk.row_count for chunk in result.failed_chunks)
+                write_errors += [chunk.error for chunk in result.failed_chunks]
+            if self.stats_cache is not None:
+                await self.stats_cache.invalidate_field(request.field_id)
+
+            return Success(
+                NormalizeFieldResponse(
+                    project_id=request.project_id,
+                    field_id=request.field_id,
+                    values=values,
+                    parsed=parsed,
+                    failed=failed,
+                    write_errors=write_errors,
+                    status=ResponseStatus.DEGRADED if failed else ResponseStatus.SUCCESS,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during normalization: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during normalization: {e}"))
+
+    # Stats are computed over the whole project's result matrix in a worker thread and served from the cache
+    # until the field is normalized again or the cache entry expires.
+    async def field_stats(self, request: FieldStatsRequest) -> Result[FieldStatsResponse, ProjectServiceError]:
+        try:
+            missing = await self._find_field(request.project_id, request.field_id)
+            if missing is not None:
+                return Failure(missing)
+
+            async def load() -> FieldStatsResponse:
+                matrix = await self.load_field_matrix(request.project_id, request.field_id)
+                return await asyncio.to_thread(compute_field_stats, matrix, request.project_id, request.field_id, request.bins)
+
+            if self.stats_cache is None:
+                return Success(await load())
+            return Success(await self.stats_cache.get(self.user_id, request.field_id, request.bins, load))
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during field stats: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during field stats: {e}"))
@@ -0,0 +1,162 @@
+import asyncio
+import uuid
+from typing import Optional
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.exceptions import DatabaseError
+from app.db.extraction_results_dal import EXTRACTION_FIELD_PROMPT_COLUMNS, ExtractionResultsDAL
+from app.db.papers_dal import PaperDAL
+from app.db.projections import ID_ONLY
+from app.extraction.engine import ExtractionEngine, RunContext
+from app.extraction.prompts import field_definition_hash
+from app.extraction.queue import DONE, FAILED, LEASED, QUEUED, RunRecord
+from app.models.extraction_run_api_models import (
+    CreateExtractionRunRequest,
+    CreateExtractionRunResponse,
+    ExtractionRunStatusResponse,
+    GetExtractionRunRequest,
+)
+from app.models.shared import ResponseStatus
+from app.services.errors import InternalServiceError, InvalidRequestError, NotFoundError, ProjectServiceError
+from returns.result import Failure, Result, Success
+
+MAX_REPORTED_ERRORS = 20
+
+
+# Fields of a paper without a value yet, or whose value was extracted under an older definition of the field;
+# with force, every field with a value from an extraction run too. Values without a hash were not written by an
+# extraction run (e.g. entered by hand) and are always kept: their rows have other ids than result_id gives,
+# so extracting the cell would add a second row for it instead of replacing the value.
+def missing_fields(paper: dict, hashes: dict[str, str], force: bool = False) -> list[str]:
+    extracted = {cell["extraction_field_id"]: cell.get("field_hash") for cell in paper.get("extracted_fields") or []}
+    return [
+        field_id
+        for field_id, current in hashes.items()
+        if field_id not in extracted or (extracted[field_id] is not None and (force or extracted[field_id] != current))
+    ]
+
+
+# Papers that failed one of the project's filters need no extraction.
+def failed_filter(paper: dict) -> bool:
+    return any(result.get("passed") is False for result in paper.get("paper_filter_results") or [])
+
+
+class ExtractionRunService:
+    # Plans extraction runs and hands them to the shared ExtractionEngine. The engine's workers use this
+    # service's DALs, so results are written as the user who started (or resumed) the run.
+    def __init__(
+        self,
+        engine: ExtractionEngine,
+        results_dal: ExtractionResultsDAL,
+        paper_dal: PaperDAL,
+        project_dal: AsyncProjectDAL,
+        user_id: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.results_dal = results_dal
+        self.paper_dal = paper_dal
+        self.project_dal = project_dal
+        self.user_id = user_id
+
+    async def create_run(self, request: CreateExtractionRunRequest) -> Result[CreateExtractionRunResponse, ProjectServiceError]:
+        try:
+            if await self.project_dal.get_project_by_id(request.project_id, columns=ID_ONLY) is None:
+                return Failure(NotFoundError("Project", str(request.project_id)))
+
+            fields = await self.results_dal.get_extraction_fields(request.project_id, columns=EXTRACTION_FIELD_PROMPT_COLUMNS)
+            if request.options.field_ids is not None:
+                wanted = {str(field_id) for field_id in request.options.field_ids}
+                unknown = wanted - {field["id"] for field in fields}
+                if unknown:
+                    return Failure(InvalidRequestError(f"Unknown extraction fields: {', '.join(sorted(unknown))}"))
+                fields = [field for field in fields if field["id"] in wanted]
+            if not fields:
+                return Failure(InvalidRequestError("The project has no extraction fields"))
+
+            wanted_papers = {str(paper_id) for paper_id in request.options.paper_ids} if request.options.paper_ids is not None else None
+            hashes = {field["id"]: field_definition_hash(field) for field in fields}
+            work, excluded = [], 0
+            async for rows in self.results_dal.iter_paper_cells(request.project_id):
+                for paper in rows:
+                    if wanted_papers is not None and paper["id"] not in wanted_papers:
+                        continue
+                    if not request.options.include_filtered_out and failed_filter(paper):
+                        excluded += 1
+                        continue
+                    field_ids = missing_fields(paper, hashes, force=request.options.force)
+                    if field_ids:
+                        work.append((paper["id"], field_ids))
+
+            run_id = str(uuid.uuid4())
+            items = await asyncio.to_thread(
+                self.engine.queue.create_run, run_id, str(request.project_id), self.user_id, work, request.options.force
+            )
+            self.engine.start(self._context(run_id, fields, request.options.force))
+            return Success(
+                CreateExtractionRunResponse(
+                    run_id=run_id,
+                    project_id=request.project_id,
+                    items=items,
+                    fields=len(fields),
+                    cells=sum(len(field_ids) for _, field_ids in work),
+                    excluded=excluded,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error while creating extraction run: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error while creating extraction run: {e}"))
+
+    async def get_run(self, request: GetExtractionRunRequest) -> Result[ExtractionRunStatusResponse, ProjectServiceError]:
+        try:
+            if await self._owned_run(request) is None:
+                return Failure(NotFoundError("Extraction run", str(request.run_id)))
+            return Success(await self._status(request))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error while reading extraction run: {e}"))
+
+    # Restarts processing of a run's remaining items, e.g. after a server restart or once the user's token was renewed.
+    # Items failed for good are not retried.
+    async def resume_run(self, request: GetExtractionRunRequest) -> Result[ExtractionRunStatusResponse, ProjectServiceError]:
+        try:
+            run = await self._owned_run(request)
+            if run is None:
+                return Failure(NotFoundError("Extraction run", str(request.run_id)))
+            fields = await self.results_dal.get_extraction_fields(request.project_id, columns=EXTRACTION_FIELD_PROMPT_COLUMNS)
+            self.engine.start(self._context(run.run_id, fields, run.force))
+            return Success(await self._status(request))
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error while resuming extraction run: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error while resuming extraction run: {e}"))
+
+    def _context(self, run_id: str, fields: list[dict], force: bool) -> RunContext:
+        return RunContext(
+            run_id=run_id, results_dal=self.results_dal, paper_dal=self.paper_dal, fields={field["id"]: field for field in fields}, force=force
+        )
+
+    # Runs are only visible to the user who created them, under the project they were created for.
+    async def _owned_run(self, request: GetExtractionRunRequest) -> Optional[RunRecord]:
+        run = await asyncio.to_thread(self.engine.queue.get_run, str(request.run_id))
+        return run if run is not None and run.project_id == str(request.project_id) and run.user_id == self.user_id else None
+
+    async def _status(self, request: GetExtractionRunRequest) -> ExtractionRunStatusResponse:
+        run_id = str(request.run_id)
+        counts = await asyncio.to_thread(self.engine.queue.counts, run_id)
+        errors = await asyncio.to_thread(self.engine.queue.errors, run_id, MAX_REPORTED_ERRORS)
+        return ExtractionRunStatusResponse(
+            run_id=request.run_id,
+            project_id=request.project_id,
+            queued=counts[QUEUED],
+            running=counts[LEASED],
+            done=counts[DONE],
+            failed=counts[FAILED],
+            active=self.engine.is_running(run_id),
+            errors=errors,
+            status=ResponseStatus.DEGRADED if counts[FAILED] else ResponseStatus.SUCCESS,
+        )
@@ -0,0 +1,113 @@
+import os
+import uuid
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+import numpy as np
+from app.models.extraction_api_models import FieldStatsResponse, FilterBreakdown, HistogramBin, NumericSummary
+from app.services.cache import CacheBackend, InMemoryCacheBackend
+from app.services.project_cache import CacheStats
+from app.services.result_matrix import ResultMatrix
+
+# Distribution statistics of one field's normalized numbers, computed with numpy over a ResultMatrix.
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def numeric_summary(values: np.ndarray) -> Optional[NumericSummary]:
+    if not len(values):
+        return None
+    quantiles = np.quantile(values, QUANTILES)
+    return NumericSummary(
+        count=len(values),
+        mean=float(values.mean()),
+        std=float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        min=float(values.min()),
+        max=float(values.max()),
+        median=float(np.median(values)),
+        quantiles={f"p{round(q * 100):02d}": float(v) for q, v in zip(QUANTILES, quantiles)},
+    )
+
+
+def histogram(values: np.ndarray, bins: int) -> list[HistogramBin]:
+    if not len(values):
+        return []
+    counts, edges = np.histogram(values, bins=bins)
+    return [HistogramBin(lower=float(edges[i]), upper=float(edges[i + 1]), count=int(count)) for i, count in enumerate(counts)]
+
+
+# One number per paper. Numbers in a unit other than the field's most common one are not comparable and are left out.
+def compute_field_stats(matrix: ResultMatrix, project_id: UUID, field_id: UUID, bins: int) -> FieldStatsResponse:
+    indices = matrix.numeric_values(str(field_id))
+    units = matrix.value_units[indices]
+    unit_code = int(np.bincount(units + 1).argmax()) - 1 if len(units) else -1
+    kept = indices[units == unit_code]
+    values, papers = matrix.value_numbers[kept], matrix.value_papers[kept]
+
+    by_filter = []
+    for code, filter_id in enumerate(matrix.filter_ids):
+        evaluated, passed = matrix.filter_masks(code)
+        evaluated, passed = evaluated[papers], passed[papers]
+        by_filter.append(
+            FilterBreakdown(
+                filter_id=filter_id,
+                passed=numeric_summary(values[passed]),
+                failed=numeric_summary(values[evaluated & ~passed]),
+                not_evaluated=numeric_summary(values[~evaluated]),
+            )
+        )
+
+    return FieldStatsResponse(
+        project_id=project_id,
+        field_id=field_id,
+        unit=matrix.units[unit_code] if unit_code >= 0 else None,
+        paper_count=matrix.paper_count,
+        missing_rate=1 - len(indices) / matrix.paper_count if matrix.paper_count else 1.0,
+        other_unit=len(indices) - len(kept),
+        summary=numeric_summary(values),
+        histogram=histogram(values, bins),
+        by_filter=by_filter,
+    )
+
+
+Loader = Callable[[], Awaitable[FieldStatsResponse]]
+
+
+class FieldStatsCache:
+    # Read-through cache of field stats responses, keyed by user (RLS) and field.
+    # Every field has a generation token that is part of the key; writes to the field's values replace the token,
+    # which invalidates the stats of all users and bin counts at once. The TTL bounds staleness from other writes,
+    # such as new filter results.
+    def __init__(self, backend: CacheBackend, ttl: float = 300.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    @classmethod
+    def from_env(cls) -> "FieldStatsCache":
+        backend = InMemoryCacheBackend(max_entries=int(os.getenv("FIELD_STATS_CACHE_MAX_ENTRIES", 1_000)))
+        return cls(backend, ttl=float(os.getenv("FIELD_STATS_CACHE_TTL", 300.0)))
+
+    async def get(self, user_id: str, field_id: UUID, bins: int, loader: Loader) -> FieldStatsResponse:
+        generation = await self.backend.get(self._generation_key(field_id))
+        if generation is None:
+            generation = uuid.uuid4().hex
+            await self.backend.set(self._generation_key(field_id), generation, self.ttl)
+        key = f"field_stats:{user_id}:{field_id}:{generation}:{bins}"
+
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return FieldStatsResponse.model_validate(cached)
+
+        self.stats.misses += 1
+        response = await loader()
+        await self.backend.set(key, response.model_dump(mode="json"), self.ttl)
+        return response
+
+    async def invalidate_field(self, field_id: UUID) -> None:
+        await self.backend.delete(self._generation_key(field_id))
+
+    @staticmethod
+    def _generation_key(field_id) -> str:
+        return f"field_stats_generation:{field_id}"
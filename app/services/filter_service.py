@@ -0,0 +1,108 @@
+from typing import Optional
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.exceptions import DatabaseError
+from app.db.filters_dal import FilterDAL
+from app.db.pagination import decode_cursor, encode_cursor
+from app.db.papers_dal import PAPER_TEXT_COLUMNS, PaperDAL
+from app.db.projections import ID_ONLY
+from app.extraction.filter_engine import FilterEngine, PreparedFilter, filter_result_id
+from app.extraction.filter_rules import RuleSyntaxError
+from app.models.filter_api_models import EvaluateFiltersRequest, EvaluateFiltersResponse, FilterEvaluationSummary
+from app.models.shared import ResponseStatus
+from app.services.errors import InternalServiceError, InvalidRequestError, NotFoundError, ProjectServiceError
+from returns.result import Failure, Result, Success
+
+
+class FilterService:
+    def __init__(self, engine: FilterEngine, filter_dal: FilterDAL, paper_dal: PaperDAL, project_dal: AsyncProjectDAL):
+        self.engine = engine
+        self.filter_dal = filter_dal
+        self.paper_dal = paper_dal
+        self.project_dal = project_dal
+
+    # Evaluates the project's filters on one page of papers and writes the outcomes in one bulk upsert, so a request
+    # makes at most page_size LLM calls per filter; clients continue with next_cursor until it is null.
+    # Filters after a paper's first failure are stored as skipped (passed is null). Papers whose LLM call failed
+    # get no result row and are reported as undecided.
+    async def evaluate_filters(self, request: EvaluateFiltersRequest) -> Result[EvaluateFiltersResponse, ProjectServiceError]:
+        try:
+            after = decode_cursor(request.options.cursor) if request.options.cursor else None
+        except ValueError as e:
+            return Failure(InvalidRequestError(str(e)))
+
+        try:
+            if await self.project_dal.get_project_by_id(request.project_id, columns=ID_ONLY) is None:
+                return Failure(NotFoundError("Project", str(request.project_id)))
+
+            rows = await self.filter_dal.get_filters(request.project_id)
+            if request.options.filter_ids is not None:
+                wanted = {str(filter_id) for filter_id in request.options.filter_ids}
+                unknown = wanted - {row["id"] for row in rows}
+                if unknown:
+                    return Failure(InvalidRequestError(f"Unknown filters: {', '.join(sorted(unknown))}"))
+                rows = [row for row in rows if row["id"] in wanted]
+            try:
+                filters = [PreparedFilter.from_row(row) for row in rows]
+            except RuleSyntaxError as e:
+                return Failure(InvalidRequestError(f"Invalid filter rule: {e}"))
+
+            summaries = {prepared.id: FilterEvaluationSummary(filter_id=prepared.id) for prepared in filters}
+            write_errors = []
+            papers, next_keyset = await self.paper_dal.list_papers(
+                request.project_id, request.options.page_size, after, columns=PAPER_TEXT_COLUMNS
+            )
+            # Results stored under other ids than filter_result_id gives (e.g. written before ids were derived) keep
+            # their id, so the upsert replaces them instead of adding a second row for the paper and filter.
+            stored = await self.filter_dal.get_filter_results([paper["id"] for paper in papers], list(summaries))
+            result_ids = {(row["paper_id"], row["filter_id"]): row["id"] for row in stored}
+            results = []
+            decisions = await self.engine.evaluate_page(filters, papers)
+            for prepared in filters:
+                summary = summaries[prepared.id]
+                for paper, decision in zip(papers, decisions[prepared.id]):
+                    if decision is None:
+                        summary.undecided += 1
+                        continue
+                    _count(summary, decision.passed, decision.decided_by)
+                    results.append(
+                        {
+                            "id": result_ids.get((paper["id"], prepared.id), filter_result_id(paper["id"], prepared.id)),
+                            "paper_id": paper["id"],
+                            "filter_id": prepared.id,
+                            "passed": decision.passed,
+                            "decided_by": decision.decided_by,
+                        }
+                    )
+            if results:
+                result = await self.filter_dal.upsert_filter_results(results)
+                write_errors.extend(chunk.error for chunk in result.failed_chunks)
+
+            degraded = write_errors or any(summary.undecided for summary in summaries.values())
+            return Success(
+                EvaluateFiltersResponse(
+                    project_id=request.project_id,
+                    filters=list(summaries.values()),
+                    write_errors=write_errors,
+                    next_cursor=encode_cursor(next_keyset) if next_keyset else None,
+                    status=ResponseStatus.DEGRADED if degraded else ResponseStatus.SUCCESS,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error while evaluating filters: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error while evaluating filters: {e}"))
+
+
+def _count(summary: FilterEvaluationSummary, passed: Optional[bool], decided_by: str) -> None:
+    if passed is None:
+        summary.skipped += 1
+        return
+    summary.evaluated += 1
+    if passed:
+        summary.passed += 1
+    else:
+        summary.failed += 1
+    setattr(summary, f"by_{decided_by}", getattr(summary, f"by_{decided_by}") + 1)
@@ -0,0 +1,136 @@
+import re
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Parses free-text extracted values into numbers: "AUC 0.87 (95% CI 0.82–0.91)", "n=1,204", "12.5 ms".
+# Values are parsed once per distinct text and unit conversion is applied to whole arrays, because a field's values
+# repeat heavily (the same "n=120" or "p<0.05" across many papers).
+
+_NUMBER = r"[-+−]?(?:(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|\.\d+)(?:[eE][-+]?\d+)?"
+_RANGE_SEPARATOR = r"\s*(?:–|—|to|,|;|-(?=\s*[-+−]?[\d.]))\s*"
+
+_SAMPLE_SIZE = re.compile(rf"\b[nN]\s*=\s*({_NUMBER})")
+# "95% CI 0.82-0.91", "CI: [0.82, 0.91]", or a bare bracketed range after the value: "0.87 (0.82–0.91)".
+_CONFIDENCE_INTERVAL = re.compile(
+    rf"(?:\d+(?:\.\d+)?\s*%\s*)?\bCI\b\s*[:=]?\s*[\[(]?\s*({_NUMBER}){_RANGE_SEPARATOR}({_NUMBER})\s*[\])]?"
+    rf"|[\[(]\s*({_NUMBER}){_RANGE_SEPARATOR}({_NUMBER})\s*[\])]",
+    re.IGNORECASE,
+)
+
+# Unit spelling -> (canonical unit, factor to the canonical unit). Percentages become ratios so that
+# "87%" and "0.87" compare equal.
+UNITS: dict[str, tuple[str, float]] = {
+    "ns": ("s", 1e-9),
+    "µs": ("s", 1e-6),
+    "μs": ("s", 1e-6),
+    "us": ("s", 1e-6),
+    "ms": ("s", 1e-3),
+    "s": ("s", 1.0),
+    "sec": ("s", 1.0),
+    "seconds": ("s", 1.0),
+    "min": ("s", 60.0),
+    "minutes": ("s", 60.0),
+    "h": ("s", 3600.0),
+    "hours": ("s", 3600.0),
+    "B": ("B", 1.0),
+    "KB": ("B", 1e3),
+    "kB": ("B", 1e3),
+    "MB": ("B", 1e6),
+    "GB": ("B", 1e9),
+    "TB": ("B", 1e12),
+    "mg": ("g", 1e-3),
+    "g": ("g", 1.0),
+    "kg": ("g", 1e3),
+    "mm": ("m", 1e-3),
+    "cm": ("m", 1e-2),
+    "m": ("m", 1.0),
+    "km": ("m", 1e3),
+    "%": ("ratio", 1e-2),
+}
+
+# Longest spellings first, so "ms" is not read as "m" followed by "s".
+_UNIT_NAMES = sorted(UNITS, key=len, reverse=True)
+_VALUE = re.compile(rf"({_NUMBER})\s*({'|'.join(map(re.escape, _UNIT_NAMES))})?(?![A-Za-zµμ])")
+# Canonical units by code; code 0 means no unit.
+_CANONICAL_UNITS = [None] + sorted({unit for unit, _ in UNITS.values()})
+_UNIT_CODES = {name: (_CANONICAL_UNITS.index(unit), factor) for name, (unit, factor) in UNITS.items()}
+
+
+def _to_float(text: str) -> float:
+    return float(text.replace(",", "").replace("−", "-"))
+
+
+# Raw numbers of one text, before unit conversion: (value, ci_lower, ci_upper, sample_size), unit code and factor.
+def parse_metric(text: str) -> tuple[tuple[float, float, float, float], int, float]:
+    sample_size, ci_lower, ci_upper = np.nan, np.nan, np.nan
+    match = _SAMPLE_SIZE.search(text)
+    if match:
+        sample_size = _to_float(match.group(1))
+        text = text[: match.start()] + " " + text[match.end() :]
+    match = _CONFIDENCE_INTERVAL.search(text)
+    if match:
+        lower, upper = (match.group(1), match.group(2)) if match.group(1) is not None else (match.group(3), match.group(4))
+        ci_lower, ci_upper = _to_float(lower), _to_float(upper)
+        text = text[: match.start()] + " " + text[match.end() :]
+
+    # The first remaining number is the value. A bare "n=1,204" is its own value.
+    match = _VALUE.search(text)
+    if match is None:
+        return (sample_size, ci_lower, ci_upper, sample_size), 0, 1.0
+    unit_code, factor = _UNIT_CODES[match.group(2)] if match.group(2) else (0, 1.0)
+    value = _to_float(match.group(1))
+    return (value, ci_lower, ci_upper, sample_size), unit_code, factor
+
+
+@dataclass
+class NormalizedValues:
+    # Parallel arrays, one entry per input text. NaN marks a missing number.
+    value: np.ndarray
+    unit: list[Optional[str]]
+    ci_lower: np.ndarray
+    ci_upper: np.ndarray
+    sample_size: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    @property
+    def parsed(self) -> np.ndarray:
+        return ~np.isnan(self.value)
+
+    # Column values of row i for extracted_fields, with None for missing numbers.
+    def columns(self, i: int) -> dict:
+        def number(array: np.ndarray) -> Optional[float]:
+            return None if np.isnan(array[i]) else float(array[i])
+
+        sample_size = number(self.sample_size)
+        return {
+            "numeric_value": number(self.value),
+            "numeric_unit": self.unit[i],
+            "ci_lower": number(self.ci_lower),
+            "ci_upper": number(self.ci_upper),
+            "sample_size": int(sample_size) if sample_size is not None else None,
+        }
+
+
+# Normalizes a batch of texts. Each distinct text is parsed once; conversion to canonical units is vectorized.
+def normalize_values(texts: Sequence[Optional[str]]) -> NormalizedValues:
+    distinct, inverse = np.unique(np.array([text or "" for text in texts], dtype=str), return_inverse=True)
+    parsed = [parse_metric(text) for text in distinct.tolist()]
+    numbers = np.array([numbers for numbers, _, _ in parsed], dtype=np.float64).reshape(len(distinct), 4)
+    unit_codes = np.array([code for _, code, _ in parsed], dtype=np.int8)
+    factors = np.array([factor for _, _, factor in parsed], dtype=np.float64)
+
+    numbers[:, :3] *= factors[:, None]
+    numbers, unit_codes = numbers[inverse.reshape(-1)], unit_codes[inverse.reshape(-1)]
+    units = np.array(_CANONICAL_UNITS, dtype=object)[unit_codes]
+    units[np.isnan(numbers[:, 0])] = None
+    return NormalizedValues(
+        value=numbers[:, 0],
+        unit=units.tolist(),
+        ci_lower=numbers[:, 1],
+        ci_upper=numbers[:, 2],
+        sample_size=numbers[:, 3],
+    )
@@ -0,0 +1,167 @@
+import unicodedata
+from typing import Sequence
+
+import numpy as np
+
+# MinHash signatures and LSH banding for near-duplicate detection.
+# A document is reduced to the set of its word k-shingles; the fraction of equal signature positions between two
+# documents estimates the Jaccard similarity of their shingle sets. LSH banding finds candidate pairs by bucketing
+# signature bands, so only documents sharing a bucket are ever compared.
+
+# Bytes that belong to words after ASCII folding and lowercasing; everything else separates words.
+_WORD_BYTES = np.zeros(256, dtype=bool)
+_WORD_BYTES[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz0123456789", dtype=np.uint8)] = True
+_LOWERCASE = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+# Odd 64-bit constants: the word hash base (with its inverse mod 2**64) and the weights combining words into shingles.
+_BASE = 0x100000001B3
+_BASE_INVERSE = pow(_BASE, -1, 2**64)
+_SHINGLE_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93], dtype=np.uint64)
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+
+
+def _ascii(text: str) -> bytes:
+    if text.isascii():
+        return text.encode()
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore")
+
+
+def _powers(base: int, count: int) -> np.ndarray:
+    powers = np.full(count, base, dtype=np.uint64)
+    powers[0] = 1
+    return np.cumprod(powers, dtype=np.uint64)
+
+
+# Word k-shingle hashes of a batch of texts, without a Python-level loop over words.
+# Words are hashed as polynomials over their bytes using prefix sums: hash(word) = (H[end] - H[start]) * base**-start,
+# which is exact modulo 2**64 because the base is odd. Texts shorter than k words become a single shingle.
+# Returns the shingle hashes ordered by text, and the number of shingles of each text.
+def shingle_hashes(texts: Sequence[str], k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [_ascii(text) for text in texts]
+    data = np.frombuffer(b" ".join(encoded).translate(_LOWERCASE), dtype=np.uint8)
+    text_starts = np.cumsum([0] + [len(e) + 1 for e in encoded[:-1]])
+
+    edges = np.diff(np.concatenate(([False], _WORD_BYTES[data], [False])).astype(np.int8))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    prefix = np.zeros(len(data) + 1, dtype=np.uint64)
+    np.cumsum(data.astype(np.uint64) * _powers(_BASE, len(data)), dtype=np.uint64, out=prefix[1:])
+    words = (prefix[ends] - prefix[starts]) * _powers(_BASE_INVERSE, len(data) + 1)[starts]
+    word_text = np.searchsorted(text_starts, starts, side="right") - 1
+    word_counts = np.bincount(word_text, minlength=len(texts))
+
+    n = len(words)
+    span = max(n - k + 1, 0)
+    full = word_text[:span] == word_text[k - 1 : k - 1 + span]
+    shingles = np.zeros(span, dtype=np.uint64)
+    for offset in range(k):
+        shingles += words[offset : offset + span] * _SHINGLE_MIX[offset % len(_SHINGLE_MIX)]
+    shingles, shingle_text = shingles[full], word_text[:span][full]
+
+    short = np.flatnonzero((word_counts > 0) & (word_counts < k))
+    if len(short):
+        in_short = np.isin(word_text, short)
+        position = np.arange(n) - np.concatenate(([0], np.cumsum(word_counts)[:-1]))[word_text]
+        weighted = words[in_short] * _SHINGLE_MIX[position[in_short] % len(_SHINGLE_MIX)]
+        first = np.flatnonzero(np.diff(word_text[in_short], prepend=-1) != 0)
+        shingles = np.concatenate((shingles, np.add.reduceat(weighted, first)))
+        shingle_text = np.concatenate((shingle_text, short))
+        order = np.argsort(shingle_text, kind="stable")
+        shingles, shingle_text = shingles[order], shingle_text[order]
+
+    return shingles, np.bincount(shingle_text, minlength=len(texts))
+
+
+class MinHasher:
+    # num_perm hash functions h(x) = (a * x + b) >> 32 over 64-bit shingle hashes (multiply-shift hashing, no modulo).
+    # The same seed must be used for signatures that are compared with each other.
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    # Signature matrix of shape (len(texts), num_perm). Texts without any word get an all-max row and match nothing
+    # (see empty_rows). Texts are processed in small batches so the per-permutation temporaries stay in CPU cache.
+    def signatures(self, texts: Sequence[str], batch_size: int = 500) -> np.ndarray:
+        result = np.full((len(texts), self.num_perm), _MAX_HASH, dtype=np.uint32)
+        for start in range(0, len(texts), batch_size):
+            values, counts = shingle_hashes(texts[start : start + batch_size], self.shingle_size)
+            rows = np.flatnonzero(counts) + start
+            if not len(rows):
+                continue
+            offsets = np.concatenate(([0], np.cumsum(counts[counts > 0])[:-1]))
+            hashed = np.empty_like(values)
+            for i in range(self.num_perm):
+                np.multiply(values, self._a[i], out=hashed)
+                hashed += self._b[i]
+                hashed >>= np.uint64(32)
+                result[rows, i] = np.minimum.reduceat(hashed, offsets)
+        return result
+
+
+def empty_rows(signatures: np.ndarray) -> np.ndarray:
+    return np.all(signatures == _MAX_HASH, axis=1)
+
+
+# Picks (bands, rows) with bands * rows <= num_perm whose LSH threshold (1 / bands) ** (1 / rows)
+# is closest to the wanted Jaccard threshold.
+def choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    candidates = [(b, num_perm // b) for b in range(1, num_perm + 1)]
+    return min(candidates, key=lambda c: (abs((1 / c[0]) ** (1 / c[1]) - threshold), -c[0] * c[1]))
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+# Groups rows whose estimated Jaccard similarity reaches threshold. Rows sharing an LSH bucket are compared with the
+# bucket's first row only, so the cost is linear in the number of rows per band rather than quadratic.
+# Returns clusters of row indices (lowest index first), each with the similarity of every row to that first row.
+def lsh_clusters(signatures: np.ndarray, threshold: float) -> list[list[tuple[int, float]]]:
+    n, num_perm = signatures.shape
+    if n < 2:
+        return []
+    bands, rows = choose_bands(num_perm, threshold)
+    usable = ~empty_rows(signatures)
+    mix = _SHINGLE_MIX[np.arange(rows) % len(_SHINGLE_MIX)]
+    union_find = _UnionFind(n)
+
+    for band in range(bands):
+        block = signatures[:, band * rows : (band + 1) * rows].astype(np.uint64)
+        keys = (block * mix).sum(axis=1)
+        order = np.flatnonzero(usable)
+        order = order[np.argsort(keys[order], kind="stable")]
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+        ends = np.concatenate((starts[1:], [len(order)]))
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            members = order[start:end]
+            representative = members.min()
+            similarity = (signatures[members] == signatures[representative]).mean(axis=1)
+            for member in members[similarity >= threshold]:
+                union_find.union(int(representative), int(member))
+
+    # Roots are the lowest index of their group, and rows are visited in order, so member lists come out sorted.
+    groups: dict[int, list[int]] = {}
+    for row in range(n):
+        groups.setdefault(union_find.find(row), []).append(row)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        similarity = (signatures[members] == signatures[members[0]]).mean(axis=1)
+        clusters.append([(row, float(sim)) for row, sim in zip(members, similarity)])
+    return clusters
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+from uuid import UUID
+
+import numpy as np
+from app.services.minhash import MinHasher, lsh_clusters
+
+# Near-duplicate detection over papers.title + papers.abstract (preprint vs. published version, retitled papers).
+# Exact dedup keys (app/services/paper_dedup.py) catch identical identifiers; this catches similar text.
+
+
+def paper_text(row: dict) -> str:
+    return f"{row.get('title') or ''} {row.get('abstract') or ''}"
+
+
+@dataclass
+class NearDuplicateMember:
+    paper_id: str
+    title: Optional[str]
+    similarity: float
+
+
+class NearDuplicateIndex:
+    # MinHash signatures of a project's papers. Banding happens per query, so any threshold can be asked for
+    # without recomputing signatures.
+    def __init__(self, hasher: MinHasher):
+        self.hasher = hasher
+        self.paper_ids: list[str] = []
+        self.titles: list[Optional[str]] = []
+        self._blocks: list[np.ndarray] = []
+        self._signatures: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.paper_ids)
+
+    # CPU-bound; callers on the event loop run it in a thread.
+    def add(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        self._blocks.append(self.hasher.signatures([paper_text(row) for row in rows]))
+        self._signatures = None
+        self.paper_ids.extend(row["id"] for row in rows)
+        self.titles.extend(row.get("title") for row in rows)
+
+    @property
+    def signatures(self) -> np.ndarray:
+        if self._signatures is None:
+            self._signatures = np.concatenate(self._blocks) if self._blocks else np.empty((0, self.hasher.num_perm), dtype=np.uint32)
+            self._blocks = [self._signatures]
+        return self._signatures
+
+    # Clusters of papers whose estimated Jaccard similarity to the cluster's first paper reaches threshold,
+    # largest clusters first. CPU-bound, like add().
+    def clusters(self, threshold: float) -> list[list[NearDuplicateMember]]:
+        clusters = lsh_clusters(self.signatures, threshold)
+        clusters.sort(key=lambda cluster: (-len(cluster), cluster[0][0]))
+        return [[NearDuplicateMember(self.paper_ids[row], self.titles[row], similarity) for row, similarity in cluster] for cluster in clusters]
+
+
+PageLoader = Callable[[], AsyncIterator[list[dict]]]
+
+
+class NearDuplicateIndexRegistry:
+    # Per-project near-duplicate indexes, built lazily from the papers table and kept for ttl seconds.
+    # Ingestion invalidates a project's index; the TTL bounds staleness from writes made elsewhere.
+    # Builds are serialized per project, and signature computation runs in a worker thread.
+    def __init__(self, max_projects: int = 16, ttl: float = 300.0, num_perm: int = 64, clock: Callable[[], float] = time.monotonic):
+        self.max_projects = max_projects
+        self.ttl = ttl
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.clock = clock
+        self._indexes: OrderedDict[str, tuple[float, NearDuplicateIndex]] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @classmethod
+    def from_env(cls) -> "NearDuplicateIndexRegistry":
+        return cls(
+            max_projects=int(os.getenv("NEAR_DUPLICATE_MAX_PROJECTS", 16)),
+            ttl=float(os.getenv("NEAR_DUPLICATE_TTL", 300.0)),
+            num_perm=int(os.getenv("NEAR_DUPLICATE_NUM_PERM", 64)),
+        )
+
+    async def get(self, project_id: UUID, load: PageLoader) -> NearDuplicateIndex:
+        key = str(project_id)
+        index = self._cached(key)
+        if index is not None:
+            return index
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._cached(key)
+            if index is None:
+                index = NearDuplicateIndex(self.hasher)
+                async for rows in load():
+                    await asyncio.to_thread(index.add, rows)
+                self._indexes[key] = (self.clock() + self.ttl, index)
+                while len(self._indexes) > self.max_projects:
+                    self._indexes.popitem(last=False)
+        self._locks.pop(key, None)
+        return index
+
+    def invalidate(self, project_id: UUID) -> None:
+        self._indexes.pop(str(project_id), None)
+
+    def _cached(self, key: str) -> Optional[NearDuplicateIndex]:
+        entry = self._indexes.get(key)
+        if entry is None:
+            return None
+        expires_at, index = entry
+        if expires_at <= self.clock():
+            del self._indexes[key]
+            return None
+        self._indexes.move_to_end(key)
+        return index
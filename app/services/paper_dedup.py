@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+from uuid import UUID
+
+# Paper deduplication keys. The same paper reaches a project from several sources (arXiv, PubMed, ...)
+# with ids written in different ways, so every identifier is normalized before comparison.
+
+_DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+_PMID_PREFIX = re.compile(r"^pmid:\s*", re.IGNORECASE)
+_ARXIV_PREFIX = re.compile(r"^(?:https?://arxiv\.org/(?:abs|pdf)/|arxiv:\s*)", re.IGNORECASE)
+_ARXIV_VERSION = re.compile(r"v\d+$")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_doi(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return _DOI_PREFIX.sub("", value.strip()).lower() or None
+
+
+def normalize_pmid(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    digits = _PMID_PREFIX.sub("", str(value).strip())
+    if not digits.isdigit():
+        return None
+    return digits.lstrip("0") or None
+
+
+def normalize_arxiv_id(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    arxiv_id = _ARXIV_PREFIX.sub("", value.strip()).lower().removesuffix(".pdf")
+    return _ARXIV_VERSION.sub("", arxiv_id) or None
+
+
+# Titles are compared case-, accent- and punctuation-insensitively, and stored as a short hash.
+def title_hash(title: Optional[str]) -> Optional[str]:
+    if not title:
+        return None
+    ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode().lower()
+    words = _NON_ALNUM.sub(" ", ascii_title).split()
+    if not words:
+        return None
+    return hashlib.blake2b(" ".join(words).encode(), digest_size=8).hexdigest()
+
+
+# Dedup keys of a paper row, strongest identifier first.
+def paper_keys(row: dict) -> list[str]:
+    keys = []
+    for prefix, value in (
+        ("doi", normalize_doi(row.get("doi"))),
+        ("pmid", normalize_pmid(row.get("pmid"))),
+        ("arxiv", normalize_arxiv_id(row.get("arxiv_id"))),
+        ("title", title_hash(row.get("title"))),
+    ):
+        if value:
+            keys.append(f"{prefix}:{value}")
+    return keys
+
+
+class DedupIndex:
+    # Maps every dedup key of a project's papers to the paper id. A paper is a duplicate if any key matches.
+    def __init__(self):
+        self._keys: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def find(self, keys: list[str]) -> Optional[str]:
+        for key in keys:
+            paper_id = self._keys.get(key)
+            if paper_id is not None:
+                return paper_id
+        return None
+
+    def add(self, paper_id: str, keys: list[str]) -> None:
+        for key in keys:
+            self._keys.setdefault(key, paper_id)
+
+    # Drops keys that point at paper_id, e.g. after its insert failed.
+    def remove(self, paper_id: str, keys: list[str]) -> None:
+        for key in keys:
+            if self._keys.get(key) == paper_id:
+                del self._keys[key]
+
+
+PageLoader = Callable[[], AsyncIterator[list[dict]]]
+
+
+@dataclass
+class DedupStats:
+    loads: int = 0
+    evictions: int = 0
+
+
+class DedupIndexRegistry:
+    # Per-project dedup indexes, loaded lazily from the papers table on first use and kept in memory.
+    # Ingestion adds to an index as it queues rows, so the index stays current without reloading.
+    # Least recently used projects are evicted beyond max_projects; they are simply reloaded when needed.
+    # Loading is serialized per project, so concurrent ingestions into one project load its papers once.
+    def __init__(self, max_projects: int = 64):
+        self.max_projects = max_projects
+        self._indexes: OrderedDict[str, DedupIndex] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.stats = DedupStats()
+
+    @classmethod
+    def from_env(cls) -> "DedupIndexRegistry":
+        return cls(max_projects=int(os.getenv("PAPER_DEDUP_MAX_PROJECTS", 64)))
+
+    async def get(self, project_id: UUID, load: PageLoader) -> DedupIndex:
+        key = str(project_id)
+        index = self._cached(key)
+        if index is not None:
+            return index
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._cached(key)
+            if index is None:
+                index = DedupIndex()
+                async for rows in load():
+                    for row in rows:
+                        index.add(row["id"], paper_keys(row))
+                self.stats.loads += 1
+                self._indexes[key] = index
+                while len(self._indexes) > self.max_projects:
+                    self._indexes.popitem(last=False)
+                    self.stats.evictions += 1
+        self._locks.pop(key, None)
+        return index
+
+    def invalidate(self, project_id: UUID) -> None:
+        self._indexes.pop(str(project_id), None)
+
+    def _cached(self, key: str) -> Optional[DedupIndex]:
+        index = self._indexes.get(key)
+        if index is not None:
+            self._indexes.move_to_end(key)
+        return index
@@ -0,0 +1,247 @@
+import asyncio
+import codecs
+import csv
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from app.db.bulk_writer import BulkWriteResult
+from app.db.papers_dal import PaperDAL
+from app.models.paper_api_models import IngestPapersResponse, IngestRowError, PaperIngestRow
+from app.models.shared import ResponseStatus
+from app.services.paper_dedup import DedupIndex, paper_keys
+from pydantic import ValidationError
+
+# Streaming paper ingestion: the request body is parsed record by record and written in batches while it is
+# still arriving, so memory stays bounded by the batch size and the number of batches in flight.
+
+# A single record larger than this is rejected instead of being buffered.
+MAX_RECORD_CHARS = 1024 * 1024
+MAX_REPORTED_ERRORS = 20
+
+# Paper ids are derived from the project and the paper's external id, so a re-sent paper conflicts on the primary key.
+PAPER_ID_NAMESPACE = UUID("6f1c3a52-9d0e-4b8e-a4c1-2f7d5e9b8a10")
+
+
+class IngestFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+CONTENT_TYPES = {
+    "application/x-ndjson": IngestFormat.NDJSON,
+    "application/ndjson": IngestFormat.NDJSON,
+    "application/jsonl": IngestFormat.NDJSON,
+    "text/csv": IngestFormat.CSV,
+}
+
+
+def format_for_content_type(content_type: str) -> Optional[IngestFormat]:
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+# One record of the body: its first line number and either the raw row or the reason it could not be parsed.
+@dataclass
+class RawRecord:
+    line: int
+    row: Optional[dict] = None
+    error: Optional[str] = None
+
+
+# Yields (first line number, text) for each record of a UTF-8 byte stream. With quoted=True, a record continues
+# over newlines inside double quotes, as in CSV. Oversized records are yielded with text None.
+async def _iter_records(chunks: AsyncIterator[bytes], quoted: bool) -> AsyncIterator[tuple[int, Optional[str]]]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer, record, record_line, line_no, oversized = "", "", 1, 0, False
+
+    def take(lines: list[str]):
+        nonlocal record, record_line, line_no, oversized
+        for text in lines:
+            line_no += 1
+            if oversized:
+                oversized, record = False, ""
+                yield record_line, None
+                continue
+            if not record:
+                record_line = line_no
+            record = f"{record}\n{text}" if record else text
+            if quoted and record.count('"') % 2:
+                if len(record) > MAX_RECORD_CHARS:
+                    oversized = True
+                continue
+            yield record_line, record.rstrip("\r")
+            record = ""
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for item in take(lines):
+            yield item
+        if len(buffer) > MAX_RECORD_CHARS:
+            # Drop the partial line; the rest of it is discarded when its newline arrives.
+            if not record:
+                record_line = line_no + 1
+            buffer, oversized = "", True
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer or oversized:
+        for item in take([buffer]):
+            yield item
+    if record:
+        # Unterminated quote at the end of the body; the parser reports it.
+        yield record_line, record
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[RawRecord]:
+    async for line, text in _iter_records(chunks, quoted=False):
+        if text is None:
+            yield RawRecord(line=line, error="record too large")
+            continue
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as e:
+            yield RawRecord(line=line, error=f"invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield RawRecord(line=line, error="expected a JSON object")
+            continue
+        yield RawRecord(line=line, row=row)
+
+
+# The first record is the header. Empty cells are treated as missing values.
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[RawRecord]:
+    header = None
+    async for line, text in _iter_records(chunks, quoted=True):
+        if text is None:
+            yield RawRecord(line=line, error="record too large")
+            continue
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            yield RawRecord(line=line, error=f"invalid CSV: {e}")
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield RawRecord(line=line, error=f"expected {len(header)} columns, got {len(values)}")
+            continue
+        yield RawRecord(line=line, row={name: value if value != "" else None for name, value in zip(header, values)})
+
+
+# Paper ids are derived from the strongest normalized identifier of the paper.
+def paper_id(project_id: UUID, key: str) -> str:
+    return str(uuid.uuid5(PAPER_ID_NAMESPACE, f"{project_id}:{key}"))
+
+
+class PaperIngestor:
+    # Validates records and writes them in batches of batch_size, with at most max_in_flight batch writes pending.
+    # add() waits for a write slot when all are busy, which slows reading the body down to the database's pace.
+    # Rows matching the project's dedup index are dropped before they are written; without an index,
+    # only duplicates within the body are caught here and the rest by the primary key.
+    def __init__(
+        self,
+        dal: PaperDAL,
+        project_id: UUID,
+        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        dedup: Optional[DedupIndex] = None,
+    ):
+        self.dal = dal
+        self.project_id = project_id
+        self.batch_size = batch_size or dal.bulk_settings.max_rows
+        self.max_in_flight = max_in_flight or dal.bulk_settings.max_concurrency
+        self.response = IngestPapersResponse(project_id=project_id)
+        self.dedup = dedup if dedup is not None else DedupIndex()
+        self._batch: list[tuple[dict, list[str]]] = []
+        # Pending writes and the batch each one writes.
+        self._in_flight: dict[asyncio.Task, list[tuple[dict, list[str]]]] = {}
+
+    async def add(self, record: RawRecord) -> None:
+        if record.error is not None:
+            self._reject(record.line, record.error)
+            return
+        try:
+            paper = PaperIngestRow.model_validate(record.row)
+        except ValidationError as e:
+            self._reject(record.line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            return
+
+        row = paper.model_dump()
+        keys = paper_keys(row) or [f"title:{paper.title}"]
+        if self.dedup.find(keys) is not None:
+            self.response.duplicates += 1
+            return
+        row_id = paper_id(self.project_id, keys[0])
+        self.dedup.add(row_id, keys)
+        self._batch.append(({"id": row_id, "project_id": str(self.project_id), **row}, keys))
+        if len(self._batch) >= self.batch_size:
+            await self._flush()
+
+    async def finish(self) -> IngestPapersResponse:
+        if self._batch:
+            await self._flush()
+        while self._in_flight:
+            await self._wait_for_write()
+        if self.response.failed:
+            self.response.status = ResponseStatus.DEGRADED
+        return self.response
+
+    # Cancels pending writes, e.g. when the client disconnects mid-stream. Rows that were queued but are not known
+    # to be written are taken out of the dedup index again, so a retry of the same body does not drop them as
+    # duplicates. A cancelled write may still have reached the database; its rows then conflict on their ids.
+    def cancel(self) -> None:
+        unwritten = self._batch
+        self._batch = []
+        for task, batch in self._in_flight.items():
+            if task.done() and not task.cancelled() and task.exception() is None:
+                self._collect(batch, task.result())
+            else:
+                task.cancel()
+                unwritten += batch
+        self._in_flight = {}
+        for row, keys in unwritten:
+            self.dedup.remove(row["id"], keys)
+
+    def _reject(self, line: int, message: str) -> None:
+        self.response.rejected += 1
+        if len(self.response.errors) < MAX_REPORTED_ERRORS:
+            self.response.errors.append(IngestRowError(line=line, message=message))
+
+    async def _flush(self) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        batch = [({**row, "created_at": now}, keys) for row, keys in self._batch]
+        self._batch = []
+        while len(self._in_flight) >= self.max_in_flight:
+            await self._wait_for_write()
+        self._in_flight[asyncio.create_task(self.dal.insert_papers([row for row, _ in batch]))] = batch
+
+    async def _wait_for_write(self) -> None:
+        done, _ = await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            batch = self._in_flight.pop(task)
+            self._collect(batch, task.result())
+
+    def _collect(self, batch: list[tuple[dict, list[str]]], result: BulkWriteResult) -> None:
+        failed = sum(chunk.row_count for chunk in result.failed_chunks)
+        inserted = len(result.rows)
+        self.response.inserted += inserted
+        self.response.failed += failed
+        self.response.duplicates += len(batch) - failed - inserted
+        # Chunks hold consecutive rows of the batch; rows of failed chunks are taken out of the index again.
+        offset = 0
+        for chunk in result.chunks:
+            if not chunk.ok:
+                for row, keys in batch[offset : offset + chunk.row_count]:
+                    self.dedup.remove(row["id"], keys)
+                if len(self.response.write_errors) < MAX_REPORTED_ERRORS:
+                    self.response.write_errors.append(chunk.error)
+            offset += chunk.row_count
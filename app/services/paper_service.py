@@ -0,0 +1,214 @@
+import asyncio
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.exceptions import DatabaseError
+from app.db.pagination import decode_cursor, encode_cursor
+from app.db.papers_dal import PAPER_DEDUP_COLUMNS, PAPER_TEXT_COLUMNS, PaperDAL
+from app.db.projections import ID_ONLY
+from app.models.paper_api_models import (
+    FetchSourcesRequest,
+    FetchSourcesResponse,
+    IngestPapersResponse,
+    ListPapersRequest,
+    ListPapersResponse,
+    NearDuplicateCluster,
+    NearDuplicatePaper,
+    NearDuplicatesRequest,
+    NearDuplicatesResponse,
+    PaperListItem,
+    SourceFetchSummary,
+)
+from app.models.shared import ResponseStatus
+from app.services.errors import InternalServiceError, InvalidRequestError, NotFoundError, ProjectServiceError
+from app.services.minhash import MinHasher
+from app.services.near_duplicates import NearDuplicateIndex, NearDuplicateIndexRegistry
+from app.services.paper_dedup import DedupIndexRegistry
+from app.services.paper_ingestion import IngestFormat, PaperIngestor, RawRecord, parse_csv, parse_ndjson
+from app.sources.base import FetchStats
+from app.sources.registry import SourceRegistry
+from returns.result import Failure, Result, Success
+
+
+class PaperService:
+    # project_dal is used to check the project is visible to the user before writing papers to it.
+    # dedup_indexes and near_duplicates hold per-project indexes shared across requests.
+    # sources holds the search backends project sources are fetched from.
+    def __init__(
+        self,
+        dal: PaperDAL,
+        project_dal: Optional[AsyncProjectDAL] = None,
+        dedup_indexes: Optional[DedupIndexRegistry] = None,
+        near_duplicates: Optional[NearDuplicateIndexRegistry] = None,
+        sources: Optional[SourceRegistry] = None,
+    ):
+        self.dal = dal
+        self.project_dal = project_dal
+        self.dedup_indexes = dedup_indexes
+        self.near_duplicates = near_duplicates
+        self.sources = sources
+
+    async def _project_visible(self, project_id: UUID) -> bool:
+        return self.project_dal is None or await self.project_dal.get_project_by_id(project_id, columns=ID_ONLY) is not None
+
+    async def list_papers(self, request: ListPapersRequest) -> Result[ListPapersResponse, ProjectServiceError]:
+        try:
+            after = decode_cursor(request.cursor) if request.cursor else None
+        except ValueError as e:
+            return Failure(InvalidRequestError(str(e)))
+
+        try:
+            rows, next_keyset = await self.dal.list_papers(project_id=request.project_id, page_size=request.page_size, after=after)
+            return Success(
+                ListPapersResponse(
+                    project_id=request.project_id,
+                    items=[PaperListItem(paper_id=row["id"], title=row["title"], created_at=row["created_at"]) for row in rows],
+                    next_cursor=encode_cursor(next_keyset) if next_keyset else None,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during listing: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during listing: {e}"))
+
+    # Streams papers from an NDJSON or CSV body into the project, writing batches while the body is still arriving.
+    async def ingest_papers(
+        self, project_id: UUID, chunks: AsyncIterator[bytes], ingest_format: IngestFormat
+    ) -> Result[IngestPapersResponse, ProjectServiceError]:
+        ingestor = None
+        try:
+            if not await self._project_visible(project_id):
+                return Success(IngestPapersResponse(project_id=project_id, status=ResponseStatus.NOT_FOUND))
+
+            dedup = None
+            if self.dedup_indexes is not None:
+                dedup = await self.dedup_indexes.get(project_id, lambda: self.dal.iter_papers(project_id, columns=PAPER_DEDUP_COLUMNS))
+
+            ingestor = PaperIngestor(self.dal, project_id, dedup=dedup)
+            records = parse_csv(chunks) if ingest_format == IngestFormat.CSV else parse_ndjson(chunks)
+            async for record in records:
+                await ingestor.add(record)
+            response = await ingestor.finish()
+            if response.inserted and self.near_duplicates is not None:
+                self.near_duplicates.invalidate(project_id)
+            return Success(response)
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during ingestion: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during ingestion: {e}"))
+
+        finally:
+            if ingestor is not None:
+                ingestor.cancel()
+
+    # Fetches every source of the project and streams the results into one ingestor, so papers found by several
+    # sources are written once. Sources run one after another; each backend pages through its results concurrently.
+    async def fetch_sources(self, request: FetchSourcesRequest) -> Result[FetchSourcesResponse, ProjectServiceError]:
+        ingestor = None
+        try:
+            if not await self._project_visible(request.project_id):
+                return Failure(NotFoundError("Project", str(request.project_id)))
+
+            sources = await self.project_dal.get_project_sources(request.project_id)
+            if request.options.source_ids is not None:
+                wanted = {str(source_id) for source_id in request.options.source_ids}
+                unknown = wanted - {source["id"] for source in sources}
+                if unknown:
+                    return Failure(InvalidRequestError(f"Unknown sources: {', '.join(sorted(unknown))}"))
+                sources = [source for source in sources if source["id"] in wanted]
+
+            dedup = None
+            if self.dedup_indexes is not None:
+                dedup = await self.dedup_indexes.get(
+                    request.project_id, lambda: self.dal.iter_papers(request.project_id, columns=PAPER_DEDUP_COLUMNS)
+                )
+            ingestor = PaperIngestor(self.dal, request.project_id, dedup=dedup)
+
+            summaries, record_no = [], 0
+            for source in sources:
+                summary = SourceFetchSummary(source_id=source["id"], backend_name=source["backend_name"], backend_query=source["backend_query"])
+                summaries.append(summary)
+                backend = self.sources.get(source["backend_name"]) if self.sources is not None else None
+                if backend is None:
+                    summary.errors.append(f"Unsupported backend: {source['backend_name']}")
+                    continue
+                stats = FetchStats()
+                try:
+                    async for row in self.sources.fetch(backend, source["backend_query"], stats, force=request.options.force):
+                        record_no += 1
+                        await ingestor.add(RawRecord(line=record_no, row=row))
+                except DatabaseError:
+                    raise
+                # A backend error ends this source only; errors of a page are already reported with the page.
+                except Exception as e:
+                    if not any(error.endswith(f": {e}") for error in stats.errors):
+                        stats.error(f"{type(e).__name__}: {e}")
+                summary.total, summary.fetched, summary.cached, summary.pages = stats.total, stats.records, stats.cached, stats.pages
+                summary.errors = stats.errors
+
+            ingested = await ingestor.finish()
+            if ingested.inserted and self.near_duplicates is not None:
+                self.near_duplicates.invalidate(request.project_id)
+            degraded = ingested.status == ResponseStatus.DEGRADED or any(summary.errors for summary in summaries)
+            return Success(
+                FetchSourcesResponse(
+                    project_id=request.project_id,
+                    sources=summaries,
+                    ingest=ingested,
+                    status=ResponseStatus.DEGRADED if degraded else ResponseStatus.SUCCESS,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error while fetching sources: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error while fetching sources: {e}"))
+
+        finally:
+            if ingestor is not None:
+                ingestor.cancel()
+
+    # Clusters of papers with near-identical title + abstract, found with MinHash LSH instead of pairwise comparison.
+    async def find_near_duplicates(self, request: NearDuplicatesRequest) -> Result[NearDuplicatesResponse, ProjectServiceError]:
+        try:
+            if not await self._project_visible(request.project_id):
+                return Success(
+                    NearDuplicatesResponse(project_id=request.project_id, threshold=request.threshold, status=ResponseStatus.NOT_FOUND)
+                )
+
+            def load():
+                return self.dal.iter_papers(request.project_id, columns=PAPER_TEXT_COLUMNS)
+
+            if self.near_duplicates is not None:
+                index = await self.near_duplicates.get(request.project_id, load)
+            else:
+                index = NearDuplicateIndex(MinHasher())
+                async for rows in load():
+                    await asyncio.to_thread(index.add, rows)
+
+            clusters = await asyncio.to_thread(index.clusters, request.threshold)
+            return Success(
+                NearDuplicatesResponse(
+                    project_id=request.project_id,
+                    threshold=request.threshold,
+                    cluster_count=len(clusters),
+                    clusters=[
+                        NearDuplicateCluster(
+                            papers=[NearDuplicatePaper(paper_id=m.paper_id, title=m.title, similarity=m.similarity) for m in cluster]
+                        )
+                        for cluster in clusters[: request.max_clusters]
+                    ],
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during near-duplicate search: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during near-duplicate search: {e}"))
@@ -0,0 +1,87 @@
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from app.services.cache import CacheBackend, InMemoryCacheBackend
+
+Loader = Callable[[], Awaitable[Optional[dict]]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ProjectCache:
+    # Read-through cache for project rows and extraction configs, keyed by (user id, resource id)
+    # because RLS makes every lookup user specific. Missing rows are cached too (negative caching),
+    # with a shorter TTL. Writes in ProjectService invalidate the entries they affect.
+    def __init__(self, backend: CacheBackend, ttl: float = 30.0, negative_ttl: float = 5.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+
+    # Returns a cache backed by process memory, or None when caching is disabled.
+    @classmethod
+    def from_env(cls) -> Optional["ProjectCache"]:
+        if os.getenv("PROJECT_CACHE_ENABLED", "false").lower() not in ("1", "true", "yes"):
+            return None
+        backend = InMemoryCacheBackend(max_entries=int(os.getenv("PROJECT_CACHE_MAX_ENTRIES", 10_000)))
+        return cls(
+            backend,
+            ttl=float(os.getenv("PROJECT_CACHE_TTL", 30.0)),
+            negative_ttl=float(os.getenv("PROJECT_CACHE_NEGATIVE_TTL", 5.0)),
+        )
+
+    async def get_project(self, user_id: str, project_id: UUID, loader: Loader) -> Optional[dict]:
+        return await self._read_through(self._project_key(user_id, project_id), loader)
+
+    async def get_extraction_config(self, user_id: str, project_id: UUID, loader: Loader) -> Optional[dict]:
+        config = await self._read_through(self._config_key(user_id, project_id), loader)
+        if config is not None:
+            await self.backend.set(self._config_owner_key(user_id, config["id"]), str(project_id), self.ttl)
+        return config
+
+    async def invalidate_project(self, user_id: str, project_id: UUID) -> None:
+        await self.backend.delete(self._project_key(user_id, project_id), self._config_key(user_id, project_id))
+
+    async def invalidate_extraction_config(self, user_id: str, project_id: UUID) -> None:
+        await self.backend.delete(self._config_key(user_id, project_id))
+
+    # Field changes only know the config id; the owning project is found via the mapping stored on read.
+    async def invalidate_extraction_config_by_id(self, user_id: str, config_id: UUID) -> None:
+        owner_key = self._config_owner_key(user_id, config_id)
+        project_id = await self.backend.get(owner_key)
+        if project_id is not None:
+            await self.backend.delete(self._config_key(user_id, project_id), owner_key)
+
+    async def _read_through(self, key: str, loader: Loader) -> Optional[dict]:
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached["row"]
+
+        self.stats.misses += 1
+        row = await loader()
+        await self.backend.set(key, {"row": row}, self.ttl if row is not None else self.negative_ttl)
+        return row
+
+    @staticmethod
+    def _project_key(user_id: str, project_id) -> str:
+        return f"project:{user_id}:{project_id}"
+
+    @staticmethod
+    def _config_key(user_id: str, project_id) -> str:
+        return f"extraction_config:{user_id}:{project_id}"
+
+    @staticmethod
+    def _config_owner_key(user_id: str, config_id) -> str:
+        return f"extraction_config_owner:{user_id}:{config_id}"
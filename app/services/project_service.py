@@ -1,7 +1,10 @@
+from typing import Optional
 from uuid import UUID, uuid4
 
+from app.db.async_projects_dal import AsyncProjectDAL
 from app.db.exceptions import DatabaseError
-from app.db.projects_dal import ProjectDAL
+from app.db.pagination import decode_cursor, encode_cursor
+from app.db.projections import ID_ONLY
 from app.models.project_api_models import (
     AddExtractionFieldsRequest,
     AddExtractionFieldsResponse,
@@ -17,21 +20,72 @@ from app.models.project_api_models import (
     DeleteExtractionFieldsResponse,
     DeleteProjectRequest,
     DeleteProjectResponse,
+    ExtractionConfigItem,
+    ExtractionFieldItem,
     GetProjectRequest,
     GetProjectResponse,
+    GetProjectTreeResponse,
+    ListProjectsRequest,
+    ListProjectsResponse,
+    ProjectListItem,
+    ProjectSourceItem,
 )
 from app.models.shared import ResponseStatus
-from app.services.errors import InternalServiceError, ProjectServiceError
+from app.services.errors import InternalServiceError, InvalidRequestError, ProjectServiceError
+from app.services.project_cache import ProjectCache
+from app.services.single_flight import SingleFlight
 from returns.result import Failure, Result, Success
 
 
 class ProjectService:
-    def __init__(self, dal: ProjectDAL):
+    # user_id scopes shared state (coalesced reads, cache entries) to the caller, since RLS makes results per user.
+    def __init__(
+        self,
+        dal: AsyncProjectDAL,
+        user_id: Optional[str] = None,
+        single_flight: Optional[SingleFlight] = None,
+        cache: Optional[ProjectCache] = None,
+    ):
         self.dal = dal
+        self.user_id = user_id
+        self.single_flight = single_flight
+        self.cache = cache if user_id is not None else None
+
+    # Reads a project through the cache, sharing one DB call between concurrent identical reads of the same user.
+    async def _read_project(self, project_id: UUID) -> Optional[dict]:
+        async def load():
+            if self.single_flight is None or self.user_id is None:
+                return await self.dal.get_project_by_id(project_id=project_id)
+            key = ("project", self.user_id, str(project_id))
+            return await self.single_flight.do(key, lambda: self.dal.get_project_by_id(project_id=project_id))
+
+        if self.cache is None:
+            return await load()
+        return await self.cache.get_project(self.user_id, project_id, load)
+
+    async def _read_extraction_config(self, project_id: UUID) -> Optional[dict]:
+        def load():
+            return self.dal.get_extraction_config_by_project(project_id=project_id, columns=ID_ONLY)
+
+        if self.cache is None:
+            return await load()
+        return await self.cache.get_extraction_config(self.user_id, project_id, load)
+
+    async def _invalidate_project(self, project_id: UUID) -> None:
+        if self.cache is not None:
+            await self.cache.invalidate_project(self.user_id, project_id)
+
+    async def _invalidate_extraction_config(self, project_id: Optional[UUID] = None, config_id: Optional[UUID] = None) -> None:
+        if self.cache is None:
+            return
+        if project_id is not None:
+            await self.cache.invalidate_extraction_config(self.user_id, project_id)
+        if config_id is not None:
+            await self.cache.invalidate_extraction_config_by_id(self.user_id, config_id)
 
     async def create_project(self, request: CreateProjectRequest) -> Result[CreateProjectResponse, ProjectServiceError]:
         try:
-            result = self.dal.create_project(description=request.description)
+            result = await self.dal.create_project(description=request.description)
 
             if not result:
                 return Success(
@@ -54,7 +108,7 @@ class ProjectService:
 
     async def get_project(self, request: GetProjectRequest) -> Result[GetProjectResponse, ProjectServiceError]:
         try:
-            result = self.dal.get_project_by_id(project_id=request.project_id)
+            result = await self._read_project(request.project_id)
 
             if result is None:
                 return Success(
@@ -73,9 +127,46 @@ class ProjectService:
         except Exception as e:
             return Failure(InternalServiceError(f"Unhandled error during fetch: {e}"))
 
+    async def get_project_tree(self, request: GetProjectRequest) -> Result[GetProjectTreeResponse, ProjectServiceError]:
+        try:
+            tree = await self.dal.get_project_tree(project_id=request.project_id)
+
+            if tree is None:
+                return Success(GetProjectTreeResponse(project_id=request.project_id, status=ResponseStatus.NOT_FOUND))
+
+            return Success(_project_tree_response(tree))
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during tree fetch: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during tree fetch: {e}"))
+
+    async def list_projects(self, request: ListProjectsRequest) -> Result[ListProjectsResponse, ProjectServiceError]:
+        try:
+            after = decode_cursor(request.cursor) if request.cursor else None
+        except ValueError as e:
+            return Failure(InvalidRequestError(str(e)))
+
+        try:
+            rows, next_keyset = await self.dal.list_projects(page_size=request.page_size, after=after)
+            return Success(
+                ListProjectsResponse(
+                    items=[ProjectListItem(project_id=row["id"], description=row["description"], created_at=row["created_at"]) for row in rows],
+                    next_cursor=encode_cursor(next_keyset) if next_keyset else None,
+                )
+            )
+
+        except DatabaseError as e:
+            return Failure(InternalServiceError(f"Database error during listing: {e}"))
+
+        except Exception as e:
+            return Failure(InternalServiceError(f"Unhandled error during listing: {e}"))
+
     async def delete_project(self, request: DeleteProjectRequest) -> Result[DeleteProjectResponse, ProjectServiceError]:
         try:
-            success = self.dal.delete_project(project_id=request.project_id)
+            success = await self.dal.delete_project(project_id=request.project_id)
+            await self._invalidate_project(request.project_id)
 
             if success:
                 return Success(DeleteProjectResponse(status=ResponseStatus.SUCCESS))
@@ -90,15 +181,6 @@ class ProjectService:
 
     async def create_project_sources(self, request: CreateProjectSourcesRequest) -> Result[CreateProjectSourcesResponse, ProjectServiceError]:
         try:
-            # Step 1: Verify project exists
-            project = self.dal.get_project_by_id(project_id=request.project_id)
-            if project is None:
-                return Success(CreateProjectSourcesResponse(project_id=request.project_id, source_count=0, status=ResponseStatus.NOT_FOUND))
-
-            # Step 2: Delete existing sources
-            self.dal.delete_project_sources(project_id=request.project_id)
-
-            # Step 3: Insert new sources
             sources_payload = [
                 {
                     "id": str(uuid4()),
@@ -109,7 +191,11 @@ class ProjectService:
                 for source in request.sources
             ]
 
-            self.dal.insert_project_sources(sources_payload)
+            # Existence check, delete and insert run as a single server-side transaction.
+            inserted = await self.dal.replace_project_sources(project_id=request.project_id, source_rows=sources_payload)
+            if inserted is None:
+                return Success(CreateProjectSourcesResponse(project_id=request.project_id, source_count=0, status=ResponseStatus.NOT_FOUND))
+            await self._invalidate_project(request.project_id)
 
             return Success(
                 CreateProjectSourcesResponse(project_id=request.project_id, source_count=len(sources_payload), status=ResponseStatus.SUCCESS)
@@ -126,15 +212,16 @@ class ProjectService:
     ) -> Result[CreateExtractionConfigResponse, ProjectServiceError]:
         try:
             # Check if config already exists (optional if enforced in DB)
-            existing = self.dal.client.table("extraction_configs").select("*").eq("project_id", str(request.project_id)).limit(1).execute()
-            if existing.data:
+            existing = await self._read_extraction_config(request.project_id)
+            if existing is not None:
                 return Failure(ProjectServiceError("Extraction config already exists for this project."))
 
-            config = self.dal.create_extraction_config(project_id=request.project_id)
+            config = await self.dal.create_extraction_config(project_id=request.project_id)
+            await self._invalidate_extraction_config(project_id=request.project_id)
 
             field_dicts = [{"field_name": f.field_name, "description": f.description} for f in request.fields]
 
-            self.dal.insert_extraction_fields(config_id=UUID(config["id"]), fields=field_dicts)
+            await self.dal.insert_extraction_fields(config_id=UUID(config["id"]), fields=field_dicts)
 
             return Success(
                 CreateExtractionConfigResponse(config_id=UUID(config["id"]), field_count=len(field_dicts), status=ResponseStatus.SUCCESS)
@@ -149,7 +236,8 @@ class ProjectService:
         try:
             field_dicts = [{"field_name": f.field_name, "description": f.description} for f in request.fields]
 
-            self.dal.insert_extraction_fields(config_id=config_id, fields=field_dicts)
+            await self.dal.insert_extraction_fields(config_id=config_id, fields=field_dicts)
+            await self._invalidate_extraction_config(config_id=config_id)
 
             return Success(AddExtractionFieldsResponse(status=ResponseStatus.SUCCESS))
 
@@ -161,12 +249,13 @@ class ProjectService:
     ) -> Result[DeleteExtractionConfigResponse, ProjectServiceError]:
         try:
             # Get config ID by project_id
-            response = self.dal.client.table("extraction_configs").select("id").eq("project_id", str(request.project_id)).limit(1).execute()
-            if not response.data:
+            config = await self._read_extraction_config(request.project_id)
+            if config is None:
                 return Success(DeleteExtractionConfigResponse(status=ResponseStatus.NOT_FOUND))
 
-            config_id = UUID(response.data[0]["id"])
-            self.dal.delete_extraction_config(config_id=config_id)
+            config_id = UUID(config["id"])
+            await self.dal.delete_extraction_config(config_id=config_id)
+            await self._invalidate_extraction_config(project_id=request.project_id, config_id=config_id)
 
             return Success(DeleteExtractionConfigResponse(status=ResponseStatus.SUCCESS))
 
@@ -174,10 +263,36 @@ class ProjectService:
             return Failure(InternalServiceError(f"Error deleting extraction config: {e}"))
 
     async def delete_extraction_fields(
-        self, request: DeleteExtractionFieldsRequest
+        self, request: DeleteExtractionFieldsRequest, config_id: Optional[UUID] = None
     ) -> Result[DeleteExtractionFieldsRequest, ProjectServiceError]:
         try:
-            self.dal.delete_extraction_fields(field_ids=request.field_ids)
+            await self.dal.delete_extraction_fields(field_ids=request.field_ids)
+            await self._invalidate_extraction_config(config_id=config_id)
             return Success(DeleteExtractionFieldsResponse(status=ResponseStatus.SUCCESS))
         except Exception as e:
             return Failure(InternalServiceError(f"Error deleting extraction fields: {e}"))
+
+
+# Rows come from our own database, so the response is assembled with model_construct instead of re-validating every row.
+def _project_tree_response(row: dict) -> GetProjectTreeResponse:
+    # extraction_configs embeds as an object when project_id is unique, otherwise as a list.
+    config_row = row.get("extraction_configs")
+    if isinstance(config_row, list):
+        config_row = config_row[0] if config_row else None
+
+    config = None
+    if config_row is not None:
+        config = ExtractionConfigItem.model_construct(
+            id=config_row["id"],
+            created_at=config_row.get("created_at"),
+            fields=[ExtractionFieldItem.model_construct(**field) for field in config_row.get("extraction_fields") or []],
+        )
+
+    return GetProjectTreeResponse.model_construct(
+        project_id=row["id"],
+        description=row.get("description"),
+        created_at=row.get("created_at"),
+        sources=[ProjectSourceItem.model_construct(**source) for source in row.get("project_sources") or []],
+        extraction_config=config,
+        status=ResponseStatus.SUCCESS,
+    )
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+
+class TokenBucket:
+    # Allows up to capacity units at once, refilled continuously at rate units per second.
+    # Waiters are served in arrival order, so a large request is not starved by a stream of small ones.
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    # A per-minute limit with a full minute of burst, the way LLM and search APIs state their quotas.
+    @classmethod
+    def per_minute(cls, limit: float, **kwargs) -> "TokenBucket":
+        return cls(rate=limit / 60.0, capacity=limit, **kwargs)
+
+    # Waits until amount units are available and takes them. Amounts above capacity wait for a full bucket.
+    async def acquire(self, amount: float = 1.0) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await self.sleep((amount - self._tokens) / self.rate)
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    # Request and token limits applied together, e.g. an LLM provider's requests and tokens per minute.
+    # Either limit may be None for no limit.
+    def __init__(self, requests: Optional[TokenBucket] = None, tokens: Optional[TokenBucket] = None):
+        self.requests = requests
+        self.tokens = tokens
+
+    @classmethod
+    def per_minute(cls, requests: Optional[float] = None, tokens: Optional[float] = None) -> "RateLimiter":
+        return cls(
+            requests=TokenBucket.per_minute(requests) if requests else None,
+            tokens=TokenBucket.per_minute(tokens) if tokens else None,
+        )
+
+    async def acquire(self, tokens: float = 0.0) -> None:
+        if self.requests is not None:
+            await self.requests.acquire(1.0)
+        if self.tokens is not None and tokens:
+            await self.tokens.acquire(tokens)
@@ -0,0 +1,185 @@
+from array import array
+from typing import Optional
+
+import numpy as np
+
+# Array-backed view of a project's extraction results, for aggregates over the whole project.
+# Paper, field and filter ids are dictionary-encoded to dense int32 codes. Extracted values are one UTF-8 buffer
+# with an offsets array, normalized numbers (see metric_normalization.py) a float64 array with NaN for missing,
+# and filter results are two bitsets per filter (evaluated, passed) over paper codes.
+# A value costs about 30 bytes plus its text, instead of a dict per row, and aggregates are numpy reductions.
+
+# Number of set bits of every byte value.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def _encode(codes: dict[str, int], key: str) -> int:
+    code = codes.get(key)
+    if code is None:
+        code = codes[key] = len(codes)
+    return code
+
+
+class ResultMatrix:
+    def __init__(
+        self,
+        paper_ids: list[str],
+        field_ids: list[str],
+        filter_ids: list[str],
+        units: list[str],
+        value_papers: np.ndarray,
+        value_fields: np.ndarray,
+        value_offsets: np.ndarray,
+        value_buffer: bytes,
+        value_numbers: np.ndarray,
+        value_units: np.ndarray,
+        evaluated: np.ndarray,
+        passed: np.ndarray,
+    ):
+        self.paper_ids = paper_ids
+        self.field_ids = field_ids
+        self.filter_ids = filter_ids
+        self.units = units
+        self.value_papers = value_papers
+        self.value_fields = value_fields
+        self.value_offsets = value_offsets
+        self.value_buffer = value_buffer
+        self.value_numbers = value_numbers
+        self.value_units = value_units
+        self.evaluated = evaluated
+        self.passed = passed
+
+    @property
+    def paper_count(self) -> int:
+        return len(self.paper_ids)
+
+    @property
+    def value_count(self) -> int:
+        return len(self.value_papers)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.value_papers, self.value_fields, self.value_offsets, self.value_numbers, self.value_units, self.evaluated, self.passed)
+        return sum(a.nbytes for a in arrays) + len(self.value_buffer)
+
+    def value(self, i: int) -> str:
+        return self.value_buffer[self.value_offsets[i] : self.value_offsets[i + 1]].decode()
+
+    def field_code(self, field_id: str) -> Optional[int]:
+        try:
+            return self.field_ids.index(field_id)
+        except ValueError:
+            return None
+
+    # Values extracted for one field, in load order.
+    def field_values(self, field_id: str) -> list[str]:
+        code = self.field_code(field_id)
+        if code is None:
+            return []
+        return [self.value(i) for i in np.flatnonzero(self.value_fields == code)]
+
+    # Number of values per field code, empty values included.
+    def value_counts(self) -> np.ndarray:
+        return np.bincount(self.value_fields, minlength=len(self.field_ids))
+
+    # Number of papers with at least one non-empty value, per field code.
+    def papers_with_value(self) -> np.ndarray:
+        filled = np.diff(self.value_offsets) > 0
+        pairs = np.unique(self.value_fields[filled].astype(np.int64) * max(self.paper_count, 1) + self.value_papers[filled])
+        return np.bincount(pairs // max(self.paper_count, 1), minlength=len(self.field_ids))
+
+    # Share of the project's papers with a non-empty value, per field code.
+    def completeness(self) -> np.ndarray:
+        if not self.paper_count:
+            return np.zeros(len(self.field_ids))
+        return self.papers_with_value() / self.paper_count
+
+    # Number of papers each filter was evaluated on and passed, per filter code.
+    def filter_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        return _POPCOUNT[self.evaluated].sum(axis=1), _POPCOUNT[self.passed].sum(axis=1)
+
+    # Papers a filter was evaluated on, and papers it passed, as boolean masks over paper codes.
+    def filter_masks(self, code: int) -> tuple[np.ndarray, np.ndarray]:
+        def unpack(bits: np.ndarray) -> np.ndarray:
+            return np.unpackbits(bits[code], count=self.paper_count).astype(bool)
+
+        return unpack(self.evaluated), unpack(self.passed)
+
+    # Indices of the values of a field that carry a number, keeping the first such value of each paper.
+    def numeric_values(self, field_id: str) -> np.ndarray:
+        code = self.field_code(field_id)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        indices = np.flatnonzero((self.value_fields == code) & ~np.isnan(self.value_numbers))
+        _, first = np.unique(self.value_papers[indices], return_index=True)
+        return indices[np.sort(first)]
+
+
+class ResultMatrixBuilder:
+    # Accumulates pages of paper rows with embedded extracted_fields and paper_filter_results
+    # (see ExtractionResultsDAL.iter_paper_results) into growable typed arrays, so no page is kept after it is added.
+    def __init__(self):
+        self._papers: dict[str, int] = {}
+        self._fields: dict[str, int] = {}
+        self._filters: dict[str, int] = {}
+        self._units: dict[str, int] = {}
+        self._value_papers = array("i")
+        self._value_fields = array("i")
+        self._value_ends = array("q")
+        self._buffer = bytearray()
+        self._value_numbers = array("d")
+        self._value_units = array("h")
+        self._result_papers = array("i")
+        self._result_filters = array("i")
+        self._result_passed = array("b")
+
+    def add_papers(self, rows: list[dict]) -> None:
+        for row in rows:
+            paper = _encode(self._papers, row["id"])
+            for value in row.get("extracted_fields") or []:
+                self._add_value(paper, value)
+            for result in row.get("paper_filter_results") or []:
+                # Filters skipped after an earlier filter failed the paper were not evaluated.
+                if result.get("passed") is None:
+                    continue
+                self._result_papers.append(paper)
+                self._result_filters.append(_encode(self._filters, result["filter_id"]))
+                self._result_passed.append(bool(result.get("passed")))
+
+    # Adds extracted_fields rows that name their paper_id, e.g. the values of one field loaded on their own after
+    # the papers (see ExtractionResultsService.load_field_matrix).
+    def add_values(self, rows: list[dict]) -> None:
+        for value in rows:
+            self._add_value(_encode(self._papers, value["paper_id"]), value)
+
+    def _add_value(self, paper: int, value: dict) -> None:
+        self._value_papers.append(paper)
+        self._value_fields.append(_encode(self._fields, value["extraction_field_id"]))
+        self._buffer += (value.get("field_value") or "").encode()
+        self._value_ends.append(len(self._buffer))
+        number = value.get("numeric_value")
+        self._value_numbers.append(number if number is not None else np.nan)
+        unit = value.get("numeric_unit")
+        self._value_units.append(_encode(self._units, unit) if unit is not None else -1)
+
+    def build(self) -> ResultMatrix:
+        papers = np.frombuffer(self._result_papers, dtype=np.int32)
+        filters = np.frombuffer(self._result_filters, dtype=np.int32)
+        evaluated = np.zeros((len(self._filters), len(self._papers)), dtype=bool)
+        passed = np.zeros_like(evaluated)
+        evaluated[filters, papers] = True
+        passed[filters, papers] = np.frombuffer(self._result_passed, dtype=np.int8).astype(bool)
+        return ResultMatrix(
+            paper_ids=list(self._papers),
+            field_ids=list(self._fields),
+            filter_ids=list(self._filters),
+            units=list(self._units),
+            value_papers=np.frombuffer(self._value_papers, dtype=np.int32).copy(),
+            value_fields=np.frombuffer(self._value_fields, dtype=np.int32).copy(),
+            value_offsets=np.concatenate(([0], np.frombuffer(self._value_ends, dtype=np.int64))),
+            value_buffer=bytes(self._buffer),
+            value_numbers=np.frombuffer(self._value_numbers, dtype=np.float64).copy(),
+            value_units=np.frombuffer(self._value_units, dtype=np.int16).copy(),
+            evaluated=np.packbits(evaluated, axis=1),
+            passed=np.packbits(passed, axis=1),
+        )
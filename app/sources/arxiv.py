@@ -0,0 +1,65 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+from xml.etree.ElementTree import Element
+
+import httpx
+from app.services.rate_limiter import TokenBucket
+from app.sources.base import FetchStats, SourceBackend, element_text, local_name
+
+# arXiv API (https://info.arxiv.org/help/api/user-manual.html): Atom feeds, paged with start and max_results.
+# arXiv asks clients for at most one request every three seconds.
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ARXIV = "{http://arxiv.org/schemas/atom}"
+_ARXIV_ID = re.compile(r"arxiv\.org/abs/(.+?)(?:v\d+)?$")
+
+
+class ArxivBackend(SourceBackend):
+    name = "arxiv"
+    # Papers are announced up to a few days after submission, which is the date arXiv searches by.
+    refresh_overlap = timedelta(days=7)
+
+    def __init__(
+        self, http_client: httpx.AsyncClient, url: str = ARXIV_API_URL, limiter: Optional[TokenBucket] = None, page_size: int = 500, **kwargs
+    ):
+        super().__init__(http_client, limiter or TokenBucket(rate=1 / 3, capacity=1), page_size, **kwargs)
+        self.url = url
+
+    # The first page tells the total number of results; the remaining pages are then fetched concurrently.
+    # Results are sorted by submission date, oldest first, so pages stay stable while new papers are added.
+    async def fetch(self, query: str, stats: FetchStats, since: Optional[datetime] = None) -> AsyncIterator[dict]:
+        if since is not None:
+            query = f"({query}) AND submittedDate:[{since.astimezone(timezone.utc):%Y%m%d%H%M} TO {datetime.now(timezone.utc):%Y%m%d%H%M}]"
+        async for record in self.gather_pages([0], lambda start: self._page(query, start, stats), stats):
+            yield record
+        if stats.total is None:
+            return
+        starts = list(range(self.page_size, min(stats.total, self.max_results), self.page_size))
+        async for record in self.gather_pages(starts, lambda start: self._page(query, start, stats), stats):
+            yield record
+
+    async def _page(self, query: str, start: int, stats: FetchStats) -> AsyncIterator[dict]:
+        params = {
+            "search_query": query,
+            "start": start,
+            "max_results": min(self.page_size, self.max_results - start),
+            "sortBy": "submittedDate",
+            "sortOrder": "ascending",
+        }
+        async for element in self.stream_xml(self.url, params, {"totalResults", "entry"}):
+            if local_name(element) == "totalResults":
+                stats.total = int(element.text or 0)
+            else:
+                yield _record(element)
+
+
+def _record(entry: Element) -> dict:
+    match = _ARXIV_ID.search(entry.findtext(f"{_ATOM}id") or "")
+    return {
+        "title": element_text(entry.find(f"{_ATOM}title")),
+        "abstract": element_text(entry.find(f"{_ATOM}summary")),
+        "arxiv_id": match.group(1) if match else None,
+        "doi": element_text(entry.find(f"{_ARXIV}doi")),
+    }
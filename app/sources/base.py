@@ -0,0 +1,161 @@
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import httpx
+from app.services.rate_limiter import TokenBucket
+
+# Fetchers for the search backends named in project_sources. A backend turns a query into paper records shaped like
+# PaperIngestRow (title, abstract, doi, pmid, arxiv_id), which are fed to the bulk ingestion path as they arrive.
+# Result pages are requested by up to page_concurrency tasks at once, within the backend's rate limit, and
+# responses are parsed while they download, so a page is never held as one document.
+
+MAX_REPORTED_ERRORS = 20
+
+# Status codes worth retrying: rate limited, or a transient server error.
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+_DONE = object()
+
+
+@dataclass
+class FetchStats:
+    total: Optional[int] = None
+    pages: int = 0
+    records: int = 0
+    cached: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def error(self, message: str) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+
+def local_name(element: Element) -> str:
+    return element.tag.rsplit("}", 1)[-1]
+
+
+def element_text(element: Optional[Element]) -> Optional[str]:
+    if element is None:
+        return None
+    text = " ".join("".join(element.itertext()).split())
+    return text or None
+
+
+class SourceBackend(ABC):
+    # name is matched case-insensitively against project_sources.backend_name.
+    name: str
+    # How far before the last fetch incremental refreshes start, covering records dated before they became searchable.
+    refresh_overlap: timedelta
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        limiter: TokenBucket,
+        page_size: int,
+        page_concurrency: int = 4,
+        max_results: int = 50_000,
+        retries: int = 3,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.http_client = http_client
+        self.limiter = limiter
+        self.page_size = page_size
+        self.page_concurrency = page_concurrency
+        self.max_results = max_results
+        self.retries = retries
+        self.sleep = sleep
+
+    # Yields the records of a query, at most max_results, or with since only those added to the backend since then.
+    # Pages that still fail after retries are reported in stats and skipped; other errors (e.g. an invalid query) are raised.
+    @abstractmethod
+    def fetch(self, query: str, stats: FetchStats, since: Optional[datetime] = None) -> AsyncIterator[dict]: ...
+
+    # Yields the elements with the given local names of a streamed XML response, clearing each after use.
+    async def stream_xml(self, url: str, params: dict, tags: set[str]) -> AsyncIterator[Element]:
+        await self.limiter.acquire()
+        async with self.http_client.stream("GET", url, params=params) as response:
+            response.raise_for_status()
+            parser = XMLPullParser(events=("end",))
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if local_name(element) in tags:
+                        yield element
+                        element.clear()
+            parser.close()
+
+    async def get_json(self, url: str, params: dict) -> dict:
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire()
+            try:
+                response = await self.http_client.get(url, params=params)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                if attempt == self.retries or not _retryable(e):
+                    raise
+                await self.sleep(2**attempt)
+
+    # Runs page(start) for every start, page_concurrency at a time, and yields records as any page produces them.
+    # A page that fails is retried from its start; records it yielded before failing are sent again, which
+    # ingestion drops as duplicates. Any other error of a page (e.g. a response the parser does not expect) is
+    # reported in stats and raised here once the records queued before it are yielded.
+    async def gather_pages(self, starts: list[int], page: Callable[[int], AsyncIterator[dict]], stats: FetchStats) -> AsyncIterator[dict]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.page_size)
+        pending = iter(starts)
+
+        # Always ends with _DONE or the error it stopped on, so the consumer never waits on a worker that is gone.
+        # Only cancellation skips that, and the consumer is the one cancelling.
+        async def worker() -> None:
+            start = None
+            try:
+                for start in pending:
+                    await self._page_with_retries(start, page, queue, stats)
+            except Exception as e:
+                stats.error(f"page at {start}: {e}")
+                await queue.put(_Failed(e))
+                return
+            await queue.put(_DONE)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.page_concurrency, len(starts)))]
+        try:
+            finished = 0
+            while finished < len(workers):
+                item = await queue.get()
+                if isinstance(item, _Failed):
+                    raise item.error
+                if item is _DONE:
+                    finished += 1
+                    continue
+                stats.records += 1
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def _page_with_retries(self, start: int, page: Callable[[int], AsyncIterator[dict]], queue: asyncio.Queue, stats: FetchStats) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                async for record in page(start):
+                    await queue.put(record)
+                stats.pages += 1
+                return
+            except (httpx.HTTPError, ParseError) as e:
+                if attempt == self.retries or not _retryable(e):
+                    stats.error(f"page at {start}: {e}")
+                    return
+                await self.sleep(2**attempt)
+
+
+@dataclass(frozen=True)
+class _Failed:
+    error: Exception
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in _RETRY_STATUS
+    return isinstance(error, httpx.TransportError)
@@ -0,0 +1,276 @@
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Optional
+
+from app.services.project_cache import CacheStats
+from app.sources.base import FetchStats, SourceBackend
+
+# Persistent cache of source backend results, so fetching a project's sources again does not download them again.
+# A query's records are stored in pages of up to page_size records, each a gzip-compressed JSON lines file under
+# directory/pages, indexed by (backend, normalized query, page) in directory/index.db.
+# Within ttl a query is served from its pages alone. After that it is refreshed incrementally: the backend is only
+# asked for records added since the last fetch (less the backend's refresh_overlap), and the new ones become more pages.
+
+_SCHEMA = """
+create table if not exists queries (
+    backend text not null,
+    query text not null,
+    total integer,
+    pages integer not null,
+    size integer not null,
+    fetched_at real not null,
+    used_at real not null,
+    primary key (backend, query)
+);
+create table if not exists pages (
+    backend text not null,
+    query text not null,
+    page integer not null,
+    path text not null,
+    records integer not null,
+    size integer not null,
+    primary key (backend, query, page)
+);
+create index if not exists queries_used_at_idx on queries (used_at);
+"""
+
+
+# Queries differing only in whitespace are the same search on both backends; case is kept, since boolean operators
+# must be upper case there.
+def normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
+
+# Identifies a record within a backend, to drop records an overlapping refresh fetches again.
+# None for a record without identifiers, which cannot be matched and is always kept.
+def record_key(record: dict) -> Optional[tuple]:
+    key = (record.get("arxiv_id"), record.get("pmid"), record.get("doi"))
+    return key if any(key) else None
+
+
+@dataclass(frozen=True)
+class CachedQuery:
+    total: Optional[int]
+    pages: int
+    fetched_at: float
+
+
+@dataclass(frozen=True)
+class PageFile:
+    path: str
+    records: int
+    size: int
+
+
+class SourceCache:
+    # The index and page files are accessed blocking; fetch runs them through asyncio.to_thread.
+    # Queries are evicted least recently used first, with all their pages, once the page files exceed max_bytes.
+    # stats counts queries: a hit is one answered without asking the backend, incremental refreshes are counted
+    # in refreshes and full fetches are misses.
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: float = 24 * 3600,
+        max_bytes: int = 1024 * 1024 * 1024,
+        page_size: int = 500,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.page_size = page_size
+        self.clock = clock
+        self.stats = CacheStats()
+        self.refreshes = 0
+        self.evictions = 0
+        os.makedirs(os.path.join(directory, "pages"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.executescript(_SCHEMA)
+        self._size = self._db.execute("select coalesce(sum(size), 0) from pages").fetchone()[0]
+
+    # Returns a cache in SOURCE_CACHE_DIR, or None when SOURCE_CACHE_MAX_MB is 0.
+    @classmethod
+    def from_env(cls) -> Optional["SourceCache"]:
+        max_mb = float(os.getenv("SOURCE_CACHE_MAX_MB", 1024))
+        if max_mb <= 0:
+            return None
+        return cls(
+            os.getenv("SOURCE_CACHE_DIR", "source_cache"),
+            ttl_seconds=float(os.getenv("SOURCE_CACHE_TTL_HOURS", 24)) * 3600,
+            max_bytes=int(max_mb * 1024 * 1024),
+        )
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    # Yields the query's records like backend.fetch, from the cache where possible. Cached pages come first; a stale
+    # query then continues with the records added since its last fetch. force fetches everything from the backend
+    # and replaces the cached pages. Pages are indexed only once the backend was read to the end without errors,
+    # so an interrupted or partial fetch leaves the cache as it was.
+    async def fetch(self, backend: SourceBackend, query: str, stats: FetchStats, force: bool = False) -> AsyncIterator[dict]:
+        normalized = normalize_query(query)
+        cached = None if force else await asyncio.to_thread(self.lookup, backend.name, normalized)
+        seen = set()
+        if cached is not None:
+            stats.total = cached.total
+            for page in range(cached.pages):
+                for record in await asyncio.to_thread(self.read_page, backend.name, normalized, page):
+                    key = record_key(record)
+                    if key is not None:
+                        seen.add(key)
+                    stats.cached += 1
+                    stats.records += 1
+                    yield record
+            if self.clock() - cached.fetched_at < self.ttl_seconds:
+                self.stats.hits += 1
+                return
+
+        fetched_at = self.clock()
+        since = datetime.fromtimestamp(cached.fetched_at, timezone.utc) - backend.refresh_overlap if cached is not None else None
+        fetch_stats = FetchStats()
+        written, buffer, added = [], [], 0
+        try:
+            async for record in backend.fetch(query, fetch_stats, since=since):
+                key = record_key(record)
+                if key is not None and key in seen:
+                    continue
+                buffer.append(record)
+                added += 1
+                stats.records += 1
+                if len(buffer) >= self.page_size:
+                    written.append(await asyncio.to_thread(self.write_page, buffer))
+                    buffer = []
+                yield record
+            if buffer:
+                written.append(await asyncio.to_thread(self.write_page, buffer))
+        except BaseException:
+            self.discard(written)
+            raise
+        finally:
+            stats.pages += fetch_stats.pages
+            for error in fetch_stats.errors:
+                stats.error(error)
+
+        if cached is None:
+            self.stats.misses += 1
+            stats.total = fetch_stats.total
+        else:
+            self.refreshes += 1
+            stats.total = (cached.total or 0) + added
+        if fetch_stats.errors:
+            self.discard(written)
+            return
+        await asyncio.to_thread(self.commit, backend.name, normalized, cached, written, stats.total, fetched_at)
+
+    def lookup(self, backend: str, query: str) -> Optional[CachedQuery]:
+        with self._lock:
+            row = self._db.execute("select total, pages, fetched_at from queries where backend = ? and query = ?", (backend, query)).fetchone()
+            if row is not None:
+                self._db.execute("update queries set used_at = ? where backend = ? and query = ?", (self.clock(), backend, query))
+        return CachedQuery(*row) if row else None
+
+    def read_page(self, backend: str, query: str, page: int) -> list[dict]:
+        with self._lock:
+            row = self._db.execute("select path from pages where backend = ? and query = ? and page = ?", (backend, query, page)).fetchone()
+        if row is None:
+            return []
+        with gzip.open(os.path.join(self.directory, row[0]), "rt", encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    # Writes records to a new page file, which only becomes part of a query once commit indexes it.
+    def write_page(self, records: list[dict]) -> PageFile:
+        name = uuid.uuid4().hex
+        path = os.path.join("pages", name[:2], f"{name}.jsonl.gz")
+        os.makedirs(os.path.join(self.directory, "pages", name[:2]), exist_ok=True)
+        with gzip.open(os.path.join(self.directory, path), "wt", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")))
+                file.write("\n")
+        return PageFile(path=path, records=len(records), size=os.path.getsize(os.path.join(self.directory, path)))
+
+    # Indexes written pages: after a refresh of base they are appended to its pages, otherwise they replace the query's
+    # pages. A refresh whose base has changed meanwhile (another fetch of the query finished first) is dropped.
+    def commit(
+        self, backend: str, query: str, base: Optional[CachedQuery], written: list[PageFile], total: Optional[int], fetched_at: float
+    ) -> None:
+        removed = []
+        with self._lock, self._transaction():
+            current = self._db.execute("select pages, fetched_at from queries where backend = ? and query = ?", (backend, query)).fetchone()
+            if base is not None and current != (base.pages, base.fetched_at):
+                removed = written
+            else:
+                first = 0
+                if base is None:
+                    removed = self._delete_query(backend, query)
+                else:
+                    first = base.pages
+                self._db.executemany(
+                    "insert into pages (backend, query, page, path, records, size) values (?, ?, ?, ?, ?, ?)",
+                    [(backend, query, first + i, page.path, page.records, page.size) for i, page in enumerate(written)],
+                )
+                added = sum(page.size for page in written)
+                self._db.execute(
+                    """
+                    insert into queries (backend, query, total, pages, size, fetched_at, used_at) values (?, ?, ?, ?, ?, ?, ?)
+                    on conflict (backend, query) do update set
+                        total = excluded.total, pages = excluded.pages, size = size + excluded.size, fetched_at = excluded.fetched_at
+                    """,
+                    (backend, query, total, first + len(written), added, fetched_at, self.clock()),
+                )
+                self._size += added
+            if self._size > self.max_bytes:
+                removed += self._evict()
+        self.discard(removed)
+
+    def discard(self, pages: list[PageFile]) -> None:
+        for page in pages:
+            try:
+                os.remove(os.path.join(self.directory, page.path))
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _delete_query(self, backend: str, query: str) -> list[PageFile]:
+        pages = [
+            PageFile(*row)
+            for row in self._db.execute("select path, records, size from pages where backend = ? and query = ?", (backend, query)).fetchall()
+        ]
+        self._db.execute("delete from pages where backend = ? and query = ?", (backend, query))
+        self._db.execute("delete from queries where backend = ? and query = ?", (backend, query))
+        self._size -= sum(page.size for page in pages)
+        return pages
+
+    # Frees down to 90% of max_bytes, so eviction does not run again on every fetch once the cache is full.
+    def _evict(self) -> list[PageFile]:
+        target = self.max_bytes * 0.9
+        removed = []
+        for backend, query in self._db.execute("select backend, query from queries order by used_at").fetchall():
+            if self._size <= target:
+                break
+            removed += self._delete_query(backend, query)
+            self.evictions += 1
+        return removed
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("begin")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("rollback")
+            raise
+        self._db.execute("commit")
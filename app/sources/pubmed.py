@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+from xml.etree.ElementTree import Element
+
+import httpx
+from app.services.rate_limiter import TokenBucket
+from app.sources.base import FetchStats, SourceBackend, element_text
+
+# PubMed through NCBI E-utilities (https://www.ncbi.nlm.nih.gov/books/NBK25499/): esearch stores the query's result
+# set on the history server, then efetch pages through it as PubmedArticle XML.
+# NCBI allows three requests per second, or ten with an API key.
+PUBMED_EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+
+class PubMedBackend(SourceBackend):
+    name = "pubmed"
+    # Entrez dates are whole days, so a refresh repeats the day of the last fetch.
+    refresh_overlap = timedelta(days=1)
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str = PUBMED_EUTILS_URL,
+        api_key: Optional[str] = None,
+        limiter: Optional[TokenBucket] = None,
+        page_size: int = 500,
+        **kwargs,
+    ):
+        per_second = 10 if api_key else 3
+        super().__init__(http_client, limiter or TokenBucket(rate=per_second, capacity=per_second), page_size, **kwargs)
+        self.url = url.rstrip("/")
+        self.key_params = {"api_key": api_key} if api_key else {}
+
+    # since restricts the search by Entrez date, the day a record was added to PubMed.
+    async def fetch(self, query: str, stats: FetchStats, since: Optional[datetime] = None) -> AsyncIterator[dict]:
+        params = {"db": "pubmed", "term": query, "usehistory": "y", "retmax": 0, "retmode": "json", **self.key_params}
+        if since is not None:
+            params.update(datetype="edat", mindate=f"{since.astimezone(timezone.utc):%Y/%m/%d}", maxdate="3000")
+        search = await self.get_json(f"{self.url}/esearch.fcgi", params)
+        result = search["esearchresult"]
+        stats.total = int(result["count"])
+        total = min(stats.total, self.max_results)
+        history = {"WebEnv": result["webenv"], "query_key": result["querykey"]}
+        starts = list(range(0, total, self.page_size))
+        async for record in self.gather_pages(starts, lambda start: self._page(history, start, min(self.page_size, total - start)), stats):
+            yield record
+
+    async def _page(self, history: dict, start: int, size: int) -> AsyncIterator[dict]:
+        params = {"db": "pubmed", "retstart": start, "retmax": size, "retmode": "xml", **history, **self.key_params}
+        async for article in self.stream_xml(f"{self.url}/efetch.fcgi", params, {"PubmedArticle"}):
+            yield _record(article)
+
+
+# Structured abstracts keep their section labels, one section per line.
+def _record(article: Element) -> dict:
+    citation = article.find("MedlineCitation")
+    details = citation.find("Article") if citation is not None else None
+    sections = []
+    if details is not None:
+        for section in details.iterfind("Abstract/AbstractText"):
+            text = element_text(section)
+            if text:
+                sections.append(f"{section.get('Label').title()}: {text}" if section.get("Label") else text)
+    doi = next((element_text(i) for i in article.iterfind("PubmedData/ArticleIdList/ArticleId") if i.get("IdType") == "doi"), None)
+    if doi is None and details is not None:
+        doi = next((element_text(i) for i in details.iterfind("ELocationID") if i.get("EIdType") == "doi"), None)
+    return {
+        "title": element_text(details.find("ArticleTitle")) if details is not None else None,
+        "abstract": "\n".join(sections) or None,
+        "pmid": element_text(citation.find("PMID")) if citation is not None else None,
+        "doi": doi,
+    }
@@ -0,0 +1,49 @@
+import os
+from typing import AsyncIterator, Optional
+
+import httpx
+from app.sources.arxiv import ARXIV_API_URL, ArxivBackend
+from app.sources.base import FetchStats, SourceBackend
+from app.sources.cache import SourceCache
+from app.sources.pubmed import PUBMED_EUTILS_URL, PubMedBackend
+
+
+class SourceRegistry:
+    # The backends project sources can name, sharing one HTTP connection pool, and the cache of their results.
+    def __init__(self, backends: list[SourceBackend], http_client: Optional[httpx.AsyncClient] = None, cache: Optional[SourceCache] = None):
+        self.backends = {backend.name: backend for backend in backends}
+        self.http_client = http_client
+        self.cache = cache
+
+    @classmethod
+    def from_env(cls) -> "SourceRegistry":
+        http_client = httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0), follow_redirects=True)
+        options = {
+            "page_concurrency": int(os.getenv("SOURCE_PAGE_CONCURRENCY", 4)),
+            "max_results": int(os.getenv("SOURCE_MAX_RESULTS", 50_000)),
+        }
+        return cls(
+            [
+                ArxivBackend(http_client, url=os.getenv("ARXIV_API_URL", ARXIV_API_URL), **options),
+                PubMedBackend(
+                    http_client, url=os.getenv("PUBMED_EUTILS_URL", PUBMED_EUTILS_URL), api_key=os.getenv("PUBMED_API_KEY"), **options
+                ),
+            ],
+            http_client,
+            SourceCache.from_env(),
+        )
+
+    def get(self, backend_name: str) -> Optional[SourceBackend]:
+        return self.backends.get(backend_name.strip().lower())
+
+    # Yields a query's records through the cache if there is one; force bypasses cached pages and replaces them.
+    def fetch(self, backend: SourceBackend, query: str, stats: FetchStats, force: bool = False) -> AsyncIterator[dict]:
+        if self.cache is None:
+            return backend.fetch(query, stats)
+        return self.cache.fetch(backend, query, stats, force=force)
+
+    async def close(self) -> None:
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        if self.cache is not None:
+            self.cache.close()
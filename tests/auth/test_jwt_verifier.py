@@ -0,0 +1,81 @@
+import time
+
+import jwt
+import pytest
+from app.auth.exceptions import InvalidTokenError
+from app.auth.jwt_verifier import JWTVerifier, TokenCache, VerifiedClaims
+from app.dependencies import get_claims
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+SECRET = "test-secret-with-at-least-32-bytes!!"
+
+
+def make_token(secret=SECRET, exp_delta=3600, aud="authenticated", sub="user-1"):
+    payload = {"sub": sub, "role": "authenticated", "aud": aud, "exp": int(time.time()) + exp_delta}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+@pytest.fixture
+def verifier():
+    return JWTVerifier(secret=SECRET)
+
+
+def test_verify_valid_token(verifier):
+    claims = verifier.verify(make_token())
+    assert claims.user_id == "user-1"
+    assert claims.role == "authenticated"
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        make_token(secret="another-secret-with-at-least-32-bytes"),
+        make_token(exp_delta=-10),
+        make_token(aud="anon"),
+        "not-a-jwt",
+    ],
+)
+def test_verify_rejects_bad_tokens(verifier, token):
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(token)
+
+
+def test_verified_claims_are_cached(verifier, monkeypatch):
+    token = make_token()
+    verifier.verify(token)
+
+    def fail(*_, **__):
+        raise AssertionError("token decoded twice")
+
+    monkeypatch.setattr(jwt, "decode", fail)
+    assert verifier.verify(token).user_id == "user-1"
+
+
+def test_cache_evicts_expired_and_least_recent():
+    now = [1000.0]
+    cache = TokenCache(max_entries=2, clock=lambda: now[0])
+    cache.put("a", VerifiedClaims(user_id="a", role=None, exp=1100))
+    cache.put("b", VerifiedClaims(user_id="b", role=None, exp=2000))
+    cache.get("a")
+    cache.put("c", VerifiedClaims(user_id="c", role=None, exp=2000))
+
+    assert cache.get("b") is None
+    assert cache.get("a").user_id == "a"
+
+    now[0] = 1100.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_dependency_returns_401_without_network(verifier):
+    app = FastAPI()
+    app.state.token_verifier = verifier
+
+    @app.get("/me")
+    def me(claims: VerifiedClaims = Depends(get_claims)):
+        return {"user_id": claims.user_id}
+
+    client = TestClient(app)
+    assert client.get("/me", headers={"Authorization": f"Bearer {make_token()}"}).json() == {"user_id": "user-1"}
+    assert client.get("/me", headers={"Authorization": f"Bearer {make_token(exp_delta=-10)}"}).status_code == 401
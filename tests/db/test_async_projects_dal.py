@@ -0,0 +1,102 @@
+from uuid import uuid4
+
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.exceptions import DatabaseError
+
+# Mocked unit test for the async DAL
+
+
+class MockResponse:
+    def __init__(self, data=None):
+        self.data = data
+
+
+class MockAsyncClient:
+    def __init__(self):
+        self.inserted_data = None
+        self.table_name = None
+        self._field = None
+        self._value = None
+
+    def table(self, name):
+        self.table_name = name
+        return self
+
+    def select(self, *_):
+        return self
+
+    def insert(self, data):
+        self.inserted_data = data
+        return self
+
+    def delete(self):
+        return self
+
+    def eq(self, field, value):
+        self._field = field
+        self._value = value
+        return self
+
+    def in_(self, field, values):
+        self._field = field
+        self._value = values
+        return self
+
+    def limit(self, count):
+        return self
+
+    async def execute(self):
+        return MockResponse(data=[self.inserted_data] if self.inserted_data else [])
+
+
+@pytest.fixture
+def mock_dal():
+    return AsyncProjectDAL(client=MockAsyncClient())
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_project(mock_dal):
+    created = await mock_dal.create_project(description="A test project")
+    assert created["description"] == "A test project"
+
+    result = await mock_dal.get_project_by_id(uuid4())
+    assert result["id"] == created["id"]
+
+
+@pytest.mark.asyncio
+async def test_get_project_not_found(mock_dal):
+    result = await mock_dal.get_project_by_id(uuid4())
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_extraction_config_by_project(mock_dal):
+    project_id = uuid4()
+    assert await mock_dal.get_extraction_config_by_project(project_id) is None
+
+    await mock_dal.create_extraction_config(project_id)
+    config = await mock_dal.get_extraction_config_by_project(project_id)
+    assert config["project_id"] == str(project_id)
+    assert mock_dal.client._field == "project_id"
+
+
+@pytest.mark.asyncio
+async def test_delete_extraction_fields(mock_dal):
+    field_ids = [uuid4(), uuid4()]
+    await mock_dal.delete_extraction_fields(field_ids)
+    assert mock_dal.client.table_name == "extraction_fields"
+    assert mock_dal.client._value == [str(fid) for fid in field_ids]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_wrapped():
+    class FailingClient(MockAsyncClient):
+        async def execute(self):
+            raise Exception("Connection reset")
+
+    dal = AsyncProjectDAL(client=FailingClient())
+    with pytest.raises(DatabaseError, match="Error fetching project: Connection reset"):
+        await dal.get_project_by_id(uuid4())
+    with pytest.raises(DatabaseError, match="Error inserting project sources: Connection reset"):
+        await dal.insert_project_sources([{"id": str(uuid4())}])
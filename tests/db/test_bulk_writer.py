@@ -0,0 +1,114 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.bulk_writer import BulkWriteSettings, bulk_insert, bulk_rpc, chunk_rows
+from app.db.exceptions import BulkWriteError
+
+from tests.fake_postgrest import FakePostgrest
+
+
+def test_chunk_rows_by_count():
+    rows = [{"n": i} for i in range(7)]
+    chunks = list(chunk_rows(rows, max_rows=3, max_bytes=10_000))
+    assert [len(c) for c in chunks] == [3, 3, 1]
+
+
+def test_chunk_rows_by_bytes():
+    rows = [{"text": "x" * 100} for _ in range(5)]
+    row_size = len(json.dumps(rows[0])) + 1
+    chunks = list(chunk_rows(rows, max_rows=100, max_bytes=2 + row_size * 2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+def test_oversized_row_gets_its_own_chunk():
+    rows = [{"text": "small"}, {"text": "x" * 1000}, {"text": "small"}]
+    chunks = list(chunk_rows(rows, max_rows=100, max_bytes=100))
+    assert [len(c) for c in chunks] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_respects_concurrency_limit():
+    db = FakePostgrest()
+    in_flight = 0
+    peak = 0
+    original_table = db.table
+
+    class SlowQuery:
+        def __init__(self, query):
+            self.query = query
+
+        def insert(self, rows):
+            self.query.insert(rows)
+            return self
+
+        async def execute(self):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await self.query.execute()
+
+    db.table = lambda name: SlowQuery(original_table(name))
+    rows = [{"n": i} for i in range(50)]
+
+    result = await bulk_insert(db, "papers", rows, BulkWriteSettings(max_rows=5, max_concurrency=3))
+
+    assert result.ok
+    assert len(result.chunks) == 10
+    assert result.written_count == 50
+    assert peak == 3
+    assert [row["n"] for row in result.rows] == list(range(50))
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_reports_partial_failure():
+    db = FakePostgrest()
+    db.seed("papers", {"id": "dup"})
+    rows = [{"id": str(uuid4())}, {"id": str(uuid4())}, {"id": "dup"}, {"id": str(uuid4())}]
+
+    result = await bulk_insert(db, "papers", rows, BulkWriteSettings(max_rows=2))
+
+    assert not result.ok
+    assert [c.ok for c in result.chunks] == [True, False]
+    assert result.written_count == 2
+    assert "chunk 1: duplicate key" in result.error_summary()
+
+
+@pytest.mark.asyncio
+async def test_bulk_rpc_sends_one_call_per_chunk():
+    db = FakePostgrest()
+    db.functions["count_rows"] = lambda params: len(params["p_rows"])
+
+    result = await bulk_rpc(db, "count_rows", "p_rows", [{"n": i} for i in range(5)], BulkWriteSettings(max_rows=2))
+
+    assert result.ok and db.round_trips == 3
+    assert result.rows == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_insert_extraction_fields_chunks_without_mutating_input():
+    db = FakePostgrest()
+    dal = AsyncProjectDAL(db, bulk_settings=BulkWriteSettings(max_rows=100))
+    fields = [{"field_name": f"field_{i}", "description": None} for i in range(250)]
+
+    result = await dal.insert_extraction_fields(uuid4(), fields)
+
+    assert len(result.chunks) == 3
+    assert len(db.tables["extraction_fields"]) == 250
+    assert fields[0] == {"field_name": "field_0", "description": None}
+    assert len({row["created_at"] for row in db.tables["extraction_fields"]}) == 1
+
+
+@pytest.mark.asyncio
+async def test_insert_project_sources_raises_with_chunk_results():
+    db = FakePostgrest()
+    db.fail_with = Exception("payload too large")
+    dal = AsyncProjectDAL(db)
+
+    with pytest.raises(BulkWriteError, match="Error inserting project sources: payload too large") as error:
+        await dal.insert_project_sources([{"backend_name": "arXiv", "backend_query": "q"}])
+    assert error.value.result.failed_chunks[0].row_count == 1
@@ -0,0 +1,87 @@
+from uuid import uuid4
+
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.db.pagination import decode_cursor, encode_cursor
+from app.db.papers_dal import PaperDAL
+
+from tests.fake_postgrest import FakePostgrest
+
+
+def test_cursor_round_trip():
+    keyset = ("2025-01-01T00:00:00.123+00:00", str(uuid4()))
+    assert decode_cursor(encode_cursor(keyset)) == keyset
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-base64!",
+        encode_cursor(("a", "b"))[:-3],
+        "WzFd",
+        encode_cursor(("2025-01-01T00:00:00+00:00", "b")),
+        encode_cursor(('2025-01-01",id.gt."0', str(uuid4()))),
+        encode_cursor(("2025-01-01T00:00:00+00:00", f'{uuid4()}"),project_id.neq.("x')),
+    ],
+)
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_list_papers_walks_every_row_once_with_timestamp_ties():
+    db = FakePostgrest()
+    project_id = str(uuid4())
+    # Three papers share each timestamp, so pages must break ties on id.
+    for i in range(10):
+        db.seed(
+            "papers", {"project_id": project_id, "title": f"p{i}", "abstract": "long", "created_at": f"2025-01-0{1 + i // 3}T00:00:00+00:00"}
+        )
+    db.seed("papers", {"project_id": str(uuid4()), "title": "other", "created_at": "2025-01-01T00:00:00+00:00"})
+    dal = PaperDAL(db)
+
+    seen, after, pages = [], None, 0
+    while True:
+        rows, after = await dal.list_papers(project_id, page_size=4, after=after)
+        seen.extend(rows)
+        pages += 1
+        if after is None:
+            break
+
+    assert pages == 3
+    assert sorted(row["title"] for row in seen) == sorted(f"p{i}" for i in range(10))
+    assert [(r["created_at"], r["id"]) for r in seen] == sorted((r["created_at"], r["id"]) for r in seen)
+    assert set(seen[0]) == {"id", "title", "created_at"}
+
+
+@pytest.mark.asyncio
+async def test_list_projects_last_full_page_has_no_cursor():
+    db = FakePostgrest()
+    for i in range(3):
+        db.seed("projects", {"description": f"p{i}", "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"})
+
+    rows, after = await AsyncProjectDAL(db).list_projects(page_size=3)
+
+    assert [row["description"] for row in rows] == ["p0", "p1", "p2"]
+    assert after is None
+
+
+@pytest.mark.asyncio
+async def test_list_extracted_fields_scoped_to_project():
+    db = FakePostgrest()
+    project_id, other_project = str(uuid4()), str(uuid4())
+    paper = db.insert_row("papers", {"project_id": project_id})
+    other = db.insert_row("papers", {"project_id": other_project})
+    field_id = str(uuid4())
+    db.seed(
+        "extracted_fields",
+        {"paper_id": paper["id"], "extraction_field_id": field_id, "field_value": "0.9", "created_at": "2025-01-01T00:00:00+00:00"},
+        {"paper_id": other["id"], "extraction_field_id": field_id, "field_value": "0.1", "created_at": "2025-01-01T00:00:00+00:00"},
+    )
+
+    rows, after = await ExtractionResultsDAL(db).list_extracted_fields(project_id, page_size=10)
+
+    assert [row["field_value"] for row in rows] == ["0.9"]
+    assert after is None
@@ -0,0 +1,64 @@
+from uuid import uuid4
+
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.projections import ID_ONLY, Projection
+from app.db.projects_dal import PROJECT_TREE_SELECT
+from app.models.project_api_models import CreateExtractionConfigRequest, GetProjectResponse
+from app.services.project_service import ProjectService
+
+from tests.fake_postgrest import FakePostgrest
+
+
+def test_projection_renders_select_clause():
+    projection = Projection("id", "title").with_columns("papers!inner(project_id)")
+    assert str(projection) == "id, title, papers!inner(project_id)"
+    assert projection.names == ["id", "title", "papers"]
+
+
+def test_checked_against_rejects_unused_column():
+    with pytest.raises(ValueError, match=r"unused \['abstract'\]"):
+        Projection("id", "description", "created_at", "abstract").checked_against(GetProjectResponse, renames={"project_id": "id"})
+
+
+def test_checked_against_rejects_missing_column():
+    with pytest.raises(ValueError, match=r"missing \['created_at'\]"):
+        Projection("id", "description").checked_against(GetProjectResponse, renames={"project_id": "id"})
+
+
+def test_tree_projection_lists_embedded_columns():
+    assert "extraction_fields(id, field_name, description, created_at)" in str(PROJECT_TREE_SELECT)
+    assert "*" not in str(PROJECT_TREE_SELECT)
+
+
+@pytest.mark.asyncio
+async def test_get_project_by_id_fetches_declared_columns_only():
+    db = FakePostgrest()
+    project = db.insert_row("projects", {"description": "p", "created_at": "2025-01-01T00:00:00+00:00", "owner_id": str(uuid4())})
+
+    row = await AsyncProjectDAL(db).get_project_by_id(project["id"])
+
+    assert set(row) == {"id", "description", "created_at"}
+
+
+@pytest.mark.asyncio
+async def test_extraction_config_existence_check_fetches_id_only():
+    db = FakePostgrest()
+    project_id = uuid4()
+    db.seed("extraction_configs", {"project_id": str(project_id), "created_at": "2025-01-01T00:00:00+00:00"})
+    dal = AsyncProjectDAL(db)
+    seen = []
+    original = dal.get_extraction_config_by_project
+
+    async def spy(project_id, columns):
+        row = await original(project_id, columns=columns)
+        seen.append((columns, row))
+        return row
+
+    dal.get_extraction_config_by_project = spy
+
+    result = await ProjectService(dal=dal).create_extraction_config(CreateExtractionConfigRequest(project_id=project_id, fields=[]))
+
+    assert result.failure() is not None
+    assert seen[0][0] is ID_ONLY
+    assert set(seen[0][1]) == {"id"}
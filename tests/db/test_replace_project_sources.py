@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.exceptions import DatabaseError
+
+from tests.fake_postgrest import FakePostgrest
+
+
+@pytest.fixture
+def db():
+    return FakePostgrest()
+
+
+def source(name, query):
+    return {"id": str(uuid4()), "backend_name": name, "backend_query": query}
+
+
+@pytest.mark.asyncio
+async def test_replace_project_sources_in_one_round_trip(db):
+    project_id = str(uuid4())
+    db.seed("projects", {"id": project_id, "description": "p"})
+    db.seed("project_sources", {"project_id": project_id, "backend_name": "arXiv", "backend_query": "old"})
+
+    inserted = await AsyncProjectDAL(db).replace_project_sources(project_id, [source("arXiv", "new"), source("PubMed", "genomics")])
+
+    assert inserted == 2
+    assert db.round_trips == 1
+    assert sorted(row["backend_query"] for row in db.tables["project_sources"]) == ["genomics", "new"]
+
+
+@pytest.mark.asyncio
+async def test_replace_project_sources_missing_project(db):
+    result = await AsyncProjectDAL(db).replace_project_sources(uuid4(), [source("arXiv", "q")])
+    assert result is None
+    assert db.tables["project_sources"] == []
+
+
+@pytest.mark.asyncio
+async def test_replace_project_sources_failure_keeps_existing(db):
+    project_id = str(uuid4())
+    db.seed("projects", {"id": project_id})
+    db.seed("project_sources", {"project_id": project_id, "backend_name": "arXiv", "backend_query": "kept"})
+    db.fail_with = Exception("statement timeout")
+
+    with pytest.raises(DatabaseError, match="Error replacing project sources: statement timeout"):
+        await AsyncProjectDAL(db).replace_project_sources(project_id, [source("PubMed", "q")])
+    assert [row["backend_query"] for row in db.tables["project_sources"]] == ["kept"]
@@ -0,0 +1,50 @@
+import httpx
+from app.db.supabase_client import PoolSettings, SupabaseClientPool
+
+# Unit tests for the shared connection pool, using a mock transport instead of Supabase.
+
+
+def make_pool(seen_requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_requests.append(request)
+        return httpx.Response(200, json=[])
+
+    settings = PoolSettings(url="http://supabase.local", anon_key="anon-key")
+    return SupabaseClientPool(settings, http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def test_clients_share_one_http_pool():
+    pool = make_pool([])
+    first = pool.client_for_user("token-a")
+    second = pool.client_for_user("token-b")
+    assert first.session is pool.http_client
+    assert second.session is pool.http_client
+
+
+def test_jwt_is_sent_per_request():
+    seen = []
+    pool = make_pool(seen)
+
+    pool.client_for_user("token-a").table("projects").select("id").execute()
+    pool.client_for_user("token-b").table("projects").select("id").execute()
+
+    assert [r.headers["Authorization"] for r in seen] == ["Bearer token-a", "Bearer token-b"]
+    assert all(r.headers["apikey"] == "anon-key" for r in seen)
+    assert str(seen[0].url).startswith("http://supabase.local/rest/v1/projects")
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("SUPABASE_PROJECT_URL", "http://supabase.local/")
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "anon-key")
+    monkeypatch.setenv("SUPABASE_POOL_MAX_CONNECTIONS", "7")
+
+    settings = PoolSettings.from_env()
+    assert settings.max_connections == 7
+    assert settings.max_keepalive_connections == 20
+    assert settings.rest_url == "http://supabase.local/rest/v1"
+
+
+def test_close_releases_pool():
+    pool = make_pool([])
+    pool.close()
+    assert pool.http_client.is_closed
@@ -0,0 +1,325 @@
+# tests/fake_postgrest.py
+# In-memory stand-in for the async PostgREST client, so DAL code runs in tests without Supabase.
+# Tables are lists of dicts; RLS is not modelled. Every execute() counts as one round trip.
+
+import uuid
+from collections import defaultdict
+
+# (parent table, child table) -> foreign key column on the child, used to resolve embedded selects.
+RELATIONS = {
+    ("projects", "project_sources"): "project_id",
+    ("projects", "extraction_configs"): "project_id",
+    ("projects", "papers"): "project_id",
+    ("projects", "filters"): "project_id",
+    ("extraction_configs", "extraction_fields"): "config_id",
+    ("extraction_fields", "extracted_fields"): "extraction_field_id",
+    ("papers", "extracted_fields"): "paper_id",
+    ("papers", "paper_filter_results"): "paper_id",
+    ("filters", "paper_filter_results"): "filter_id",
+}
+
+
+class FakeResponse:
+    def __init__(self, data=None, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.operation = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.order_by = []
+        self.max_rows = None
+        self.ignore_duplicates = False
+        self.embedded_order = {}
+
+    # --- Operations ---
+    def select(self, *columns, count=None):
+        if self.operation == "select":
+            self.columns = ",".join(columns) or "*"
+        return self
+
+    def insert(self, rows):
+        self.operation = "insert"
+        self.payload = rows
+        return self
+
+    def upsert(self, rows, on_conflict="id", ignore_duplicates=False):
+        self.operation = "upsert"
+        self.payload = rows
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values):
+        self.operation = "update"
+        self.payload = values
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    # --- Filters and modifiers ---
+    def eq(self, column, value):
+        self.filters.append(lambda row: _get(row, column) == value)
+        return self
+
+    def neq(self, column, value):
+        self.filters.append(lambda row: _get(row, column) != value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: _get(row, column) is not None and _get(row, column) > value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: _get(row, column) is not None and _get(row, column) >= value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: _get(row, column) is not None and _get(row, column) < value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: _get(row, column) in values)
+        return self
+
+    def is_(self, column, value):
+        expected = None if value == "null" else value
+        self.filters.append(lambda row: _get(row, column) is expected)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: _get(row, column) is not None and _get(row, column) <= value)
+        return self
+
+    # PostgREST logic tree, e.g. 'created_at.gt."x",and(created_at.eq."x",id.gt."y")'.
+    def or_(self, filters, reference_table=None):
+        self.filters.append(parse_logic("or", filters))
+        return self
+
+    def order(self, column, desc=False, foreign_table=None):
+        if foreign_table is not None:
+            self.embedded_order[foreign_table] = (column, desc)
+        else:
+            self.order_by.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.max_rows = count
+        return self
+
+    async def execute(self):
+        self.db.round_trips += 1
+        if self.db.fail_with is not None:
+            raise self.db.fail_with
+        return FakeResponse(data=getattr(self, f"_run_{self.operation}")())
+
+    def _matching(self):
+        return [row for row in self.db.tables[self.table] if all(f(row) for f in self.filters)]
+
+    def _run_select(self):
+        # Filters may reference embedded resources ("papers.project_id"), so rows are expanded first.
+        rows = []
+        for row in self.db.tables[self.table]:
+            expanded = self.db.expand(self.table, row, self.columns, self.embedded_order)
+            if expanded is None:
+                continue
+            view = {**row, **expanded}
+            if all(f(view) for f in self.filters):
+                rows.append((view, expanded))
+        for column, desc in reversed(self.order_by):
+            rows.sort(key=lambda pair: _get(pair[0], column), reverse=desc)
+        if self.max_rows is not None:
+            rows = rows[: self.max_rows]
+        return [expanded for _, expanded in rows]
+
+    def _run_insert(self):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        return [self.db.insert_row(self.table, row) for row in rows]
+
+    def _run_upsert(self):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        written = []
+        for row in rows:
+            existing = self.db.find(self.table, row.get("id"))
+            if existing is None:
+                written.append(self.db.insert_row(self.table, row))
+            elif not self.ignore_duplicates:
+                existing.update(row)
+                written.append(dict(existing))
+        return written
+
+    def _run_update(self):
+        rows = self._matching()
+        for row in rows:
+            row.update(self.payload)
+        return [dict(row) for row in rows]
+
+    def _run_delete(self):
+        rows = self._matching()
+        deleted = {id(row) for row in rows}
+        self.db.tables[self.table] = [row for row in self.db.tables[self.table] if id(row) not in deleted]
+        return [dict(row) for row in rows]
+
+
+class FakeRPC:
+    def __init__(self, db, function, params):
+        self.db = db
+        self.function = function
+        self.params = params
+
+    async def execute(self):
+        self.db.round_trips += 1
+        if self.db.fail_with is not None:
+            raise self.db.fail_with
+        return FakeResponse(data=self.db.functions[self.function](self.params))
+
+
+class FakePostgrest:
+    def __init__(self):
+        self.tables = defaultdict(list)
+        self.round_trips = 0
+        self.fail_with = None
+        self.functions = {"replace_project_sources": self._replace_project_sources, "update_normalized_values": self._update_normalized_values}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, function, params):
+        return FakeRPC(self, function, params)
+
+    # --- Helpers for tests ---
+    def seed(self, table, *rows):
+        for row in rows:
+            self.insert_row(table, row)
+
+    def find(self, table, row_id):
+        return next((row for row in self.tables[table] if row.get("id") == row_id), None)
+
+    def insert_row(self, table, row):
+        row = {"id": str(uuid.uuid4()), **row}
+        if self.find(table, row["id"]) is not None:
+            raise Exception(f'duplicate key value violates unique constraint "{table}_pkey"')
+        self.tables[table].append(row)
+        return dict(row)
+
+    # Applies a select clause to a row, resolving embedded resources through RELATIONS.
+    # Returns None when an !inner embedded resource has no match, so the row is dropped.
+    def expand(self, table, row, columns, embedded_order=None, path=""):
+        embedded_order = embedded_order or {}
+        result = {}
+        for name, inner, required in parse_select(columns):
+            if inner is None:
+                if name == "*":
+                    result.update(row)
+                else:
+                    result[name] = row.get(name)
+                continue
+
+            child_path = f"{path}.{name}" if path else name
+            if (table, name) in RELATIONS:
+                foreign_key = RELATIONS[(table, name)]
+                children = [child for child in self.tables[name] if child.get(foreign_key) == row.get("id")]
+                if child_path in embedded_order:
+                    column, desc = embedded_order[child_path]
+                    children.sort(key=lambda child: _get(child, column), reverse=desc)
+                value = [self.expand(name, child, inner, embedded_order, child_path) for child in children]
+                value = [child for child in value if child is not None]
+            else:
+                foreign_key = RELATIONS[(name, table)]
+                parent = self.find(name, row.get(foreign_key))
+                value = self.expand(name, parent, inner, embedded_order, child_path) if parent is not None else None
+            if required and not value:
+                return None
+            result[name] = value
+        return result
+
+    # Mirrors app/db/sql/replace_project_sources.sql.
+    def _replace_project_sources(self, params):
+        project_id = params["p_project_id"]
+        if self.find("projects", project_id) is None:
+            return None
+        self.tables["project_sources"] = [row for row in self.tables["project_sources"] if row["project_id"] != project_id]
+        for source in params["p_sources"]:
+            self.insert_row("project_sources", {**source, "project_id": project_id})
+        return len(params["p_sources"])
+
+    # Mirrors app/db/sql/update_normalized_values.sql.
+    def _update_normalized_values(self, params):
+        updated = 0
+        for update in params["p_rows"]:
+            row = self.find("extracted_fields", update["id"])
+            if row is not None and row.get("field_value") == update["field_value"]:
+                row.update({key: value for key, value in update.items() if key not in ("id", "field_value")})
+                updated += 1
+        return updated
+
+
+COMPARISONS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+# Splits on commas that are outside parentheses and double quotes.
+def _split_top_level(text):
+    items, depth, quoted, current = [], 0, False, ""
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and depth == 0 and not quoted:
+            items.append(current)
+            current = ""
+            continue
+        elif not quoted:
+            depth += char == "("
+            depth -= char == ")"
+        current += char
+    items.append(current)
+    return items
+
+
+# Compiles a PostgREST logic tree ("or"/"and" over "column.op.value" conditions) into a row predicate.
+def parse_logic(operator, body):
+    predicates = []
+    for item in (i.strip() for i in _split_top_level(body) if i.strip()):
+        if item.startswith(("and(", "or(")):
+            nested, inner = item.split("(", 1)
+            predicates.append(parse_logic(nested, inner[:-1]))
+            continue
+        column, op, value = item.split(".", 2)
+        if value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        predicates.append(lambda row, column=column, op=op, value=value: COMPARISONS[op](_get(row, column), value))
+    combine = any if operator == "or" else all
+    return lambda row: combine(p(row) for p in predicates)
+
+
+# Splits a PostgREST select clause into (name, embedded columns or None, is !inner) tuples.
+def parse_select(columns):
+    parsed = []
+    for item in (i.strip() for i in _split_top_level(columns) if i.strip()):
+        if "(" not in item:
+            parsed.append((item, None, False))
+            continue
+        name, inner = item.split("(", 1)
+        name = name.split(":")[-1]
+        parsed.append((name.split("!")[0], inner[:-1], name.endswith("!inner")))
+    return parsed
+
+
+def _get(row, column):
+    for part in column.split("."):
+        row = row.get(part) if isinstance(row, dict) else None
+    return row
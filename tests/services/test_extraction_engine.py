@@ -0,0 +1,391 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.db.papers_dal import PaperDAL
+from app.extraction.engine import EngineSettings, ExtractionEngine, result_id
+from app.extraction.llm import FakeLLMClient, llm_client_from_env
+from app.extraction.prompts import build_prompt, estimate_tokens, group_fields
+from app.extraction.queue import DONE, FAILED, LEASED, QUEUED, WorkQueue
+from app.extraction.result_cache import ResultCache, cache_key
+from app.models.extraction_run_api_models import CreateExtractionRunRequest, ExtractionRunOptions, GetExtractionRunRequest
+from app.models.shared import ResponseStatus
+from app.services.errors import InvalidRequestError, NotFoundError
+from app.services.extraction_run_service import ExtractionRunService
+from app.services.rate_limiter import TokenBucket
+
+from tests.fake_postgrest import FakePostgrest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket.per_minute(60, clock=clock, sleep=clock.sleep)
+    await bucket.acquire(60)
+    assert clock.sleeps == []
+    await bucket.acquire(30)
+    assert clock.sleeps == [30.0]
+    # Amounts above capacity wait for a full bucket instead of forever.
+    await bucket.acquire(1000)
+    assert clock.now == 90.0
+
+
+def test_queue_leases_expire_and_failures_are_retried():
+    clock = FakeClock()
+    queue = WorkQueue(clock=clock)
+    assert queue.create_run("run", "project", "user", [("p1", ["f1"]), ("p2", ["f1", "f2"])]) == 2
+
+    first = queue.lease("run", limit=1, lease_seconds=10)
+    assert [(item.paper_id, item.field_ids, item.attempts) for item in first] == [("p1", ("f1",), 1)]
+    assert [item.paper_id for item in queue.lease("run", limit=5, lease_seconds=10)] == ["p2"]
+    assert queue.lease("run", limit=5, lease_seconds=10) == []
+
+    clock.now = 11
+    expired = queue.lease("run", limit=5, lease_seconds=10)
+    assert [(item.paper_id, item.attempts) for item in expired] == [("p1", 2), ("p2", 2)]
+
+    queue.complete([expired[0].id])
+    queue.fail([expired[1].id], "boom", max_attempts=3)
+    assert queue.counts("run") == {QUEUED: 1, LEASED: 0, DONE: 1, FAILED: 0}
+    retried = queue.lease("run", limit=5, lease_seconds=10)
+    queue.fail([item.id for item in retried], "boom", max_attempts=3)
+    assert queue.counts("run")[FAILED] == 1
+    assert queue.errors("run", limit=5) == ["boom"]
+
+
+def test_result_cache_persists_and_evicts_least_recently_used(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "cache.db")
+    cache = ResultCache(path, max_bytes=100, clock=clock)
+    cache.put_many({b"a" * 16: "x" * 14, b"b" * 16: None})
+    cache.close()
+
+    cache = ResultCache(path, max_bytes=100, clock=clock)
+    assert cache.size == 46
+    clock.now = 1
+    assert cache.get_many([b"a" * 16, b"b" * 16, b"c" * 16]) == {b"a" * 16: "x" * 14, b"b" * 16: None}
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+    clock.now = 2
+    cache.get_many([b"a" * 16])
+    cache.put_many({b"c" * 16: "y" * 44})
+    assert cache.evictions == 1 and cache.size == 90
+    assert set(cache.get_many([b"a" * 16, b"b" * 16, b"c" * 16])) == {b"a" * 16, b"c" * 16}
+
+
+def test_cache_key_depends_on_field_definition_and_model():
+    paper = {"title": "T", "abstract": "A"}
+    field = {"field_name": "latency", "description": "Latency"}
+    key = cache_key(paper, field, "m1")
+    assert key == cache_key({**paper, "id": "other"}, {**field, "id": "other"}, "m1")
+    assert key != cache_key(paper, {**field, "description": "p99 latency"}, "m1")
+    assert key != cache_key(paper, field, "m2")
+    assert key != cache_key({**paper, "abstract": "B"}, field, "m1")
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Runs", "user_id": "user-1"})
+    config = db.insert_row("extraction_configs", {"project_id": db.project_id})
+    db.fields = [
+        db.insert_row(
+            "extraction_fields",
+            {"config_id": config["id"], "field_name": name, "description": f"The {name}", "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"},
+        )
+        for i, name in enumerate(("latency", "dataset"))
+    ]
+    db.papers = [
+        db.insert_row(
+            "papers",
+            {"project_id": db.project_id, "title": f"Paper {i}", "abstract": "Runs in 12 ms.", "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"},
+        )
+        for i in range(5)
+    ]
+    return db
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = ExtractionEngine(WorkQueue(), FakeLLMClient(), EngineSettings(workers=2, lease_batch=2, write_batch=3))
+    yield engine
+    await engine.close()
+
+
+def make_service(db, engine, user_id="user-1"):
+    return ExtractionRunService(
+        engine=engine, results_dal=ExtractionResultsDAL(db), paper_dal=PaperDAL(db), project_dal=AsyncProjectDAL(db), user_id=user_id
+    )
+
+
+async def wait_for_run(engine, run_id):
+    await asyncio.wait_for(engine._runs[str(run_id)], timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_run_extracts_every_paper_and_field(db, engine):
+    service = make_service(db, engine)
+    created = (await service.create_run(CreateExtractionRunRequest(project_id=db.project_id))).unwrap()
+    assert (created.items, created.fields) == (5, 2)
+    await wait_for_run(engine, created.run_id)
+
+    rows = db.tables["extracted_fields"]
+    assert len(rows) == 10
+    assert len(engine.llm.calls) == 5 and engine.stats.rows_written == 10
+    row = next(r for r in rows if r["id"] == result_id(db.papers[0]["id"], db.fields[0]["id"]))
+    assert row["field_value"].startswith("latency-")
+
+    status = (await service.get_run(GetExtractionRunRequest(project_id=db.project_id, run_id=created.run_id))).unwrap()
+    assert (status.queued, status.running, status.done, status.failed, status.active) == (0, 0, 5, 0, False)
+    assert status.status == ResponseStatus.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_fields_missing_from_the_answer_are_asked_alone(db):
+    def answer(prompt):
+        names = FakeLLMClient._answer(prompt)
+        return names if prompt.count("\n- ") == 1 else json.dumps({"latency": "12 ms"})
+
+    engine = ExtractionEngine(WorkQueue(), FakeLLMClient(answer=answer))
+    try:
+        service = make_service(db, engine)
+        created = (await service.create_run(CreateExtractionRunRequest(project_id=db.project_id))).unwrap()
+        await wait_for_run(engine, created.run_id)
+        assert len(engine.llm.calls) == 5 * 2 and engine.stats.fallback_calls == 5
+        values = {(r["extraction_field_id"], r["field_value"]) for r in db.tables["extracted_fields"]}
+        assert (db.fields[0]["id"], "12 ms") in values
+        assert all(value.startswith("dataset-") for field_id, value in values if field_id == db.fields[1]["id"])
+        assert {r["numeric_value"] for r in db.tables["extracted_fields"] if r["extraction_field_id"] == db.fields[0]["id"]} == {0.012}
+    finally:
+        await engine.close()
+
+
+def test_llm_client_must_be_configured(monkeypatch):
+    monkeypatch.delenv("EXTRACTION_LLM", raising=False)
+    with pytest.raises(ValueError):
+        llm_client_from_env()
+    monkeypatch.setenv("EXTRACTION_LLM", "fake")
+    assert isinstance(llm_client_from_env(), FakeLLMClient)
+
+
+def test_fields_are_grouped_within_the_prompt_budget():
+    paper = {"title": "A paper", "abstract": "x" * 400}
+    fields = [{"field_name": f"field_{i}", "description": "d" * 40} for i in range(10)]
+    base = estimate_tokens(build_prompt(paper, []))
+    groups = group_fields(paper, fields, max_tokens=base + 40)
+    assert [len(group) for group in groups] == [3, 3, 3, 1]
+    assert sum(groups, []) == fields
+    assert group_fields(paper, fields, max_tokens=0) == [[field] for field in fields]
+    assert [len(group) for group in group_fields(paper, fields, max_tokens=10**6, max_fields=4)] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_output_budget_scales_with_the_fields_asked(db):
+    for i in range(3):
+        db.insert_row(
+            "extraction_fields", {"config_id": db.fields[0]["config_id"], "field_name": f"extra_{i}", "created_at": f"2025-02-0{i + 1}"}
+        )
+    settings = EngineSettings(output_tokens_per_field=100, max_output_tokens=300)
+    assert (settings.max_group_fields, settings.output_budget(2), settings.output_budget(5)) == (3, 200, 300)
+    engine = ExtractionEngine(WorkQueue(), FakeLLMClient(), settings)
+    try:
+        created = (await make_service(db, engine).create_run(CreateExtractionRunRequest(project_id=db.project_id))).unwrap()
+        await wait_for_run(engine, created.run_id)
+        # Five fields per paper are asked as a group of three and a group of two.
+        assert sorted(call.max_output_tokens for call in engine.llm.calls) == [200] * 5 + [300] * 5
+        assert engine.stats.fallback_calls == 0 and len(db.tables["extracted_fields"]) == 25
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_rerunning_overwrites_results(db, engine):
+    service = make_service(db, engine)
+    for _ in range(2):
+        created = (
+            await service.create_run(CreateExtractionRunRequest(project_id=db.project_id, options=ExtractionRunOptions(force=True)))
+        ).unwrap()
+        await wait_for_run(engine, created.run_id)
+    assert created.cells == 10
+    assert len(db.tables["extracted_fields"]) == 10
+
+
+async def run(service, db, engine, **options):
+    created = (await service.create_run(CreateExtractionRunRequest(project_id=db.project_id, options=ExtractionRunOptions(**options)))).unwrap()
+    await wait_for_run(engine, created.run_id)
+    return created
+
+
+@pytest.mark.asyncio
+async def test_runs_only_extract_missing_and_stale_cells(db, engine):
+    service = make_service(db, engine)
+    assert (await run(service, db, engine)).cells == 10
+    assert (await run(service, db, engine)).cells == 0
+
+    # A new field and a new paper only add their own cells.
+    db.insert_row(
+        "extraction_fields", {"config_id": db.fields[0]["config_id"], "field_name": "model", "created_at": "2025-01-03T00:00:00+00:00"}
+    )
+    db.insert_row("papers", {"project_id": db.project_id, "title": "New", "created_at": "2025-02-01T00:00:00+00:00"})
+    created = await run(service, db, engine)
+    assert (created.items, created.cells) == (6, 5 + 3)
+
+    # Editing a description re-runs that field; values entered by hand, without a hash, are kept.
+    db.find("extraction_fields", db.fields[1]["id"])["description"] = "The benchmark dataset"
+    manual = next(r for r in db.tables["extracted_fields"] if r["extraction_field_id"] == db.fields[1]["id"])
+    manual["field_hash"], manual["field_value"] = None, "entered by hand"
+    created = await run(service, db, engine)
+    assert (created.items, created.cells) == (5, 5)
+    assert manual["field_value"] == "entered by hand"
+    assert len(db.tables["extracted_fields"]) == 6 * 3
+
+
+@pytest.mark.asyncio
+async def test_forced_runs_keep_values_entered_by_hand(db, engine):
+    manual = db.insert_row(
+        "extracted_fields",
+        {
+            "paper_id": db.papers[0]["id"],
+            "extraction_field_id": db.fields[0]["id"],
+            "field_value": "entered by hand",
+            "created_at": "2025-01-01",
+        },
+    )
+    service = make_service(db, engine)
+    created = await run(service, db, engine, force=True)
+
+    assert (created.items, created.cells) == (5, 9)
+    cell = [r for r in db.tables["extracted_fields"] if (r["paper_id"], r["extraction_field_id"]) == (db.papers[0]["id"], db.fields[0]["id"])]
+    assert [r["id"] for r in cell] == [manual["id"]] and cell[0]["field_value"] == "entered by hand"
+    assert len(db.tables["extracted_fields"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_rerun_is_answered_from_the_result_cache(db):
+    engine = ExtractionEngine(WorkQueue(), FakeLLMClient(), result_cache=ResultCache())
+    try:
+        service = make_service(db, engine)
+        await run(service, db, engine)
+        db.tables["extracted_fields"].clear()
+        await run(service, db, engine)
+        assert len(engine.llm.calls) == 5
+        assert (engine.result_cache.stats.hits, engine.result_cache.stats.misses) == (10, 10)
+        assert len(db.tables["extracted_fields"]) == 10 and all(r["field_value"] for r in db.tables["extracted_fields"])
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_forced_runs_skip_the_result_cache(db):
+    engine = ExtractionEngine(WorkQueue(), FakeLLMClient(), result_cache=ResultCache())
+    try:
+        service = make_service(db, engine)
+        await run(service, db, engine)
+        created = await run(service, db, engine, force=True)
+        assert len(engine.llm.calls) == 10 and engine.result_cache.stats.hits == 0
+        run_record = engine.queue.get_run(str(created.run_id))
+        assert run_record.force
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_papers_that_failed_a_filter_are_not_extracted(db, engine):
+    flt = db.insert_row("filters", {"project_id": db.project_id})
+    db.seed("paper_filter_results", {"paper_id": db.papers[0]["id"], "filter_id": flt["id"], "passed": False})
+    db.seed("paper_filter_results", {"paper_id": db.papers[1]["id"], "filter_id": flt["id"], "passed": None})
+    service = make_service(db, engine)
+    created = await run(service, db, engine)
+    assert (created.items, created.excluded) == (4, 1)
+    assert (await run(service, db, engine, include_filtered_out=True)).items == 1
+
+
+@pytest.mark.asyncio
+async def test_run_can_be_narrowed_to_fields_and_papers(db, engine):
+    service = make_service(db, engine)
+    options = ExtractionRunOptions(field_ids=[db.fields[1]["id"]], paper_ids=[db.papers[0]["id"], db.papers[1]["id"]])
+    created = (await service.create_run(CreateExtractionRunRequest(project_id=db.project_id, options=options))).unwrap()
+    await wait_for_run(engine, created.run_id)
+    assert {(r["paper_id"], r["extraction_field_id"]) for r in db.tables["extracted_fields"]} == {
+        (db.papers[0]["id"], db.fields[1]["id"]),
+        (db.papers[1]["id"], db.fields[1]["id"]),
+    }
+
+
+@pytest.mark.asyncio
+async def test_unanswerable_items_fail_after_max_attempts(db):
+    engine = ExtractionEngine(WorkQueue(), FakeLLMClient(answer=lambda prompt: "not json"), EngineSettings(max_attempts=2))
+    try:
+        service = make_service(db, engine)
+        created = (await service.create_run(CreateExtractionRunRequest(project_id=db.project_id))).unwrap()
+        await wait_for_run(engine, created.run_id)
+        status = (await service.get_run(GetExtractionRunRequest(project_id=db.project_id, run_id=created.run_id))).unwrap()
+        assert (status.done, status.failed) == (0, 5)
+        assert status.status == ResponseStatus.DEGRADED and status.errors
+        # Per attempt, one call for both fields and one retry per field.
+        assert len(engine.llm.calls) == 5 * 2 * 3
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_fields_left_out_after_the_fallback_fail_the_item(db):
+    cache = ResultCache()
+    engine = ExtractionEngine(
+        WorkQueue(), FakeLLMClient(answer=lambda prompt: json.dumps({"latency": "12 ms"})), EngineSettings(max_attempts=2), result_cache=cache
+    )
+    try:
+        service = make_service(db, engine)
+        created = (await service.create_run(CreateExtractionRunRequest(project_id=db.project_id))).unwrap()
+        await wait_for_run(engine, created.run_id)
+        status = (await service.get_run(GetExtractionRunRequest(project_id=db.project_id, run_id=created.run_id))).unwrap()
+        assert (status.done, status.failed) == (0, 5)
+        assert any("dataset" in error for error in status.errors)
+        assert db.tables["extracted_fields"] == []
+        # Only the answered field was cached, so the second attempt asked for the dataset alone.
+        paper = db.papers[0]
+        cached = cache.get_many([cache_key(paper, field, engine.llm.model) for field in db.fields])
+        assert list(cached.values()) == ["12 ms"]
+        assert len(engine.llm.calls) == 5 * (2 + 1)
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_run_requests_are_validated(db, engine):
+    service = make_service(db, engine)
+    result = await service.create_run(CreateExtractionRunRequest(project_id=uuid4()))
+    assert isinstance(result.failure(), NotFoundError)
+
+    options = ExtractionRunOptions(field_ids=[uuid4()])
+    result = await service.create_run(CreateExtractionRunRequest(project_id=db.project_id, options=options))
+    assert isinstance(result.failure(), InvalidRequestError)
+
+
+@pytest.mark.asyncio
+async def test_runs_are_private_to_their_creator(db, engine):
+    created = (await make_service(db, engine).create_run(CreateExtractionRunRequest(project_id=db.project_id))).unwrap()
+    await wait_for_run(engine, created.run_id)
+    request = GetExtractionRunRequest(project_id=db.project_id, run_id=created.run_id)
+    assert isinstance((await make_service(db, engine, user_id="user-2").get_run(request)).failure(), NotFoundError)
+    assert isinstance(
+        (await make_service(db, engine).resume_run(GetExtractionRunRequest(project_id=db.project_id, run_id=uuid4()))).failure(), NotFoundError
+    )
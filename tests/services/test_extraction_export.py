@@ -0,0 +1,112 @@
+import csv
+import gzip
+import io
+import json
+from uuid import uuid4
+
+import pytest
+from app.api import extractions
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.models.extraction_api_models import ExportExtractionsRequest, ExportFormat
+from app.services import extraction_export
+from app.services.errors import InvalidRequestError
+from app.services.extraction_export import export_columns
+from app.services.extraction_results_service import ExtractionResultsService
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.fake_postgrest import FakePostgrest
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Export", "created_at": "2025-01-01T00:00:00+00:00"})
+    config = db.insert_row("extraction_configs", {"project_id": db.project_id})
+    db.fields = [
+        db.insert_row("extraction_fields", {"config_id": config["id"], "field_name": name, "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"})
+        for i, name in enumerate(["sample_size", "outcome"])
+    ]
+    for i in range(7):
+        paper = db.insert_row("papers", {"project_id": db.project_id, "title": f"Paper {i}", "created_at": f"2025-02-0{i + 1}T00:00:00+00:00"})
+        db.seed("extracted_fields", {"paper_id": paper["id"], "extraction_field_id": db.fields[0]["id"], "field_value": str(10 * i)})
+        if i % 2 == 0:
+            db.seed("extracted_fields", {"paper_id": paper["id"], "extraction_field_id": db.fields[1]["id"], "field_value": f"outcome, {i}"})
+    return db
+
+
+@pytest.fixture
+def service(db):
+    dal = ExtractionResultsDAL(db)
+    original = dal.iter_paper_values
+    dal.iter_paper_values = lambda project_id: original(project_id, page_size=3)
+    return ExtractionResultsService(dal=dal, project_dal=AsyncProjectDAL(db))
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(extractions.router)
+    app.dependency_overrides[extractions.get_extraction_results_service] = lambda: service
+    return TestClient(app)
+
+
+def test_export_columns_suffix_repeated_names():
+    fields = [{"field_name": "outcome"}, {"field_name": "outcome"}, {"field_name": "title"}]
+    assert export_columns(fields) == ["paper_id", "title", "outcome", "outcome_2", "title_2"]
+
+
+def test_csv_export_pivots_every_page(client, db):
+    response = client.get(f"/projects/{db.project_id}/extractions/export")
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert f'filename="extractions-{db.project_id}.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == [f"Paper {i}" for i in range(7)]
+    assert [row["sample_size"] for row in rows] == [str(10 * i) for i in range(7)]
+    assert rows[2]["outcome"] == "outcome, 2"
+    assert rows[1]["outcome"] == ""
+
+
+def test_gzip_ndjson_export(client, db):
+    response = client.get(f"/projects/{db.project_id}/extractions/export", params={"format": "ndjson", "gzip": True})
+
+    assert response.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(response.content).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 7
+    assert records[3] == {"paper_id": records[3]["paper_id"], "title": "Paper 3", "sample_size": "30", "outcome": None}
+
+
+def test_parquet_export_writes_one_row_group_per_page(client, db):
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = client.get(f"/projects/{db.project_id}/extractions/export", params={"format": "parquet"})
+
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == ["paper_id", "title", "sample_size", "outcome"]
+    assert table.column("outcome").to_pylist()[:2] == ["outcome, 0", None]
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_requires_pyarrow(service, db, monkeypatch):
+    monkeypatch.setattr(extraction_export, "pq", None)
+    result = await service.prepare_export(ExportExtractionsRequest(project_id=db.project_id, export_format=ExportFormat.PARQUET))
+    assert isinstance(result.failure(), InvalidRequestError)
+
+
+def test_export_of_unknown_project_is_404(client):
+    assert client.get(f"/projects/{uuid4()}/extractions/export").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_without_fields_lists_papers(db):
+    db.tables["extraction_fields"].clear()
+    result = await ExtractionResultsService(dal=ExtractionResultsDAL(db)).prepare_export(ExportExtractionsRequest(project_id=db.project_id))
+    export = result.unwrap()
+    body = b"".join([chunk async for chunk in export.chunks()]).decode()
+    assert body.splitlines()[0] == "paper_id,title"
+    assert len(body.splitlines()) == 8
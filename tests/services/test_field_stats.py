@@ -0,0 +1,113 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.models.extraction_api_models import FieldStatsRequest, NormalizeFieldRequest
+from app.services.cache import InMemoryCacheBackend
+from app.services.errors import NotFoundError
+from app.services.extraction_results_service import ExtractionResultsService
+from app.services.field_stats import FieldStatsCache, histogram, numeric_summary
+
+from tests.fake_postgrest import FakePostgrest
+
+
+def test_numeric_summary():
+    summary = numeric_summary(np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+    assert (summary.count, summary.mean, summary.median, summary.min, summary.max) == (5, 3.0, 3.0, 1.0, 5.0)
+    assert summary.quantiles == {"p05": 1.2, "p25": 2.0, "p50": 3.0, "p75": 4.0, "p95": 4.8}
+    assert numeric_summary(np.array([])) is None
+
+
+def test_histogram_covers_all_values():
+    bins = histogram(np.array([0.0, 0.1, 0.5, 1.0]), bins=2)
+    assert [(b.lower, b.upper, b.count) for b in bins] == [(0.0, 0.5, 2), (0.5, 1.0, 2)]
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Stats"})
+    config = db.insert_row("extraction_configs", {"project_id": db.project_id})
+    db.field = db.insert_row("extraction_fields", {"config_id": config["id"], "field_name": "latency"})
+    db.filter = db.insert_row("filters", {"project_id": db.project_id})
+    values = ["10 ms", "20 ms", "0.03 s", "40 ms", "5 MB", None]
+    for i, value in enumerate(values):
+        paper = db.insert_row("papers", {"project_id": db.project_id, "title": f"Paper {i}", "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"})
+        if value is not None:
+            db.seed(
+                "extracted_fields",
+                {"paper_id": paper["id"], "extraction_field_id": db.field["id"], "field_value": value, "created_at": paper["created_at"]},
+            )
+        if i < 4:
+            db.seed("paper_filter_results", {"paper_id": paper["id"], "filter_id": db.filter["id"], "passed": i < 2})
+    return db
+
+
+@pytest.fixture
+def cache():
+    return FieldStatsCache(InMemoryCacheBackend())
+
+
+@pytest.fixture
+def service(db, cache):
+    return ExtractionResultsService(dal=ExtractionResultsDAL(db), project_dal=AsyncProjectDAL(db), user_id="user-1", stats_cache=cache)
+
+
+async def normalize(service, db):
+    (await service.normalize_field(NormalizeFieldRequest(project_id=db.project_id, field_id=db.field["id"]))).unwrap()
+
+
+@pytest.mark.asyncio
+async def test_field_stats_use_the_dominant_unit(service, db):
+    await normalize(service, db)
+
+    stats = (await service.field_stats(FieldStatsRequest(project_id=db.project_id, field_id=db.field["id"], bins=3))).unwrap()
+
+    assert (stats.unit, stats.paper_count, stats.other_unit) == ("s", 6, 1)
+    assert stats.missing_rate == pytest.approx(1 / 6)
+    assert stats.summary.count == 4
+    assert stats.summary.mean == pytest.approx(0.025)
+    assert sum(b.count for b in stats.histogram) == 4
+    [breakdown] = stats.by_filter
+    assert (breakdown.passed.count, breakdown.failed.count, breakdown.not_evaluated) == (2, 2, None)
+    assert breakdown.passed.mean == pytest.approx(0.015)
+
+
+@pytest.mark.asyncio
+async def test_field_stats_load_only_the_field_asked(service, db):
+    await normalize(service, db)
+    other = db.insert_row("extraction_fields", {"config_id": db.field["config_id"], "field_name": "dataset"})
+    for paper in db.tables["papers"]:
+        db.seed(
+            "extracted_fields", {"paper_id": paper["id"], "extraction_field_id": other["id"], "field_value": "ImageNet", "numeric_value": 1.0}
+        )
+    matrix = await service.load_field_matrix(db.project_id, db.field["id"])
+
+    assert (matrix.paper_count, matrix.field_ids, matrix.value_count) == (6, [db.field["id"]], 5)
+    assert matrix.value_buffer == b"" and len(matrix.numeric_values(db.field["id"])) == 5
+    assert matrix.filter_counts()[0].tolist() == [4]
+
+
+@pytest.mark.asyncio
+async def test_stats_are_cached_until_the_field_is_normalized_again(service, db, cache):
+    request = FieldStatsRequest(project_id=db.project_id, field_id=db.field["id"])
+    await normalize(service, db)
+    first = (await service.field_stats(request)).unwrap()
+    db.tables["extracted_fields"][0]["numeric_value"] = 100.0
+    assert (await service.field_stats(request)).unwrap() == first
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    db.tables["extracted_fields"][0]["field_value"] = "1 s"
+    await normalize(service, db)
+
+    assert (await service.field_stats(request)).unwrap().summary.max == 1.0
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_of_unknown_field_is_not_found(service, db):
+    result = await service.field_stats(FieldStatsRequest(project_id=db.project_id, field_id=uuid4()))
+    assert isinstance(result.failure(), NotFoundError)
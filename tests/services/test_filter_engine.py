@@ -0,0 +1,201 @@
+import json
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.filters_dal import FilterDAL
+from app.db.papers_dal import PaperDAL
+from app.extraction.engine import ExtractionEngine
+from app.extraction.filter_engine import FilterEngine, FilterSettings, FilterStats, PreparedFilter, filter_result_id
+from app.extraction.filter_rules import RuleSyntaxError, compile_filter, lexical_scores
+from app.extraction.llm import FakeLLMClient
+from app.extraction.queue import WorkQueue
+from app.models.filter_api_models import EvaluateFiltersOptions, EvaluateFiltersRequest
+from app.models.shared import ResponseStatus
+from app.services.errors import InvalidRequestError, NotFoundError
+from app.services.filter_service import FilterService
+
+from tests.fake_postgrest import FakePostgrest
+
+TEXTS = [
+    "A deep learning model for chest radiographs",
+    "A survey of deep learning for radiographs",
+    "Neural networks read radiography",
+    "Deep learning on CT scans",
+]
+
+
+def test_rules_are_compiled_and_evaluated_over_all_texts():
+    compiled = compile_filter(
+        'Deep learning for chest X-rays\nrequire: ("deep learning" OR /neural net\\w*/) AND radiograph*\nexclude: survey OR "systematic review"'
+    )
+    assert compiled.criterion == "Deep learning for chest X-rays"
+    assert compiled.rule_mask(TEXTS).tolist() == [True, False, True, False]
+    assert compile_filter("require: NOT (ct OR mri)").rule_mask(TEXTS).tolist() == [True, True, True, False]
+    assert not compile_filter("Only the criterion").has_rules
+
+
+@pytest.mark.parametrize("rule", ["require:", "require: (deep", "exclude: deep OR", "require: /[/", 'require: ""'])
+def test_invalid_rules_are_rejected(rule):
+    with pytest.raises(RuleSyntaxError):
+        compile_filter(rule)
+
+
+def test_lexical_scores_weight_rare_terms():
+    scores = lexical_scores("chest radiographs", ["chest radiograph study", "gardening tips", "radiographs of the knee", "chest pain"])
+    assert scores[0] == pytest.approx(1.0) and scores[1] == 0.0
+    assert 0 < scores[3] < 1 and 0 < scores[2] < 1
+    assert np.all(lexical_scores("the papers", TEXTS) == 1.0)
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Filters"})
+    db.papers = [
+        db.insert_row(
+            "papers", {"project_id": db.project_id, "title": f"Paper {i}", "abstract": text, "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"}
+        )
+        for i, text in enumerate(TEXTS + ["Crop yields under drought"])
+    ]
+    return db
+
+
+def add_filter(db, text, scope="abstract", timestamp="2025-01-01T00:00:00+00:00"):
+    return db.insert_row(
+        "filters", {"project_id": db.project_id, "filter_scope": scope, "user_specified_text_filter": text, "timestamp": timestamp}
+    )
+
+
+@pytest.fixture
+def llm():
+    return FakeLLMClient(answer=lambda prompt: json.dumps({"passed": "radiograph" in prompt.split("Paper:")[1]}))
+
+
+def make_service(db, llm, settings=FilterSettings()):
+    engine = FilterEngine(ExtractionEngine(WorkQueue(), llm), settings)
+    return FilterService(engine=engine, filter_dal=FilterDAL(db), paper_dal=PaperDAL(db), project_dal=AsyncProjectDAL(db))
+
+
+@pytest.mark.asyncio
+async def test_cascade_only_asks_the_llm_about_ambiguous_papers(db, llm):
+    flt = add_filter(db, "Deep learning on chest radiographs\nexclude: survey")
+    response = (await make_service(db, llm).evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id))).unwrap()
+
+    [summary] = response.filters
+    # Paper 1 is a survey, papers 2 and 4 share no term with the criterion.
+    assert (summary.evaluated, summary.by_rule, summary.by_lexical, summary.by_llm) == (5, 1, 2, 2)
+    assert (summary.passed, summary.failed) == (1, 4)
+    assert len(llm.calls) == 2
+    rows = {row["paper_id"]: row for row in db.tables["paper_filter_results"]}
+    assert rows[db.papers[1]["id"]]["decided_by"] == "rule"
+    assert rows[db.papers[4]["id"]]["decided_by"] == "lexical" and rows[db.papers[4]["id"]]["passed"] is False
+    assert rows[db.papers[0]["id"]]["id"] == filter_result_id(db.papers[0]["id"], flt["id"])
+    assert rows[db.papers[0]["id"]]["passed"] is True
+
+    # Re-evaluating overwrites the previous outcomes.
+    await make_service(db, llm).evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id))
+    assert len(db.tables["paper_filter_results"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_rule_only_filters_and_lexical_accepts_skip_the_llm(db, llm):
+    rules = add_filter(db, "require: radiograph*", timestamp="2025-01-02T00:00:00+00:00")
+    add_filter(db, "deep learning radiographs")
+    response = (
+        await make_service(db, llm, FilterSettings(accept_above=0.9)).evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id))
+    ).unwrap()
+
+    # The rule-only filter is cheaper, so it runs first although it was created last.
+    lexical, rule_only = response.filters
+    assert (rule_only.passed, rule_only.failed, rule_only.by_rule) == (3, 2, 5)
+    assert (lexical.evaluated, lexical.passed, lexical.by_lexical, lexical.skipped) == (3, 2, 3, 2)
+    assert llm.calls == []
+    skipped = [row for row in db.tables["paper_filter_results"] if row["decided_by"] == "skipped"]
+    assert {row["paper_id"] for row in skipped} == {db.papers[3]["id"], db.papers[4]["id"]}
+    assert all(row["passed"] is None and row["filter_id"] != rules["id"] for row in skipped)
+
+
+@pytest.mark.asyncio
+async def test_weak_lexical_matches_go_to_the_llm_with_the_scoped_text(db, llm):
+    add_filter(db, "Randomized trials of deep learning for chest radiographs", scope="abstract")
+    response = (await make_service(db, llm).evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id))).unwrap()
+
+    # Papers 2 and 4 share no word with the criterion; paper 3, sharing just "deep learning", is left to the LLM.
+    [summary] = response.filters
+    assert (summary.by_lexical, summary.by_llm) == (2, 3)
+    prompts = [call.prompt.split("Paper:\n")[1] for call in llm.calls]
+    assert "A survey of deep learning for radiographs\n" in prompts
+    assert all("Title:" not in prompt and "Paper " not in prompt for prompt in prompts)
+
+    # A threshold fails weak matches too.
+    strict = FilterSettings(reject_below=0.5)
+    response = (await make_service(db, llm, strict).evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id))).unwrap()
+    assert response.filters[0].by_lexical == 4
+
+
+@pytest.mark.asyncio
+async def test_filters_are_ordered_by_expected_cost_per_rejected_paper(db, llm):
+    engine = make_service(db, llm).engine
+    broad = PreparedFilter.from_row({"id": "broad", "user_specified_text_filter": "Anything about medicine"})
+    narrow = PreparedFilter.from_row({"id": "narrow", "user_specified_text_filter": "Chest radiographs"})
+    rule = PreparedFilter.from_row({"id": "rule", "user_specified_text_filter": "require: deep"})
+    assert [f.id for f in engine.order([broad, narrow, rule])] == ["rule", "broad", "narrow"]
+
+    # Both LLM filters cost a call per paper, but the narrow one removes far more papers per call.
+    engine.stats["broad"] = FilterStats(evaluated=100, passed=95, llm_calls=100)
+    engine.stats["narrow"] = FilterStats(evaluated=100, passed=10, llm_calls=100)
+    assert [f.id for f in engine.order([broad, narrow, rule])] == ["rule", "narrow", "broad"]
+
+    decisions = await engine.evaluate_page([broad, narrow, rule], db.papers)
+    assert [d.decided_by for d in decisions["broad"]].count("skipped") == 5 - sum(1 for d in decisions["narrow"] if d.passed)
+    assert len(llm.calls) == sum(1 for d in decisions["narrow"] if d.decided_by == "llm") + sum(
+        1 for d in decisions["broad"] if d.decided_by == "llm"
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_llm_calls_leave_papers_undecided(db):
+    add_filter(db, "Deep learning on chest radiographs")
+    llm = FakeLLMClient(answer=lambda prompt: "maybe")
+    response = (await make_service(db, llm).evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id))).unwrap()
+    assert response.filters[0].undecided == 3 and response.status == ResponseStatus.DEGRADED
+    assert len(db.tables["paper_filter_results"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_evaluation_is_paged_and_keeps_stored_result_ids(db, llm):
+    flt = add_filter(db, "Deep learning on chest radiographs\nexclude: survey")
+    stored = db.insert_row("paper_filter_results", {"paper_id": db.papers[3]["id"], "filter_id": flt["id"], "passed": True})
+    service = make_service(db, llm)
+    pages, cursor = [], None
+    while True:
+        options = EvaluateFiltersOptions(page_size=2, cursor=cursor)
+        response = (await service.evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id, options=options))).unwrap()
+        pages.append(response.filters[0].evaluated)
+        cursor = response.next_cursor
+        if cursor is None:
+            break
+
+    assert pages == [2, 2, 1]
+    rows = db.tables["paper_filter_results"]
+    assert len(rows) == 5
+    assert next(row for row in rows if row["paper_id"] == db.papers[3]["id"])["id"] == stored["id"]
+    assert db.find("paper_filter_results", stored["id"])["passed"] is False
+    invalid = EvaluateFiltersOptions(cursor="not a cursor")
+    assert isinstance(
+        (await service.evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id, options=invalid))).failure(), InvalidRequestError
+    )
+
+
+@pytest.mark.asyncio
+async def test_filter_requests_are_validated(db, llm):
+    service = make_service(db, llm)
+    assert isinstance((await service.evaluate_filters(EvaluateFiltersRequest(project_id=uuid4()))).failure(), NotFoundError)
+    options = EvaluateFiltersOptions(filter_ids=[uuid4()])
+    result = await service.evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id, options=options))
+    assert isinstance(result.failure(), InvalidRequestError)
+    add_filter(db, "require: (unbalanced")
+    assert isinstance((await service.evaluate_filters(EvaluateFiltersRequest(project_id=db.project_id))).failure(), InvalidRequestError)
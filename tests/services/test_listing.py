@@ -0,0 +1,76 @@
+from uuid import uuid4
+
+import pytest
+from app.api import extractions, papers, projects
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.db.pagination import encode_cursor
+from app.db.papers_dal import PaperDAL
+from app.models.paper_api_models import ListPapersRequest
+from app.services.errors import InvalidRequestError
+from app.services.extraction_results_service import ExtractionResultsService
+from app.services.paper_service import PaperService
+from app.services.project_service import ProjectService
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.fake_postgrest import FakePostgrest
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Listing", "created_at": "2025-01-01T00:00:00+00:00"})
+    for i in range(5):
+        db.seed("papers", {"project_id": db.project_id, "title": f"Paper {i}", "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"})
+    return db
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.include_router(papers.router)
+    app.include_router(extractions.router)
+    app.dependency_overrides[projects.get_project_service] = lambda: ProjectService(dal=AsyncProjectDAL(db))
+    app.dependency_overrides[papers.get_paper_service] = lambda: PaperService(dal=PaperDAL(db))
+    app.dependency_overrides[extractions.get_extraction_results_service] = lambda: ExtractionResultsService(dal=ExtractionResultsDAL(db))
+    return TestClient(app)
+
+
+@pytest.mark.asyncio
+async def test_list_papers_rejects_invalid_cursor(db):
+    service = PaperService(dal=PaperDAL(db))
+    result = await service.list_papers(ListPapersRequest(project_id=db.project_id, cursor="garbage"))
+    assert isinstance(result.failure(), InvalidRequestError)
+
+
+def test_papers_endpoint_follows_cursor(client, db):
+    first = client.get(f"/projects/{db.project_id}/papers", params={"page_size": 3}).json()
+    second = client.get(f"/projects/{db.project_id}/papers", params={"page_size": 3, "cursor": first["next_cursor"]}).json()
+
+    assert [p["title"] for p in first["items"]] == ["Paper 0", "Paper 1", "Paper 2"]
+    assert [p["title"] for p in second["items"]] == ["Paper 3", "Paper 4"]
+    assert second["next_cursor"] is None
+
+
+def test_crafted_cursors_are_rejected(client, db):
+    cursor = encode_cursor(("2025-01-01T00:00:00+00:00", f'{uuid4()}"),id.neq.("x'))
+    assert client.get(f"/projects/{db.project_id}/papers", params={"cursor": cursor}).status_code == 400
+
+
+def test_page_size_is_capped(client, db):
+    assert client.get(f"/projects/{db.project_id}/papers", params={"page_size": 10_000}).status_code == 422
+
+
+def test_bad_cursor_is_400(client, db):
+    assert client.get("/projects/", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_projects_and_extractions_endpoints(client, db):
+    projects_page = client.get("/projects/").json()
+    extractions_page = client.get(f"/projects/{db.project_id}/extractions").json()
+
+    assert [p["project_id"] for p in projects_page["items"]] == [db.project_id]
+    assert extractions_page["items"] == []
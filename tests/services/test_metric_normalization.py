@@ -0,0 +1,107 @@
+from uuid import uuid4
+
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.models.extraction_api_models import ListExtractionsRequest, NormalizeFieldRequest
+from app.models.shared import ResponseStatus
+from app.services.errors import NotFoundError
+from app.services.extraction_results_service import ExtractionResultsService
+from app.services.metric_normalization import normalize_values
+
+from tests.fake_postgrest import FakePostgrest
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("AUC 0.87 (95% CI 0.82–0.91)", (0.87, None, 0.82, 0.91, None)),
+        ("n=1,204", (1204.0, None, None, None, 1204)),
+        ("12.5 ms", (0.0125, "s", None, None, None)),
+        ("accuracy 91.2% (88.1-94.3), n = 45", (0.912, "ratio", 0.881, 0.943, 45)),
+        ("-0.3 (-0.5 to -0.1)", (-0.3, None, -0.5, -0.1, None)),
+        ("1.5 MB", (1.5e6, "B", None, None, None)),
+        ("2 min", (120.0, "s", None, None, None)),
+        ("3 studies", (3.0, None, None, None, None)),
+        ("not reported", (None, None, None, None, None)),
+    ],
+)
+def test_normalize_values(text, expected):
+    columns = normalize_values([text]).columns(0)
+    actual = tuple(columns[name] for name in ("numeric_value", "numeric_unit", "ci_lower", "ci_upper", "sample_size"))
+    assert actual == pytest.approx(expected)
+
+
+def test_batch_keeps_input_order_and_handles_missing_values():
+    normalized = normalize_values(["12 ms", None, "n=5", "12 ms"])
+    assert normalized.value.tolist()[0] == normalized.value.tolist()[3] == pytest.approx(0.012)
+    assert normalized.unit == ["s", None, None, "s"]
+    assert normalized.parsed.tolist() == [True, False, True, True]
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Metrics"})
+    config = db.insert_row("extraction_configs", {"project_id": db.project_id})
+    db.field = db.insert_row("extraction_fields", {"config_id": config["id"], "field_name": "latency"})
+    for i, value in enumerate(["12.5 ms", "0.2 s", "unknown"]):
+        paper = db.insert_row("papers", {"project_id": db.project_id, "title": f"Paper {i}", "created_at": f"2025-01-0{i + 1}T00:00:00+00:00"})
+        db.seed(
+            "extracted_fields",
+            {
+                "paper_id": paper["id"],
+                "extraction_field_id": db.field["id"],
+                "field_value": value,
+                "created_at": f"2025-01-0{i + 1}T00:00:00+00:00",
+            },
+        )
+    return db
+
+
+@pytest.mark.asyncio
+async def test_normalize_field_stores_numbers_next_to_text(db):
+    service = ExtractionResultsService(dal=ExtractionResultsDAL(db), project_dal=AsyncProjectDAL(db))
+
+    response = (await service.normalize_field(NormalizeFieldRequest(project_id=db.project_id, field_id=db.field["id"]))).unwrap()
+
+    assert (response.values, response.parsed, response.failed, response.status) == (3, 2, 0, ResponseStatus.SUCCESS)
+    items = (await service.list_extractions(ListExtractionsRequest(project_id=db.project_id))).unwrap().items
+    assert [(item.field_value, item.numeric_value, item.numeric_unit) for item in items] == [
+        ("12.5 ms", 0.0125, "s"),
+        ("0.2 s", 0.2, "s"),
+        ("unknown", None, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_normalize_unknown_field_is_not_found(db):
+    service = ExtractionResultsService(dal=ExtractionResultsDAL(db), project_dal=AsyncProjectDAL(db))
+    result = await service.normalize_field(NormalizeFieldRequest(project_id=db.project_id, field_id=uuid4()))
+    assert isinstance(result.failure(), NotFoundError)
+
+
+@pytest.mark.asyncio
+async def test_normalize_field_only_updates_the_values_it_read(db):
+    dal = ExtractionResultsDAL(db)
+    service = ExtractionResultsService(dal=dal, project_dal=AsyncProjectDAL(db))
+    first, second, third = db.tables["extracted_fields"]
+    write = dal.update_normalized_values
+
+    # Between reading and writing, one value is re-extracted and another is deleted.
+    async def update_after_concurrent_writes(rows):
+        db.find("extracted_fields", first["id"])["field_value"] = "3 s"
+        db.tables["extracted_fields"].remove(db.find("extracted_fields", second["id"]))
+        return await write(rows)
+
+    dal.update_normalized_values = update_after_concurrent_writes
+    response = (await service.normalize_field(NormalizeFieldRequest(project_id=db.project_id, field_id=db.field["id"]))).unwrap()
+
+    assert (response.values, response.status) == (3, ResponseStatus.SUCCESS)
+    rows = db.tables["extracted_fields"]
+    assert [(row["id"], row["field_value"], row.get("numeric_value")) for row in rows] == [
+        (first["id"], "3 s", None),
+        (third["id"], "unknown", None),
+    ]
+    assert "normalized_at" in db.find("extracted_fields", third["id"])
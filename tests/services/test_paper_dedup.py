@@ -0,0 +1,129 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.papers_dal import PaperDAL
+from app.services.paper_dedup import DedupIndex, DedupIndexRegistry, normalize_arxiv_id, normalize_doi, normalize_pmid, paper_keys, title_hash
+from app.services.paper_ingestion import IngestFormat, PaperIngestor, RawRecord
+from app.services.paper_service import PaperService
+
+from tests.fake_postgrest import FakePostgrest
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_identifier_normalization():
+    assert normalize_doi("https://doi.org/10.1000/ABC") == normalize_doi("doi: 10.1000/abc") == "10.1000/abc"
+    assert normalize_pmid("PMID: 00012345") == normalize_pmid(12345) == "12345"
+    assert normalize_pmid("n/a") is None
+    assert normalize_arxiv_id("arXiv:2401.00001v3") == normalize_arxiv_id("https://arxiv.org/pdf/2401.00001v1.pdf") == "2401.00001"
+    assert title_hash("Déjà  Vu: A Study!") == title_hash("deja vu a study")
+    assert title_hash("!!!") is None
+
+
+def test_paper_keys_strongest_first():
+    keys = paper_keys({"title": "T", "doi": "10.1/x", "arxiv_id": "2401.1"})
+    assert [key.split(":")[0] for key in keys] == ["doi", "arxiv", "title"]
+
+
+@pytest.mark.asyncio
+async def test_registry_loads_each_project_once():
+    registry = DedupIndexRegistry(max_projects=2)
+    loads = []
+
+    def loader(project):
+        async def load():
+            loads.append(project)
+            await asyncio.sleep(0.01)
+            yield [{"id": "p1", "title": f"Paper of {project}"}]
+
+        return load
+
+    project = uuid4()
+    first, second = await asyncio.gather(registry.get(project, loader(project)), registry.get(project, loader(project)))
+
+    assert first is second
+    assert loads == [project]
+    assert first.find(paper_keys({"title": f"paper of {project}"})) == "p1"
+
+
+@pytest.mark.asyncio
+async def test_registry_evicts_least_recently_used():
+    registry = DedupIndexRegistry(max_projects=2)
+
+    async def empty():
+        yield []
+
+    a, b, c = uuid4(), uuid4(), uuid4()
+    index_a = await registry.get(a, empty)
+    await registry.get(b, empty)
+    await registry.get(a, empty)
+    await registry.get(c, empty)
+
+    assert await registry.get(a, empty) is index_a
+    assert registry.stats.evictions == 1
+    assert registry.stats.loads == 3
+
+
+@pytest.mark.asyncio
+async def test_ingestion_skips_papers_already_in_project():
+    db = FakePostgrest()
+    project_id = str(uuid4())
+    db.seed("projects", {"id": project_id, "description": "Dedup", "created_at": "2025-01-01T00:00:00+00:00"})
+    db.seed("papers", {"project_id": project_id, "title": "Stored from PubMed", "pmid": "123", "created_at": "2025-01-01T00:00:00+00:00"})
+    registry = DedupIndexRegistry()
+    service = PaperService(dal=PaperDAL(db), project_dal=AsyncProjectDAL(db), dedup_indexes=registry)
+
+    body = (
+        b'{"title": "Other title", "pmid": "PMID: 0123"}\n'
+        b'{"title": "STORED from pubmed.", "arxiv_id": "2401.00001"}\n'
+        b'{"title": "New paper", "doi": "10.1/new"}\n'
+    )
+    response = (await service.ingest_papers(project_id, stream(body), IngestFormat.NDJSON)).unwrap()
+    again = (
+        await service.ingest_papers(project_id, stream(b'{"title": "x", "doi": "https://doi.org/10.1/NEW"}\n'), IngestFormat.NDJSON)
+    ).unwrap()
+
+    assert (response.inserted, response.duplicates) == (1, 2)
+    assert (again.inserted, again.duplicates) == (0, 1)
+    assert registry.stats.loads == 1
+    assert len(db.tables["papers"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_removed_from_index():
+    db = FakePostgrest()
+    db.fail_with = Exception("connection reset")
+    index = DedupIndex()
+    ingestor = PaperIngestor(PaperDAL(db), uuid4(), dedup=index)
+
+    await ingestor.add(RawRecord(line=1, row={"title": "Lost write", "doi": "10.1/lost"}))
+    await ingestor.finish()
+
+    assert ingestor.response.failed == 1
+    assert len(index) == 0
+
+
+@pytest.mark.asyncio
+async def test_aborted_ingest_can_be_retried():
+    db = FakePostgrest()
+    project_id = str(uuid4())
+    db.seed("projects", {"id": project_id, "description": "Dedup", "created_at": "2025-01-01T00:00:00+00:00"})
+    registry = DedupIndexRegistry()
+    service = PaperService(dal=PaperDAL(db), project_dal=AsyncProjectDAL(db), dedup_indexes=registry)
+    body = b'{"title": "Queued before the abort", "doi": "10.1/queued"}\n'
+
+    async def disconnected():
+        yield body
+        raise ConnectionError("client disconnected")
+
+    aborted = await service.ingest_papers(project_id, disconnected(), IngestFormat.NDJSON)
+    retried = (await service.ingest_papers(project_id, stream(body), IngestFormat.NDJSON)).unwrap()
+
+    assert aborted.failure()
+    assert (retried.inserted, retried.duplicates) == (1, 0)
+    assert len(db.tables["papers"]) == 1
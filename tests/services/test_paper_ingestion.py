@@ -0,0 +1,157 @@
+import json
+from uuid import uuid4
+
+import pytest
+from app.api import papers
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.bulk_writer import BulkWriteSettings
+from app.db.papers_dal import PaperDAL
+from app.models.shared import ResponseStatus
+from app.services import paper_ingestion
+from app.services.paper_ingestion import PaperIngestor, parse_csv, parse_ndjson
+from app.services.paper_service import PaperService
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.fake_postgrest import FakePostgrest
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(records):
+    return [record async for record in records]
+
+
+@pytest.mark.asyncio
+async def test_parse_ndjson_across_chunk_boundaries():
+    body = '{"title": "Ünïcode"}\n\nnot json\n[1]\n{"title": "last"}'.encode()
+    records = await collect(parse_ndjson(stream(*(body[i : i + 3] for i in range(0, len(body), 3)))))
+
+    assert [(r.line, r.row) for r in records if r.error is None] == [(1, {"title": "Ünïcode"}), (5, {"title": "last"})]
+    assert [(r.line, r.error.split(":")[0]) for r in records if r.error] == [(3, "invalid JSON"), (4, "expected a JSON object")]
+
+
+@pytest.mark.asyncio
+async def test_parse_csv_quoted_newlines_and_empty_cells():
+    body = b'title,abstract,doi\r\n"A, title","two\nlines",\nB,,10.1/x\nC,only-two\n'
+    records = await collect(parse_csv(stream(body[:20], body[20:])))
+
+    assert records[0].row == {"title": "A, title", "abstract": "two\nlines", "doi": None}
+    assert (records[1].line, records[1].row) == (4, {"title": "B", "abstract": None, "doi": "10.1/x"})
+    assert records[2].error == "expected 3 columns, got 2"
+
+
+@pytest.mark.asyncio
+async def test_oversized_record_is_rejected_without_buffering(monkeypatch):
+    monkeypatch.setattr(paper_ingestion, "MAX_RECORD_CHARS", 10)
+    body = [b'{"title": "', b"x" * 20, b"x" * 20, b'"}\n{"title": "ok"}\n']
+    records = await collect(parse_ndjson(stream(*body)))
+
+    assert [(r.line, r.error) for r in records] == [(1, "record too large"), (2, None)]
+
+
+@pytest.mark.asyncio
+async def test_ingestor_counts_inserted_duplicates_and_rejected():
+    db = FakePostgrest()
+    project_id = uuid4()
+    dal = PaperDAL(db)
+    first = PaperIngestor(dal, project_id, batch_size=2)
+    await first.add(paper_ingestion.RawRecord(line=1, row={"title": "Seen", "doi": "10.1/SEEN"}))
+    await first.finish()
+
+    ingestor = PaperIngestor(dal, project_id, batch_size=2)
+    rows = [
+        {"title": "New one", "doi": "10.1/a"},
+        {"title": "Seen again", "doi": "10.1/seen"},
+        {"title": "  "},
+        {"title": "Same   Title"},
+        {"title": "same title"},
+    ]
+    for line, row in enumerate(rows, start=1):
+        await ingestor.add(paper_ingestion.RawRecord(line=line, row=row))
+    response = await ingestor.finish()
+
+    assert (response.inserted, response.duplicates, response.rejected, response.failed) == (2, 2, 1, 0)
+    assert response.errors[0].line == 3
+    assert len(db.tables["papers"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_ingestor_bounds_writes_in_flight():
+    db = FakePostgrest()
+    dal = PaperDAL(db, bulk_settings=BulkWriteSettings(max_rows=10, max_concurrency=2))
+    in_flight, peak = 0, 0
+    original = dal.insert_papers
+
+    async def tracked(rows):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await original(rows)
+        finally:
+            in_flight -= 1
+
+    dal.insert_papers = tracked
+    ingestor = PaperIngestor(dal, uuid4())
+    for i in range(95):
+        await ingestor.add(paper_ingestion.RawRecord(line=i + 1, row={"title": f"Paper {i}"}))
+    response = await ingestor.finish()
+
+    assert response.inserted == 95
+    assert peak <= 2
+
+
+@pytest.mark.asyncio
+async def test_ingestor_reports_failed_batches_as_degraded():
+    db = FakePostgrest()
+    db.fail_with = Exception("statement timeout")
+    ingestor = PaperIngestor(PaperDAL(db), uuid4())
+    await ingestor.add(paper_ingestion.RawRecord(line=1, row={"title": "T"}))
+    response = await ingestor.finish()
+
+    assert response.failed == 1
+    assert response.write_errors == ["statement timeout"]
+    assert response.status == ResponseStatus.DEGRADED
+
+
+@pytest.fixture
+def client_and_db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Bulk", "created_at": "2025-01-01T00:00:00+00:00"})
+    app = FastAPI()
+    app.include_router(papers.router)
+    app.dependency_overrides[papers.get_paper_service] = lambda: PaperService(dal=PaperDAL(db), project_dal=AsyncProjectDAL(db))
+    return TestClient(app), db
+
+
+def test_bulk_endpoint_streams_ndjson(client_and_db):
+    client, db = client_and_db
+    body = "\n".join(json.dumps({"title": f"Paper {i}", "arxiv_id": f"2401.{i:05d}"}) for i in range(1200))
+
+    def chunks():
+        encoded = body.encode()
+        for i in range(0, len(encoded), 4096):
+            yield encoded[i : i + 4096]
+
+    response = client.post(f"/projects/{db.project_id}/papers:bulk", content=chunks(), headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1200
+    assert len(db.tables["papers"]) == 1200
+
+
+def test_bulk_endpoint_rejects_unknown_content_type(client_and_db):
+    client, db = client_and_db
+    response = client.post(f"/projects/{db.project_id}/papers:bulk", content=b"{}", headers={"Content-Type": "application/xml"})
+    assert response.status_code == 415
+
+
+def test_bulk_endpoint_unknown_project(client_and_db):
+    client, _ = client_and_db
+    response = client.post(f"/projects/{uuid4()}/papers:bulk", content=b"title\nA\n", headers={"Content-Type": "text/csv"})
+    assert response.json()["status"] == "NOT_FOUND"
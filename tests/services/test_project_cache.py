@@ -0,0 +1,155 @@
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from app.models.project_api_models import (
+    AddExtractionFieldsRequest,
+    CreateExtractionConfigRequest,
+    DeleteExtractionFieldsRequest,
+    DeleteProjectRequest,
+    ExtractionFieldRequest,
+    GetProjectRequest,
+)
+from app.models.shared import ResponseStatus
+from app.services.cache import InMemoryCacheBackend
+from app.services.project_cache import ProjectCache
+from app.services.project_service import ProjectService
+
+
+class CountingDAL:
+    def __init__(self):
+        self.projects = {}
+        self.configs = {}
+        self.reads = {"project": 0, "config": 0}
+
+    async def get_project_by_id(self, project_id, columns=None):
+        self.reads["project"] += 1
+        return self.projects.get(str(project_id))
+
+    async def delete_project(self, project_id):
+        return self.projects.pop(str(project_id), None) is not None
+
+    async def get_extraction_config_by_project(self, project_id, columns=None):
+        self.reads["config"] += 1
+        return self.configs.get(str(project_id))
+
+    async def create_extraction_config(self, project_id):
+        config = {"id": str(uuid4()), "project_id": str(project_id), "created_at": datetime.now(timezone.utc).isoformat()}
+        self.configs[str(project_id)] = config
+        return config
+
+    async def insert_extraction_fields(self, config_id, fields):
+        pass
+
+    async def delete_extraction_fields(self, field_ids):
+        pass
+
+
+@pytest.fixture
+def dal():
+    return CountingDAL()
+
+
+@pytest.fixture
+def cache():
+    return ProjectCache(InMemoryCacheBackend(max_entries=100))
+
+
+def make_project(dal):
+    project_id = uuid4()
+    dal.projects[str(project_id)] = {"id": str(project_id), "description": "Cached", "created_at": None}
+    return project_id
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_ttl_and_lru():
+    now = [0.0]
+    backend = InMemoryCacheBackend(max_entries=2, clock=lambda: now[0])
+    await backend.set("a", 1, ttl=10)
+    await backend.set("b", 2, ttl=1)
+    await backend.get("a")
+    await backend.set("c", 3, ttl=10)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == 1
+
+    now[0] = 10.0
+    assert await backend.get("a") is None
+    assert await backend.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_project_reads_hit_cache(dal, cache):
+    project_id = make_project(dal)
+    service = ProjectService(dal=dal, user_id="alice", cache=cache)
+
+    for _ in range(3):
+        result = await service.get_project(GetProjectRequest(project_id=project_id))
+        assert result.unwrap().status == ResponseStatus.SUCCESS
+
+    assert dal.reads["project"] == 1
+    assert cache.stats.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_scoped_per_user(dal, cache):
+    project_id = make_project(dal)
+    await ProjectService(dal=dal, user_id="alice", cache=cache).get_project(GetProjectRequest(project_id=project_id))
+    await ProjectService(dal=dal, user_id="bob", cache=cache).get_project(GetProjectRequest(project_id=project_id))
+    assert dal.reads["project"] == 2
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_cached(dal, cache):
+    service = ProjectService(dal=dal, user_id="alice", cache=cache)
+    project_id = uuid4()
+
+    for _ in range(2):
+        result = await service.get_project(GetProjectRequest(project_id=project_id))
+        assert result.unwrap().status == ResponseStatus.NOT_FOUND
+
+    assert dal.reads["project"] == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_project_invalidates(dal, cache):
+    project_id = make_project(dal)
+    service = ProjectService(dal=dal, user_id="alice", cache=cache)
+    await service.get_project(GetProjectRequest(project_id=project_id))
+
+    await service.delete_project(DeleteProjectRequest(project_id=project_id))
+    result = await service.get_project(GetProjectRequest(project_id=project_id))
+
+    assert result.unwrap().status == ResponseStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_create_extraction_config_invalidates_negative_entry(dal, cache):
+    service = ProjectService(dal=dal, user_id="alice", cache=cache)
+    project_id = uuid4()
+
+    created = await service.create_extraction_config(CreateExtractionConfigRequest(project_id=project_id, fields=[]))
+    duplicate = await service.create_extraction_config(CreateExtractionConfigRequest(project_id=project_id, fields=[]))
+
+    assert created.unwrap().status == ResponseStatus.SUCCESS
+    assert duplicate.failure() is not None
+    assert dal.reads["config"] == 2
+
+
+@pytest.mark.asyncio
+async def test_field_changes_invalidate_config(dal, cache):
+    service = ProjectService(dal=dal, user_id="alice", cache=cache)
+    project_id = uuid4()
+    config_id = UUID((await dal.create_extraction_config(project_id))["id"])
+
+    await service._read_extraction_config(project_id)
+    await service._read_extraction_config(project_id)
+    assert dal.reads["config"] == 1
+
+    await service.add_extraction_fields(config_id, AddExtractionFieldsRequest(fields=[ExtractionFieldRequest(field_name="n")]))
+    await service._read_extraction_config(project_id)
+    assert dal.reads["config"] == 2
+
+    await service.delete_extraction_fields(DeleteExtractionFieldsRequest(field_ids=[uuid4()]), config_id=config_id)
+    await service._read_extraction_config(project_id)
+    assert dal.reads["config"] == 3
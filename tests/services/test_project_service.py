@@ -21,7 +21,7 @@ class MockDAL:
         self.store = {}
         self.sources = {}
 
-    def create_project(self, description):
+    async def create_project(self, description):
         project_id = uuid4()
         now = datetime.now(timezone.utc)
         self.store[str(project_id)] = {
@@ -31,21 +31,27 @@ class MockDAL:
         }
         return self.store[str(project_id)]
 
-    def get_project_by_id(self, project_id):
+    async def get_project_by_id(self, project_id, columns=None):
         return self.store.get(str(project_id), None)
 
-    def delete_project(self, project_id):
+    async def delete_project(self, project_id):
         return self.store.pop(str(project_id), None) is not None
 
-    def delete_project_sources(self, project_id):
+    async def delete_project_sources(self, project_id):
         self.sources[str(project_id)] = []
 
-    def insert_project_sources(self, source_rows):
+    async def insert_project_sources(self, source_rows):
         if not source_rows:
             return
         pid = source_rows[0]["project_id"]
         self.sources[pid] = source_rows
 
+    async def replace_project_sources(self, project_id, source_rows):
+        if str(project_id) not in self.store:
+            return None
+        self.sources[str(project_id)] = source_rows
+        return len(source_rows)
+
 
 @pytest.fixture
 def service():
@@ -67,7 +73,7 @@ async def test_create_project_success(service):
 @pytest.mark.asyncio
 async def test_create_project_degraded(service):
     class DegradedDAL(MockDAL):
-        def create_project(self, description):
+        async def create_project(self, description):
             return None
 
     degraded_service = ProjectService(dal=DegradedDAL())
@@ -81,7 +87,7 @@ async def test_create_project_degraded(service):
 @pytest.mark.asyncio
 async def test_create_project_failure():
     class FailingDAL(MockDAL):
-        def create_project(self, description):
+        async def create_project(self, description):
             raise DatabaseError("Insert failed")
 
     service = ProjectService(dal=FailingDAL())
@@ -93,7 +99,7 @@ async def test_create_project_failure():
 
 @pytest.mark.asyncio
 async def test_get_project_success(service):
-    created = service.dal.create_project("Saved project")
+    created = await service.dal.create_project("Saved project")
     req = GetProjectRequest(project_id=UUID(created["id"]))
     result = await service.get_project(req)
     assert isinstance(result, Success)
@@ -115,7 +121,7 @@ async def test_get_project_not_found(service):
 @pytest.mark.asyncio
 async def test_get_project_failure():
     class FailingDAL(MockDAL):
-        def get_project_by_id(self, project_id):
+        async def get_project_by_id(self, project_id, columns=None):
             raise DatabaseError("Fetch error")
 
     service = ProjectService(dal=FailingDAL())
@@ -127,7 +133,7 @@ async def test_get_project_failure():
 
 @pytest.mark.asyncio
 async def test_delete_project_success(service):
-    created = service.dal.create_project("Project to delete")
+    created = await service.dal.create_project("Project to delete")
     req = DeleteProjectRequest(project_id=UUID(created["id"]))
     result = await service.delete_project(req)
     assert isinstance(result, Success)
@@ -145,7 +151,7 @@ async def test_delete_project_not_found(service):
 @pytest.mark.asyncio
 async def test_delete_project_failure():
     class FailingDAL(MockDAL):
-        def delete_project(self, project_id):
+        async def delete_project(self, project_id):
             raise DatabaseError("Delete failed")
 
     service = ProjectService(dal=FailingDAL())
@@ -157,7 +163,7 @@ async def test_delete_project_failure():
 
 @pytest.mark.asyncio
 async def test_create_project_sources(service):
-    created = service.dal.create_project("Source test project")
+    created = await service.dal.create_project("Source test project")
     project_id = UUID(created["id"])
     req = CreateProjectSourcesRequest(
         project_id=project_id,
@@ -190,11 +196,11 @@ async def test_create_project_sources_project_not_found(service):
 @pytest.mark.asyncio
 async def test_create_project_sources_insert_failure():
     class FailingInsertDAL(MockDAL):
-        def insert_project_sources(self, rows):
+        async def replace_project_sources(self, project_id, source_rows):
             raise DatabaseError("Insert failed")
 
     dal = FailingInsertDAL()
-    created = dal.create_project("Failing insert test")
+    created = await dal.create_project("Failing insert test")
     service = ProjectService(dal=dal)
 
     req = CreateProjectSourcesRequest(project_id=UUID(created["id"]), sources=[ProjectSourceRequest(backend_name="Fail", backend_query="fail")])
@@ -22,7 +22,7 @@ class MockDAL:
         self.configs = {}
         self.fields = {}
 
-    def create_extraction_config(self, project_id):
+    async def create_extraction_config(self, project_id):
         if str(project_id) in self.configs:
             raise DatabaseError("duplicate key value violates unique constraint")
         config_id = str(uuid4())
@@ -30,20 +30,20 @@ class MockDAL:
         self.configs[str(project_id)] = config
         return config
 
-    def insert_extraction_fields(self, config_id, fields):
+    async def insert_extraction_fields(self, config_id, fields):
         if not fields:
             return
         if str(config_id) not in self.fields:
             self.fields[str(config_id)] = []
         self.fields[str(config_id)].extend(fields)
 
-    def delete_extraction_config(self, config_id):
+    async def delete_extraction_config(self, config_id):
         self.fields.pop(str(config_id), None)
         for pid, config in list(self.configs.items()):
             if config["id"] == str(config_id):
                 del self.configs[pid]
 
-    def delete_extraction_fields(self, field_ids):
+    async def delete_extraction_fields(self, field_ids):
         found = False
         for field_list in self.fields.values():
             before = len(field_list)
@@ -54,34 +54,8 @@ class MockDAL:
         if not found:
             raise DatabaseError("No matching field IDs")
 
-    @property
-    def client(self):
-        class DummyClient:
-            def table(inner_self, name):
-                class Table:
-                    def __init__(self):
-                        self.filter_value = None  # renamed to avoid underscore clash
-
-                    def select(self, *args):
-                        return self
-
-                    def eq(self, field, value):
-                        self.filter_value = value
-                        return self
-
-                    def limit(self, value):
-                        return self
-
-                    def execute(inner_self2):
-                        # Use outer self (`self` of MockDAL)
-                        for cfg in self.configs.values():
-                            if cfg["project_id"] == inner_self2.filter_value:
-                                return type("R", (), {"data": [cfg]})
-                        return type("R", (), {"data": []})
-
-                return Table()
-
-        return DummyClient()
+    async def get_extraction_config_by_project(self, project_id, columns=None):
+        return self.configs.get(str(project_id))
 
 
 @pytest.fixture
@@ -137,7 +111,7 @@ async def test_add_extraction_fields_success(service):
 @pytest.mark.asyncio
 async def test_add_extraction_fields_failure():
     class FailingInsertDAL(MockDAL):
-        def insert_extraction_fields(self, config_id, fields):
+        async def insert_extraction_fields(self, config_id, fields):
             raise DatabaseError("Insert failed")
 
     service = ProjectService(dal=FailingInsertDAL())
@@ -168,7 +142,7 @@ async def test_delete_extraction_fields_success(service):
 @pytest.mark.asyncio
 async def test_delete_extraction_fields_failure():
     class FailingDeleteDAL(MockDAL):
-        def delete_extraction_fields(self, field_ids):
+        async def delete_extraction_fields(self, field_ids):
             raise DatabaseError("Delete failed")
 
     service = ProjectService(dal=FailingDeleteDAL())
@@ -202,28 +176,11 @@ async def test_delete_extraction_config_not_found(service):
 @pytest.mark.asyncio
 async def test_delete_extraction_config_failure():
     class FailingDeleteDAL(MockDAL):
-        def delete_extraction_config(self, config_id):
+        async def delete_extraction_config(self, config_id):
             raise DatabaseError("Delete failed")
 
-        def client(self):
-            class Client:
-                def table(self, _):
-                    class Query:
-                        def select(self, *_):
-                            return self
-
-                        def eq(self, field, value):
-                            return self
-
-                        def limit(self, _):
-                            return self
-
-                        def execute(self):
-                            return type("R", (), {"data": [{"id": str(uuid4())}]})
-
-                    return Query()
-
-            return Client()
+        async def get_extraction_config_by_project(self, project_id, columns=None):
+            return {"id": str(uuid4()), "project_id": str(project_id)}
 
     service = ProjectService(dal=FailingDeleteDAL())
     req = DeleteExtractionConfigRequest(project_id=uuid4())
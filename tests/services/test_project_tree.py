@@ -0,0 +1,63 @@
+from uuid import UUID, uuid4
+
+import pytest
+from app.api.projects import get_project_service, router
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.models.project_api_models import GetProjectRequest
+from app.models.shared import ResponseStatus
+from app.services.project_service import ProjectService
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.fake_postgrest import FakePostgrest
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    project_id = str(uuid4())
+    config_id = str(uuid4())
+    db.seed("projects", {"id": project_id, "description": "Tree project", "created_at": "2025-01-01T00:00:00+00:00"})
+    db.seed("project_sources", {"project_id": project_id, "backend_name": "arXiv", "backend_query": "llm"})
+    db.seed("extraction_configs", {"id": config_id, "project_id": project_id, "created_at": "2025-01-01T00:00:00+00:00"})
+    db.seed(
+        "extraction_fields",
+        {"config_id": config_id, "field_name": "auc", "description": "AUC", "created_at": "2025-01-02T00:00:00+00:00"},
+        {"config_id": config_id, "field_name": "n", "description": None, "created_at": "2025-01-01T00:00:00+00:00"},
+    )
+    db.project_id = project_id
+    return db
+
+
+@pytest.mark.asyncio
+async def test_get_project_tree_in_one_round_trip(db):
+    service = ProjectService(dal=AsyncProjectDAL(db))
+
+    result = await service.get_project_tree(GetProjectRequest(project_id=UUID(db.project_id)))
+    response = result.unwrap()
+
+    assert db.round_trips == 1
+    assert response.status == ResponseStatus.SUCCESS
+    assert [s.backend_name for s in response.sources] == ["arXiv"]
+    assert [f.field_name for f in response.extraction_config.fields] == ["n", "auc"]
+
+
+@pytest.mark.asyncio
+async def test_get_project_tree_not_found(db):
+    service = ProjectService(dal=AsyncProjectDAL(db))
+    result = await service.get_project_tree(GetProjectRequest(project_id=uuid4()))
+    assert result.unwrap().status == ResponseStatus.NOT_FOUND
+
+
+def test_full_endpoint_serializes_tree(db):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_project_service] = lambda: ProjectService(dal=AsyncProjectDAL(db))
+
+    response = TestClient(app).get(f"/projects/{db.project_id}/full")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["project_id"] == db.project_id
+    assert body["status"] == "SUCCESS"
+    assert body["extraction_config"]["fields"][0]["field_name"] == "n"
@@ -0,0 +1,93 @@
+from uuid import uuid4
+
+import pytest
+from app.api import extractions
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.extraction_results_dal import ExtractionResultsDAL
+from app.services.extraction_results_service import ExtractionResultsService
+from app.services.result_matrix import ResultMatrixBuilder
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.fake_postgrest import FakePostgrest
+
+
+def paper(paper_id, values=(), results=()):
+    return {
+        "id": paper_id,
+        "extracted_fields": [{"extraction_field_id": field, "field_value": value} for field, value in values],
+        "paper_filter_results": [{"filter_id": filter_id, "passed": passed} for filter_id, passed in results],
+    }
+
+
+@pytest.fixture
+def matrix():
+    builder = ResultMatrixBuilder()
+    builder.add_papers(
+        [
+            paper("p1", [("auc", "0.91"), ("n", "120")], [("f1", True), ("f2", False)]),
+            paper("p2", [("auc", ""), ("auc", "0.87 (0.82–0.91)")], [("f1", False), ("f2", None)]),
+        ]
+    )
+    builder.add_papers([paper("p3", [("n", None)], [("f1", True)]), paper("p4")])
+    return builder.build()
+
+
+def test_values_are_dictionary_encoded(matrix):
+    assert matrix.paper_ids == ["p1", "p2", "p3", "p4"]
+    assert matrix.field_ids == ["auc", "n"]
+    assert matrix.value_papers.tolist() == [0, 0, 1, 1, 2]
+    assert [matrix.value(i) for i in range(matrix.value_count)] == ["0.91", "120", "", "0.87 (0.82–0.91)", ""]
+    assert matrix.field_values("auc") == ["0.91", "", "0.87 (0.82–0.91)"]
+    assert matrix.field_values("missing") == []
+
+
+def test_field_completeness_counts_papers_with_non_empty_values(matrix):
+    assert matrix.value_counts().tolist() == [3, 2]
+    assert matrix.papers_with_value().tolist() == [2, 1]
+    assert matrix.completeness().tolist() == [0.5, 0.25]
+
+
+def test_filter_counts_come_from_bitsets(matrix):
+    evaluated, passed = matrix.filter_counts()
+    assert matrix.filter_ids == ["f1", "f2"]
+    # Skipped results (passed is None) do not count as evaluated.
+    assert evaluated.tolist() == [3, 1]
+    assert passed.tolist() == [2, 0]
+    assert matrix.evaluated.shape == (2, 1)
+
+
+def test_empty_matrix():
+    matrix = ResultMatrixBuilder().build()
+    assert matrix.paper_count == 0
+    assert matrix.completeness().tolist() == []
+    assert [counts.tolist() for counts in matrix.filter_counts()] == [[], []]
+
+
+def test_summary_endpoint():
+    db = FakePostgrest()
+    project_id = str(uuid4())
+    db.seed("projects", {"id": project_id, "description": "Summary"})
+    config = db.insert_row("extraction_configs", {"project_id": project_id})
+    auc = db.insert_row("extraction_fields", {"config_id": config["id"], "field_name": "auc", "created_at": "2025-01-01T00:00:00+00:00"})
+    unused = db.insert_row("extraction_fields", {"config_id": config["id"], "field_name": "unused", "created_at": "2025-01-02T00:00:00+00:00"})
+    screen = db.insert_row("filters", {"project_id": project_id})
+    for i in range(4):
+        row = db.insert_row("papers", {"project_id": project_id, "title": f"Paper {i}", "created_at": f"2025-02-0{i + 1}T00:00:00+00:00"})
+        if i < 3:
+            db.seed("extracted_fields", {"paper_id": row["id"], "extraction_field_id": auc["id"], "field_value": "0.9"})
+        db.seed("paper_filter_results", {"paper_id": row["id"], "filter_id": screen["id"], "passed": i % 2 == 0})
+
+    app = FastAPI()
+    app.include_router(extractions.router)
+    service = ExtractionResultsService(dal=ExtractionResultsDAL(db), project_dal=AsyncProjectDAL(db))
+    app.dependency_overrides[extractions.get_extraction_results_service] = lambda: service
+    client = TestClient(app)
+
+    summary = client.get(f"/projects/{project_id}/extractions/summary").json()
+
+    assert (summary["paper_count"], summary["value_count"]) == (4, 3)
+    assert [(f["field_name"], f["values"], f["completeness"]) for f in summary["fields"]] == [("auc", 3, 0.75), ("unused", 0, 0.0)]
+    assert summary["fields"][1]["field_id"] == unused["id"]
+    assert summary["filters"] == [{"filter_id": screen["id"], "evaluated": 4, "passed": 2, "pass_rate": 0.5}]
+    assert client.get(f"/projects/{uuid4()}/extractions/summary").status_code == 404
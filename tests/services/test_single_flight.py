@@ -0,0 +1,96 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from app.models.project_api_models import GetProjectRequest
+from app.models.shared import ResponseStatus
+from app.services.project_service import ProjectService
+from app.services.single_flight import SingleFlight
+
+
+class SlowDAL:
+    def __init__(self):
+        self.queries = 0
+
+    async def get_project_by_id(self, project_id, columns=None):
+        self.queries += 1
+        await asyncio.sleep(0.01)
+        return {"id": str(project_id), "description": "Polled project", "created_at": None}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    runs = 0
+
+    async def fetch():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+    assert results == ["value"] * 5
+    assert runs == 1
+    assert flight.stats.calls == 5
+    assert flight.stats.coalescing_ratio == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_cached():
+    flight = SingleFlight()
+
+    async def fetch():
+        return object()
+
+    first = await flight.do("key", fetch)
+    second = await flight.do("key", fetch)
+    assert first is not second
+    assert flight.stats.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_callers():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    leader = asyncio.ensure_future(flight.do("key", fetch))
+    follower = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "value"
+
+
+@pytest.mark.asyncio
+async def test_service_coalesces_per_user_and_project():
+    dal = SlowDAL()
+    flight = SingleFlight()
+    project_id = uuid4()
+
+    def service_for(user_id):
+        return ProjectService(dal=dal, user_id=user_id, single_flight=flight)
+
+    req = GetProjectRequest(project_id=project_id)
+    results = await asyncio.gather(
+        service_for("alice").get_project(req),
+        service_for("alice").get_project(req),
+        service_for("bob").get_project(req),
+    )
+
+    assert all(r.unwrap().status == ResponseStatus.SUCCESS for r in results)
+    assert dal.queries == 2
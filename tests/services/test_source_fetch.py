@@ -0,0 +1,373 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+from xml.sax.saxutils import escape
+
+import httpx
+import pytest
+from app.db.async_projects_dal import AsyncProjectDAL
+from app.db.papers_dal import PaperDAL
+from app.models.paper_api_models import FetchSourcesOptions, FetchSourcesRequest
+from app.models.shared import ResponseStatus
+from app.services.errors import InvalidRequestError, NotFoundError
+from app.services.paper_service import PaperService
+from app.services.rate_limiter import TokenBucket
+from app.sources.arxiv import ArxivBackend
+from app.sources.base import FetchStats, SourceBackend
+from app.sources.cache import SourceCache
+from app.sources.pubmed import PubMedBackend
+from app.sources.registry import SourceRegistry
+
+from tests.fake_postgrest import FakePostgrest
+
+
+async def chunked(body: bytes, size: int = 97):
+    for i in range(0, len(body), size):
+        await asyncio.sleep(0)
+        yield body[i : i + size]
+
+
+class FixtureServer:
+    # Stands in for the arXiv API and NCBI E-utilities, serving deterministic result sets in small chunks
+    # so responses are parsed across chunk boundaries. Tracks requests in flight to observe concurrency.
+    def __init__(self, arxiv_total=1050, pubmed_total=1234, failures=None):
+        self.arxiv_total = arxiv_total
+        self.pubmed_total = pubmed_total
+        self.failures = failures or {}
+        self.since_offset = 0
+        self.mindates = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            params = request.url.params
+            failure = self.failures.get(params.get("retstart") or params.get("start"))
+            if failure:
+                self.failures[params.get("retstart") or params.get("start")] = failure[1:]
+                return httpx.Response(failure[0])
+            if request.url.path.endswith("/query"):
+                return httpx.Response(200, content=chunked(self.arxiv_feed(int(params["start"]), int(params["max_results"]))))
+            # A search with mindate finds the records from since_offset on.
+            if request.url.path.endswith("/esearch.fcgi"):
+                since = "mindate" in params
+                if since:
+                    self.mindates.append(params["mindate"])
+                count = self.pubmed_total - (self.since_offset if since else 0)
+                body = {"esearchresult": {"count": str(count), "webenv": "WE2" if since else "WE1", "querykey": "1"}}
+                return httpx.Response(200, json=body)
+            offset = self.since_offset if params["WebEnv"] == "WE2" else 0
+            return httpx.Response(200, content=chunked(self.pubmed_set(offset + int(params["retstart"]), int(params["retmax"]))))
+        finally:
+            self.in_flight -= 1
+
+    def arxiv_feed(self, start: int, size: int) -> bytes:
+        entries = "".join(
+            f"""<entry><id>http://arxiv.org/abs/2401.{i:05d}v2</id><title>Paper
+            number {i}</title><summary>Abstract {i}</summary>{f'<arxiv:doi>10.1/shared-{i}</arxiv:doi>' if i < 10 else ''}</entry>"""
+            for i in range(start, min(start + size, self.arxiv_total))
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" '
+            'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+            f"<opensearch:totalResults>{self.arxiv_total}</opensearch:totalResults>{entries}</feed>"
+        ).encode()
+
+    def pubmed_set(self, start: int, size: int) -> bytes:
+        articles = "".join(
+            f"""<PubmedArticle><MedlineCitation><PMID Version="1">{100000 + i}</PMID><Article>
+            <ArticleTitle>Trial <i>{i}</i></ArticleTitle><Abstract><AbstractText Label="BACKGROUND">Why {i}.</AbstractText>
+            <AbstractText Label="RESULTS">{escape(f"p < 0.05 for {i}")}</AbstractText></Abstract></Article></MedlineCitation>
+            <PubmedData><ArticleIdList><ArticleId IdType="doi">10.1/{'shared' if i < 10 else 'pm'}-{i}</ArticleId></ArticleIdList></PubmedData>
+            </PubmedArticle>"""
+            for i in range(start, min(start + size, self.pubmed_total))
+        )
+        return f'<?xml version="1.0"?><PubmedArticleSet>{articles}</PubmedArticleSet>'.encode()
+
+
+def fast_limiter():
+    return TokenBucket(rate=1e6, capacity=1e6)
+
+
+async def no_sleep(seconds):
+    pass
+
+
+def backends(server, **options):
+    client = server.client()
+    options = {"limiter": fast_limiter(), "page_size": 200, "sleep": no_sleep, **options}
+    return ArxivBackend(client, url="http://arxiv.test/api/query", **options), PubMedBackend(client, url="http://eutils.test/eutils", **options)
+
+
+async def fetch_all(backend, query="q"):
+    stats = FetchStats()
+    records = [record async for record in backend.fetch(query, stats)]
+    return records, stats
+
+
+@pytest.mark.asyncio
+async def test_arxiv_pages_through_all_results():
+    server = FixtureServer()
+    arxiv, _ = backends(server)
+    records, stats = await fetch_all(arxiv, "all:transformers")
+
+    assert (stats.total, stats.pages, stats.records, len(records)) == (1050, 6, 1050, 1050)
+    assert len({r["arxiv_id"] for r in records}) == 1050
+    first = next(r for r in records if r["arxiv_id"] == "2401.00003")
+    assert first == {"title": "Paper number 3", "abstract": "Abstract 3", "arxiv_id": "2401.00003", "doi": "10.1/shared-3"}
+    assert server.requests[0].url.params["search_query"] == "all:transformers"
+
+
+@pytest.mark.asyncio
+async def test_pubmed_pages_concurrently_and_parses_structured_abstracts():
+    server = FixtureServer()
+    _, pubmed = backends(server, page_concurrency=4, max_results=1000)
+    records, stats = await fetch_all(pubmed)
+
+    assert (stats.total, stats.pages, len(records)) == (1234, 5, 1000)
+    assert server.max_in_flight > 1
+    record = next(r for r in records if r["pmid"] == "100011")
+    assert record == {"title": "Trial 11", "abstract": "Background: Why 11.\nResults: p < 0.05 for 11", "pmid": "100011", "doi": "10.1/pm-11"}
+    efetch = [r for r in server.requests if r.url.path.endswith("efetch.fcgi")]
+    assert {r.url.params["WebEnv"] for r in efetch} == {"WE1"}
+    assert sorted(int(r.url.params["retstart"]) for r in efetch) == [0, 200, 400, 600, 800]
+
+
+@pytest.mark.asyncio
+async def test_failed_pages_are_retried_then_reported():
+    server = FixtureServer(pubmed_total=600, failures={"200": [503], "400": [500, 500, 500, 500]})
+    _, pubmed = backends(server)
+    records, stats = await fetch_all(pubmed)
+
+    assert len(records) == 400 and stats.pages == 2
+    assert len(stats.errors) == 1 and stats.errors[0].startswith("page at 400: Server error '500 Internal Server Error'")
+
+
+@pytest.mark.asyncio
+async def test_unexpected_page_errors_are_raised_instead_of_hanging():
+    server = FixtureServer()
+    _, pubmed = backends(server)
+    stats = FetchStats()
+
+    async def page(start):
+        yield {"title": f"page {start}"}
+        if start == 400:
+            raise ValueError("malformed totalResults")
+
+    records = []
+    with pytest.raises(ValueError, match="malformed"):
+        async with asyncio.timeout(5):
+            async for record in pubmed.gather_pages([0, 200, 400, 600], page, stats):
+                records.append(record)
+    assert stats.errors == ["page at 400: malformed totalResults"]
+    assert {"title": "page 400"} in records
+
+
+@pytest.mark.asyncio
+async def test_fetch_sources_reports_unexpected_backend_errors(db):
+    server = FixtureServer(arxiv_total=300, pubmed_total=250)
+    service = make_service(db, server)
+
+    async def broken(query, stats, since=None):
+        raise AttributeError("unexpected response")
+        yield
+
+    service.sources.backends["arxiv"].fetch = broken
+    response = (await service.fetch_sources(FetchSourcesRequest(project_id=db.project_id))).unwrap()
+    assert response.sources[0].errors == ["AttributeError: unexpected response"]
+    assert (response.sources[1].fetched, response.status) == (250, ResponseStatus.DEGRADED)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_paces_requests():
+    clock = {"now": 0.0}
+
+    async def sleep(seconds):
+        clock["now"] += seconds
+
+    server = FixtureServer(arxiv_total=600)
+    limiter = TokenBucket(rate=1 / 3, capacity=1, clock=lambda: clock["now"], sleep=sleep)
+    arxiv = ArxivBackend(server.client(), url="http://arxiv.test/api/query", limiter=limiter, page_size=200)
+    records, _ = await fetch_all(arxiv)
+    assert len(records) == 600 and clock["now"] == pytest.approx(6.0)
+
+
+@pytest.fixture
+def db():
+    db = FakePostgrest()
+    db.project_id = str(uuid4())
+    db.seed("projects", {"id": db.project_id, "description": "Sources"})
+    db.sources = [
+        db.insert_row("project_sources", {"project_id": db.project_id, "backend_name": name, "backend_query": query})
+        for name, query in [("arXiv", "all:trials"), ("PubMed", "trials[tiab]"), ("Scopus", "trials")]
+    ]
+    return db
+
+
+def make_service(db, server):
+    arxiv, pubmed = backends(server)
+    return PaperService(dal=PaperDAL(db), project_dal=AsyncProjectDAL(db), sources=SourceRegistry([arxiv, pubmed]))
+
+
+@pytest.mark.asyncio
+async def test_fetch_sources_ingests_every_backend_once(db):
+    server = FixtureServer(arxiv_total=300, pubmed_total=250)
+    response = (await make_service(db, server).fetch_sources(FetchSourcesRequest(project_id=db.project_id))).unwrap()
+
+    arxiv, pubmed, scopus = response.sources
+    assert (arxiv.fetched, pubmed.fetched) == (300, 250)
+    assert scopus.errors == ["Unsupported backend: Scopus"]
+    # The first ten PubMed records share a DOI with arXiv records.
+    assert (response.ingest.inserted, response.ingest.duplicates) == (540, 10)
+    assert len(db.tables["papers"]) == 540
+    assert response.status == ResponseStatus.DEGRADED
+
+    options = FetchSourcesOptions(source_ids=[db.sources[1]["id"]])
+    again = (await make_service(db, server).fetch_sources(FetchSourcesRequest(project_id=db.project_id, options=options))).unwrap()
+    assert (again.ingest.inserted, again.status) == (0, ResponseStatus.SUCCESS)
+
+
+@pytest.mark.asyncio
+async def test_fetch_sources_validates_the_request(db):
+    service = make_service(db, FixtureServer())
+    assert isinstance((await service.fetch_sources(FetchSourcesRequest(project_id=uuid4()))).failure(), NotFoundError)
+    options = FetchSourcesOptions(source_ids=[uuid4()])
+    result = await service.fetch_sources(FetchSourcesRequest(project_id=db.project_id, options=options))
+    assert isinstance(result.failure(), InvalidRequestError)
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 3, 10, 12, tzinfo=timezone.utc).timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+def cached_registry(server, tmp_path, **options):
+    clock = Clock()
+    cache = SourceCache(str(tmp_path), ttl_seconds=3600, page_size=200, clock=clock, **options)
+    return SourceRegistry(list(backends(server)), cache=cache), clock
+
+
+async def fetch_cached(registry, name="pubmed", query="trials[tiab]", force=False):
+    stats = FetchStats()
+    records = [record async for record in registry.fetch(registry.get(name), query, stats, force=force)]
+    return records, stats
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_fresh_queries_from_compressed_pages(tmp_path):
+    server = FixtureServer(pubmed_total=500)
+    registry, _ = cached_registry(server, tmp_path)
+    first, stats = await fetch_cached(registry)
+    assert (len(first), stats.cached, stats.total) == (500, 0, 500)
+    assert len(list(Path(tmp_path, "pages").rglob("*.jsonl.gz"))) == 3
+
+    requests = len(server.requests)
+    again, stats = await fetch_cached(registry, query="  trials[tiab] ")
+    assert len(server.requests) == requests
+    assert again == first and (stats.cached, stats.records, stats.total) == (500, 500, 500)
+    assert (registry.cache.stats.hits, registry.cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_stale_queries_fetch_only_records_added_since(tmp_path):
+    server = FixtureServer(pubmed_total=500)
+    registry, clock = cached_registry(server, tmp_path)
+    await fetch_cached(registry)
+
+    clock.now += 2 * 3600
+    server.pubmed_total, server.since_offset = 550, 490
+    records, stats = await fetch_cached(registry)
+    # Records from the overlapping day are already cached and are not sent again.
+    assert server.mindates == ["2026/03/09"]
+    assert (len(records), stats.cached, stats.total) == (550, 500, 550)
+    assert len({r["pmid"] for r in records}) == 550
+
+    requests = len(server.requests)
+    records, stats = await fetch_cached(registry)
+    assert len(server.requests) == requests and (len(records), stats.cached) == (550, 550)
+    assert registry.cache.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_or_forced_fetches_leave_no_partial_pages(tmp_path):
+    server = FixtureServer(pubmed_total=500, failures={"200": [500] * 4})
+    registry, _ = cached_registry(server, tmp_path)
+    records, stats = await fetch_cached(registry)
+    assert len(records) == 300 and stats.errors
+    assert registry.cache.lookup("pubmed", "trials[tiab]") is None
+    assert not list(Path(tmp_path, "pages").rglob("*.jsonl.gz"))
+
+    records, stats = await fetch_cached(registry)
+    assert (len(records), stats.cached, stats.errors) == (500, 0, [])
+    server.pubmed_total = 520
+    records, stats = await fetch_cached(registry, force=True)
+    assert (len(records), stats.cached) == (520, 0)
+    assert registry.cache.lookup("pubmed", "trials[tiab]").total == 520
+    assert len(list(Path(tmp_path, "pages").rglob("*.jsonl.gz"))) == 3
+
+
+class ListBackend(SourceBackend):
+    name = "list"
+    refresh_overlap = timedelta(0)
+
+    def __init__(self, records):
+        super().__init__(httpx.AsyncClient(), fast_limiter(), page_size=200)
+        self.records = records
+
+    async def fetch(self, query, stats, since=None):
+        stats.total = len(self.records)
+        for record in self.records:
+            yield record
+
+
+@pytest.mark.asyncio
+async def test_refreshes_keep_records_without_identifiers(tmp_path):
+    backend = ListBackend([{"title": "No ids"}, {"title": "Has id", "doi": "10.1/a"}])
+    clock = Clock()
+    registry = SourceRegistry([backend], cache=SourceCache(str(tmp_path), ttl_seconds=3600, clock=clock))
+    await fetch_cached(registry, "list", "q")
+
+    clock.now += 2 * 3600
+    backend.records = [{"title": "Has id", "doi": "10.1/a"}, {"title": "Also no ids"}]
+    records, stats = await fetch_cached(registry, "list", "q")
+    assert [r["title"] for r in records] == ["No ids", "Has id", "Also no ids"]
+    assert stats.total == 3
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_queries_are_evicted(tmp_path):
+    server = FixtureServer(arxiv_total=300, pubmed_total=300)
+    registry, clock = cached_registry(server, tmp_path, max_bytes=10**9)
+    await fetch_cached(registry, "arxiv", "all:trials")
+    clock.now += 1
+    await fetch_cached(registry, "pubmed")
+    registry.cache.max_bytes = registry.cache.size - 1
+
+    clock.now += 1
+    await fetch_cached(registry, "pubmed", "other")
+    assert registry.cache.lookup("arxiv", "all:trials") is None
+    assert registry.cache.lookup("pubmed", "other") is not None
+    assert registry.cache.evictions >= 1
+    assert sum(f.stat().st_size for f in Path(tmp_path, "pages").rglob("*.jsonl.gz")) == registry.cache.size
+
+
+@pytest.mark.asyncio
+async def test_arxiv_refresh_searches_by_submission_date():
+    server = FixtureServer(arxiv_total=10)
+    arxiv, _ = backends(server)
+    since = datetime(2026, 3, 9, 8, 30, tzinfo=timezone.utc)
+    [record async for record in arxiv.fetch("all:trials", FetchStats(), since=since)]
+    query = server.requests[0].url.params["search_query"]
+    assert query.startswith("(all:trials) AND submittedDate:[202603090830 TO ")